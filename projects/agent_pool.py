@@ -0,0 +1,100 @@
+"""
+Agent Pools
+Bounded, pre-warmed pools of agents per role, with conversation history reset on checkout
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+def trim_history(messages: List[Dict[str, Any]], window: int):
+    """Keep the last window messages in place (0 clears them).
+
+    The kept slice must start on a plain user turn: a leading assistant turn or
+    a toolResult without its toolUse would be rejected by the model.
+    """
+    if window <= 0:
+        messages.clear()
+        return
+    del messages[:-window]
+    while messages and (messages[0].get("role") != "user" or
+                        any("toolResult" in block for block in messages[0].get("content", []))):
+        del messages[0]
+
+class AgentPool:
+    """Checkout/checkin pool for one role.
+
+    size items are built up front; more are built on demand up to max_size,
+    after which checkout waits for a checkin. Each checkout runs reset on the
+    item so no request inherits another's conversation.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 1, max_size: int = 4,
+                 reset: Optional[Callable[[Any], None]] = None):
+        self.factory = factory
+        self.max_size = max(size, max_size)
+        self.reset = reset
+        self.idle = [factory() for _ in range(size)]
+        self.created = size
+        self.stats = {"checkouts": 0, "waits": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+        self._available = threading.Condition()
+
+    def checkout(self, timeout: Optional[float] = None) -> Tuple[Any, float]:
+        """Returns (item, seconds spent waiting); raises TimeoutError if none frees up in time"""
+        start = time.time()
+        with self._available:
+            while not self.idle and self.created >= self.max_size:
+                remaining = None if timeout is None else timeout - (time.time() - start)
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No idle agent within {timeout:.1f}s ({self.max_size} in use)")
+                self._available.wait(remaining)
+
+            item = self.idle.pop() if self.idle else None
+            if item is None:
+                self.created += 1
+
+            waited = time.time() - start
+            self.stats["checkouts"] += 1
+            if waited > 0.001:
+                self.stats["waits"] += 1
+            self.stats["wait_seconds"] += waited
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+
+        if item is None:
+            try:
+                item = self.factory()
+            except Exception:
+                with self._available:
+                    self.created -= 1
+                    self._available.notify()
+                raise
+        if self.reset:
+            self.reset(item)
+        return item, waited
+
+    def checkin(self, item: Any):
+        with self._available:
+            self.idle.append(item)
+            self._available.notify()
+
+    def warm(self) -> Optional[Any]:
+        """An idle item, built now if none is idle and there's room; None when every item is checked out"""
+        with self._available:
+            if self.idle:
+                return self.idle[0]
+            if self.created >= self.max_size:
+                return None
+            self.created += 1
+        try:
+            item = self.factory()
+        except Exception:
+            with self._available:
+                self.created -= 1
+                self._available.notify()
+            raise
+        self.checkin(item)
+        return item
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._available:
+            return {**self.stats, "size": self.created, "idle": len(self.idle), "max_size": self.max_size}
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Chat History Benchmark
+Per-turn prompt tokens and latency over a long chat loop with a stub model, full history vs rolling window
+"""
+
+import argparse
+import asyncio
+import statistics
+from strands import Agent
+from context_handoff import estimate_tokens
+from conversation_window import create_conversation_manager, message_text
+from stub_model import StubModel
+
+class PromptSizeModel(StubModel):
+    """StubModel that answers instantly apart from a latency proportional to the prompt size"""
+
+    def __init__(self, base_latency: float = 0.002, seconds_per_token: float = 0.000002, **kwargs):
+        super().__init__(**kwargs)
+        self.base_latency = base_latency
+        self.seconds_per_token = seconds_per_token
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        input_tokens = estimate_tokens(system_prompt or "") + sum(
+            estimate_tokens(message_text(message)) for message in messages)
+        await asyncio.sleep(self.base_latency + input_tokens * self.seconds_per_token)
+        text = f"Keep going! You're on message {len(messages)} and doing great. " * 3
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        yield {"contentBlockDelta": {"delta": {"text": text}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": {"inputTokens": input_tokens, "outputTokens": estimate_tokens(text),
+                                      "totalTokens": input_tokens + estimate_tokens(text)},
+                            "metrics": {"latencyMs": 0}}}
+
+def run(mode: str, turns: int, window: int, max_tokens: int):
+    manager = create_conversation_manager(mode, window_messages=window, max_tokens=max_tokens)
+    agent = Agent(model=PromptSizeModel(), system_prompt="You are a witty, motivational chat assistant.",
+                  conversation_manager=manager, callback_handler=None)
+    for i in range(turns):
+        manager.turn(agent, f"Turn {i}: I'm learning Kubernetes and today I worked on {i % 7} pods.")
+    return manager
+
+def window_stats(records):
+    return (statistics.mean(r["prompt_tokens"] for r in records),
+            statistics.mean(r["latency"] for r in records) * 1000)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat history management with a stub model")
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--window", type=int, default=10, help="messages kept verbatim")
+    parser.add_argument("--max-tokens", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {mode: run(mode, args.turns, args.window, args.max_tokens) for mode in ("full", "rolling")}
+
+    print(f"Average prompt tokens / latency per {args.turns // 5}-turn slice")
+    print(f"   {'turns':>9}  {'full':>22}  {'rolling':>22}")
+    size = args.turns // 5
+    for start in range(0, args.turns, size):
+        row = [window_stats(results[mode].turns[start:start + size]) for mode in ("full", "rolling")]
+        print(f"   {start + 1:>4}-{start + size:<4}  " +
+              "  ".join(f"{tokens:>8.0f} tok {latency:>7.2f}ms" for tokens, latency in row))
+
+    rolling = results["rolling"]
+    print(f"\nRolling: {rolling.turns[-1]['history_messages']} messages kept, "
+          f"{rolling.removed_message_count} evicted into a {rolling.turns[-1]['summary_tokens']}-token summary")
+
+if __name__ == "__main__":
+    main()
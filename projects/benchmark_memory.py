@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Local Memory Benchmark
+Batch insert throughput, store open time and top-k recall latency at 10k/100k/1M memories
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import numpy as np
+from local_memory import HashingEmbedder, LocalMemoryStore
+
+TOPICS = ["devops", "kubernetes", "python", "aws", "terraform", "pizza", "music", "travel", "docker", "linux"]
+
+def fill(store: LocalMemoryStore, namespace: str, target: int, batch: int = 50000):
+    """Grow the namespace to target memories with random unit vectors (embedding isn't what's measured here)"""
+    rng = np.random.default_rng(7)
+    have = store.count(namespace)
+    start = time.perf_counter()
+    while have < target:
+        n = min(batch, target - have)
+        vectors = rng.standard_normal((n, store.dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store.add_many(namespace, [f"memory {have + i}" for i in range(n)], vectors=vectors)
+        have += n
+    return time.perf_counter() - start
+
+def recall_latency(store: LocalMemoryStore, namespace: str, queries: int = 50):
+    rng = random.Random(1)
+    latencies = []
+    for _ in range(queries):
+        query = " ".join(rng.sample(TOPICS, 3))
+        start = time.perf_counter()
+        store.search(namespace, query, k=5)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+def bench_embedding(count: int = 10000):
+    rng = random.Random(2)
+    texts = [f"I like {' and '.join(rng.sample(TOPICS, 3))} a lot" for _ in range(count)]
+    start = time.perf_counter()
+    HashingEmbedder()(texts)
+    elapsed = time.perf_counter() - start
+    print(f"   HashingEmbedder: {count / elapsed:,.0f} texts/s")
+
+def bench_relevance(root: str):
+    """Facts for two users among noise: each user's fact should come back first, never the other's"""
+    store = LocalMemoryStore(os.path.join(root, "relevance"))
+    rng = random.Random(3)
+    store.add_many("user_alex", [f"note about {rng.choice(TOPICS)} number {i}" for i in range(2000)])
+    store.add_many("user_alex", ["My favourite pizza topping is pineapple"])
+    store.add_many("user_sam", ["My favourite pizza topping is mushroom"])
+    alex = store.search("user_alex", "what is my favourite pizza topping", k=1)[0]["memory"]
+    sam = store.search("user_sam", "what is my favourite pizza topping", k=1)[0]["memory"]
+    print(f"   user_alex -> {alex!r}\n   user_sam  -> {sam!r}")
+    store.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local vector memory store")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dir", help="store directory (default: a temp dir, removed afterwards)")
+    args = parser.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix="memory-bench-")
+    try:
+        print("=== relevance and namespaces ===")
+        bench_relevance(root)
+        print("\n=== embedding ===")
+        bench_embedding()
+
+        print("\n=== recall (top-5, one user namespace) ===")
+        print(f"   {'memories':>10} {'insert/s':>10} {'open':>8} {'p50':>9} {'p95':>9}")
+        path = os.path.join(root, "scale")
+        for size in (int(size) for size in args.sizes.split(",")):
+            store = LocalMemoryStore(path)
+            before = store.count("user_bench")
+            elapsed = fill(store, "user_bench", size)
+            store.close()
+
+            # A fresh store: opening only touches sqlite, vectors are paged in by the first recall
+            start = time.perf_counter()
+            store = LocalMemoryStore(path)
+            opened = time.perf_counter() - start
+            p50, p95 = recall_latency(store, "user_bench")
+            store.close()
+            rate = (size - before) / elapsed if elapsed else 0
+            print(f"   {size:>10,} {rate:>10,.0f} {opened * 1000:>6.1f}ms {p50 * 1000:>7.2f}ms {p95 * 1000:>7.2f}ms")
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Multi-Agent Pipeline Benchmark
+Runs MultiAgentSystem against stubbed agents with injected latency - no model calls
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from multiagent import (MultiAgentSystem, ExecutionMode, AgentRole, RequestScheduler, ServerBusyError,
+                        ROLE_DEPENDENCIES, ROLE_SYSTEM_PROMPTS, PIPELINE_ORDER)
+from resilience import percentile
+from response_cache import create_cache
+from telemetry import Telemetry, create_exporter
+from tool_cache import as_agent_tool, create_tool_cache
+
+# Simulated model round-trip per role (seconds)
+ROLE_LATENCY = {
+    AgentRole.PLANNER: 0.30,
+    AgentRole.RETRIEVER: 0.40,
+    AgentRole.ANALYST: 0.50,
+    AgentRole.VALIDATOR: 0.20,
+}
+
+class StubAgent:
+    """Stand-in for strands.Agent that sleeps instead of calling a model"""
+
+    def __init__(self, system_prompt: str = "", tools=None, latency: float = 0.1, model=None, **kwargs):
+        self.system_prompt = system_prompt
+        # A stub "model" is just its spec, carrying the simulated latency and faults
+        model = model or {}
+        self.latency = model.get("latency", latency)
+        self.fail_rate = model.get("fail_rate", 0.0)
+        self.stall_rate = model.get("stall_rate", 0.0)
+        self.verbose_lines = 0
+        # Conversation history, grown like strands.Agent.messages
+        self.messages = []
+        self.context_tokens = 0
+
+    def _inject_faults(self):
+        """Randomly raise or stall (5x latency) at the configured rates"""
+        roll = random.random()
+        if roll < self.fail_rate:
+            time.sleep(self.latency / 2)
+            raise RuntimeError("injected fault")
+        if roll < self.fail_rate + self.stall_rate:
+            time.sleep(self.latency * 5)
+
+    def __call__(self, prompt: str) -> str:
+        self._inject_faults()
+        time.sleep(self.latency)
+        response = f"stub response to: {prompt}"
+        # Optional long-winded output: a few bullets buried in prose
+        for i in range(self.verbose_lines):
+            response += f"\n- Finding {i}" if i % 5 == 0 else f"\nSupporting detail sentence number {i} with filler."
+        # A real model is sent the whole history with every prompt
+        self.messages.append({"role": "user", "content": [{"text": prompt}]})
+        self.context_tokens = sum(len(block["text"]) for message in self.messages
+                                  for block in message["content"]) // 4
+        self.messages.append({"role": "assistant", "content": [{"text": response}]})
+        return response
+
+    async def stream_async(self, prompt: str):
+        """Spread the latency over word-sized deltas like a streaming model"""
+        self._inject_faults()
+        words = f"stub response to: {prompt}".split()
+        for word in words:
+            await asyncio.sleep(self.latency / len(words))
+            yield {"data": word + " "}
+        yield {"result": " ".join(words)}
+
+def critical_path(latency: dict) -> float:
+    """Longest dependency chain through the role graph"""
+    finish = {}
+    for role in PIPELINE_ORDER:
+        finish[role] = latency[role] + max((finish[dep] for dep in ROLE_DEPENDENCIES[role]), default=0)
+    return max(finish.values())
+
+def stub_models(**faults) -> dict:
+    """One stub model per role with ROLE_LATENCY, plus optional fail_rate / stall_rate"""
+    return {role.value: [{"provider": "stub", "model_id": "stub", "latency": latency, **faults}]
+            for role, latency in ROLE_LATENCY.items()}
+
+def stub_system(**kwargs) -> MultiAgentSystem:
+    """MultiAgentSystem wired to StubAgents with ROLE_LATENCY"""
+    kwargs.setdefault("role_models", stub_models())
+    return MultiAgentSystem(agent_factory=StubAgent, model_factory=lambda spec: spec, **kwargs)
+
+def bench_modes(runs: int):
+    system = stub_system()
+
+    print("⏱️  Serial vs parallel pipeline")
+    print(f"   Sum of role latencies: {sum(ROLE_LATENCY.values()):.2f}s")
+    print(f"   Critical path:         {critical_path(ROLE_LATENCY):.2f}s\n")
+
+    timings = {}
+    for mode in ExecutionMode:
+        start = time.time()
+        for _ in range(runs):
+            result = system.process_query("Plan a migration to Kubernetes", mode=mode)
+        timings[mode] = (time.time() - start) / runs
+        order = [step["agent"] for step in result["execution_trace"]]
+        print(f"   {mode.value:<9} avg {timings[mode]:.2f}s  trace={order}")
+
+    print(f"\n📊 Speedup: {timings[ExecutionMode.SERIAL] / timings[ExecutionMode.PARALLEL]:.2f}x")
+
+async def load_level(concurrency: int, requests: int, max_queue: int) -> dict:
+    scheduler = RequestScheduler(system_factory=stub_system, max_concurrency=concurrency,
+                                 max_queue=max_queue)
+    latencies = []
+    rejected = 0
+
+    async def one_request(i: int):
+        nonlocal rejected
+        start = time.time()
+        try:
+            await scheduler.submit(f"Load test query #{i}")
+            latencies.append(time.time() - start)
+        except ServerBusyError:
+            rejected += 1
+
+    start = time.time()
+    await asyncio.gather(*(one_request(i) for i in range(requests)))
+    wall = time.time() - start
+    scheduler.executor.shutdown()
+
+    assert rejected == scheduler.stats["rejected"]
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "throughput": len(latencies) / wall,
+        "rejected": rejected
+    }
+
+def bench_load(runs: int):
+    requests = max(runs, 1) * 8
+    print(f"🚦 Load test: {requests} requests per level through RequestScheduler\n")
+    print(f"   {'concurrency':>11} {'queue':>5} {'p50':>7} {'p95':>7} {'p99':>7} {'req/s':>7} {'rejected':>8}")
+
+    # Queue room for every request, then queues too short for the burst, where backpressure rejects the rest
+    levels = [(concurrency, requests) for concurrency in [1, 2, 4, 8, 16, 32]]
+    levels += [(4, requests // 4), (4, 0)]
+    for concurrency, max_queue in levels:
+        stats = asyncio.run(load_level(concurrency, requests, max_queue))
+        print(f"   {concurrency:>11} {max_queue:>5} {stats['p50']:>6.2f}s {stats['p95']:>6.2f}s {stats['p99']:>6.2f}s "
+              f"{stats['throughput']:>7.2f} {stats['rejected']:>8}")
+
+REPEATED_QUERIES = [
+    "How do I reduce my AWS bill?",
+    "how do I reduce my AWS bill",
+    "How do I reduce my AWS bill??",
+    "How can I reduce my AWS bill?",
+    "Plan a migration to Kubernetes",
+    "Plan a migration to Kubernetes.",
+]
+
+def bench_cache(runs: int):
+    print("🗄️  Response cache on repeated / near-duplicate queries\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        configs = {
+            "no cache": None,
+            "memory": create_cache("memory"),
+            "memory+near": create_cache("memory", similarity_threshold=0.8),
+            "sqlite": create_cache("sqlite", path=os.path.join(tmp, "cache.db")),
+        }
+        for name, cache in configs.items():
+            system = stub_system(cache=cache)
+            start = time.time()
+            for _ in range(runs):
+                for query in REPEATED_QUERIES:
+                    result = system.process_query(query)
+            per_query = (time.time() - start) / (runs * len(REPEATED_QUERIES))
+            ratio = result["summary"]["cache"]["overall_hit_ratio"] if cache else "-"
+            print(f"   {name:<12} avg {per_query:.2f}s/query  hit ratio {ratio}")
+
+async def time_to_first_event(stream: bool) -> tuple:
+    scheduler = RequestScheduler(system_factory=stub_system, max_concurrency=1)
+    start = time.time()
+    first = None
+    if stream:
+        async for event in scheduler.stream("Plan a migration to Kubernetes"):
+            first = first or time.time() - start
+            last_event = event["event"]
+    else:
+        await scheduler.submit("Plan a migration to Kubernetes")
+        first = time.time() - start
+        last_event = "response"
+    scheduler.executor.shutdown()
+    return first, time.time() - start, last_event
+
+def bench_stream(runs: int):
+    print("📡 Time to first byte: buffered vs streaming\n")
+    for stream in (False, True):
+        first, total, last_event = asyncio.run(time_to_first_event(stream))
+        label = "streaming" if stream else "buffered"
+        print(f"   {label:<10} first event {first:.2f}s  total {total:.2f}s  last event={last_event}")
+
+def bench_context(runs: int):
+    print("✂️  Context handoff with verbose upstream outputs\n")
+    for lines in (0, 50, 200, 1000):
+        system = stub_system()
+        for agent in system.agents.values():
+            agent.verbose_lines = lines
+        summary = system.process_query("Plan a migration to Kubernetes")["summary"]
+        print(f"   {lines:>5} lines/output  prompt tokens {summary['prompt_tokens']:>5}  "
+              f"saved {summary['context_tokens_saved']:>6}")
+
+MIXED_QUERIES = [
+    "Hello! How can I help you today?",
+    "Hi there",
+    "Thanks a lot!",
+    "What is Amazon S3?",
+    "Explain what a VPC is",
+    "Who maintains Kubernetes?",
+    "Plan a migration from a monolith to microservices on EKS",
+    "Compare Aurora and DynamoDB for a high-traffic checkout service",
+    "Design a multi-region disaster recovery strategy for our payments platform",
+    "Evaluate the cost tradeoffs of Fargate versus EC2 for batch jobs",
+]
+
+# The queries above that a real planner judges answerable directly
+SINGLE_STEP_QUERIES = {"What is Amazon S3?", "Explain what a VPC is", "Who maintains Kubernetes?"}
+
+class PlannerStub(StubAgent):
+    """StubAgent whose PLANNER replies like a real one: a heading, 2-3 numbered subtasks, then the verdict line"""
+
+    verdict = True
+
+    def __call__(self, prompt: str) -> str:
+        response = super().__call__(prompt)
+        if self.system_prompt != ROLE_SYSTEM_PROMPTS[AgentRole.PLANNER]:
+            return response
+        query = prompt.split(": ", 1)[-1]
+        simple = query in SINGLE_STEP_QUERIES
+        steps = ["Pin down what the user needs", "Gather the key facts"] + ([] if simple else ["Weigh the options"])
+        plan = "## Plan\n" + "\n".join(f"{i}. {step} for: {query}" for i, step in enumerate(steps, 1))
+        if self.verdict:
+            plan += f"\n\nComplexity: {'SIMPLE' if simple else 'COMPLEX'}"
+        self.messages[-1]["content"][0]["text"] = plan
+        return plan
+
+class PlannerStubNoVerdict(PlannerStub):
+    """A planner that ignores the verdict instruction: routing falls back to counting numbered steps"""
+
+    verdict = False
+
+def bench_router(runs: int):
+    print(f"🔀 Adaptive routing over {len(MIXED_QUERIES)} mixed queries (planner replies with 2-3 subtasks)\n")
+    for label, adaptive, factory in (("full pipeline", False, PlannerStub), ("adaptive", True, PlannerStub),
+                                     ("no verdict", True, PlannerStubNoVerdict)):
+        system = MultiAgentSystem(agent_factory=factory, role_models=stub_models(),
+                                  model_factory=lambda spec: spec, adaptive=adaptive)
+        calls, start = 0, time.time()
+        for _ in range(runs):
+            for query in MIXED_QUERIES:
+                result = system.process_query(query)
+                # The verdict line is for the router only
+                assert "Complexity:" not in json.dumps(result["execution_trace"]), "verdict leaked into the trace"
+                calls += result["summary"]["agents_executed"]
+        total = runs * len(MIXED_QUERIES)
+        print(f"   {label:<14} {calls / total:.2f} model calls/query  avg {(time.time() - start) / total:.2f}s/query")
+
+# Simulated model chains: a fast cheap model for simple roles, a slow big one for the rest
+BIG = {"provider": "stub", "model_id": "big", "latency": 0.5,
+       "input_cost_per_1k": 0.003, "output_cost_per_1k": 0.015}
+SMALL = {"provider": "stub", "model_id": "small", "latency": 0.15,
+         "input_cost_per_1k": 0.0008, "output_cost_per_1k": 0.004}
+STALLED = {"provider": "stub", "model_id": "stalled", "latency": 2.0, "timeout": 0.3}
+
+MODEL_CONFIGS = {
+    "big everywhere": {role.value: [BIG] for role in PIPELINE_ORDER},
+    "per-role": {"planner": [SMALL], "retriever": [BIG], "analyst": [BIG], "validator": [SMALL]},
+    "per-role+fallback": {"planner": [STALLED, SMALL], "retriever": [BIG], "analyst": [BIG],
+                          "validator": [STALLED, SMALL]},
+}
+
+def bench_models(runs: int):
+    print("🧮 Per-role model routing: latency and cost per query\n")
+    for name, role_models in MODEL_CONFIGS.items():
+        system = MultiAgentSystem(agent_factory=StubAgent, role_models=role_models,
+                                  model_factory=lambda spec: spec, adaptive=False)
+        latencies, cost = [], 0.0
+        for _ in range(runs):
+            start = time.time()
+            summary = system.process_query("Plan a migration to Kubernetes")["summary"]
+            latencies.append(time.time() - start)
+            cost += summary["total_cost_usd"]
+        fallbacks = [role for role, model in summary["models"].items() if model["fallback"]]
+        print(f"   {name:<18} p95 {percentile(latencies, 95):.2f}s  ${cost / runs:.6f}/query  "
+              f"fallbacks={fallbacks}")
+
+FAST_RETRY = {"max_attempts": 3, "base_delay": 0.05, "max_delay": 0.4}
+
+FAULT_CONFIGS = {
+    "no retry": {"retry_policy": {**FAST_RETRY, "max_attempts": 1}},
+    "retry": {"retry_policy": FAST_RETRY},
+    "retry+hedge": {"retry_policy": FAST_RETRY, "hedge": True},
+    "retry+hedge+2s cap": {"retry_policy": FAST_RETRY, "hedge": True, "request_timeout": 2.0},
+}
+
+def bench_faults(runs: int):
+    random.seed(7)
+    queries = max(runs, 1) * 8
+    print(f"💥 Fault injection: 10% errors, 10% stalls (5x latency), {queries} queries per config\n")
+    for name, config in FAULT_CONFIGS.items():
+        system = stub_system(role_models=stub_models(fail_rate=0.1, stall_rate=0.1), adaptive=False, **config)
+        # Start hedging after 5 samples instead of 20 so short runs exercise it
+        system.latency.min_samples = 5
+        latencies, succeeded, retries, hedges = [], 0, 0, 0
+        for i in range(queries):
+            start = time.time()
+            result = system.process_query(f"Plan a migration to Kubernetes #{i}")
+            latencies.append(time.time() - start)
+            succeeded += all(step["output"]["status"] == "success" for step in result["execution_trace"])
+            retries += result["summary"]["retries"]
+            hedges += result["summary"]["hedged_requests"]
+        print(f"   {name:<19} success {succeeded / queries:>5.0%}  p50 {percentile(latencies, 50):.2f}s  "
+              f"p95 {percentile(latencies, 95):.2f}s  max {max(latencies):.2f}s  "
+              f"retries {retries}  hedges {hedges}")
+
+def bench_trace(runs: int):
+    random.seed(11)
+    queries = max(runs, 1) * 8
+    print(f"🔭 Tail latency attribution from exported spans ({queries} queries, 10% stalls)\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        traces, metrics = os.path.join(tmp, "traces.jsonl"), os.path.join(tmp, "metrics.prom")
+        system = stub_system(role_models=stub_models(stall_rate=0.1), adaptive=False,
+                             telemetry=Telemetry(create_exporter("file", traces, metrics)))
+        for i in range(queries):
+            system.process_query(f"Plan a migration to Kubernetes #{i}")
+
+        with open(traces) as f:
+            spans = [json.loads(line) for line in f]
+        with open(metrics) as f:
+            series = sum(1 for line in f if line.startswith("multiagent_role_latency_seconds_count"))
+
+    requests = sorted((s for s in spans if s["parent_span_id"] is None), key=lambda s: s["duration_seconds"])
+    tail = {s["trace_id"] for s in requests[-max(1, len(requests) // 10):]}
+    print(f"   {'role':<10} {'p50':>7} {'p95':>7} {'share of slowest 10%':>21}")
+    tail_total = sum(s["duration_seconds"] for s in spans if s["trace_id"] in tail and s["parent_span_id"])
+    for role in PIPELINE_ORDER:
+        role_spans = [s for s in spans if s["name"] == f"multiagent.role.{role.value}"]
+        durations = [s["duration_seconds"] for s in role_spans]
+        in_tail = sum(s["duration_seconds"] for s in role_spans if s["trace_id"] in tail)
+        print(f"   {role.value:<10} {percentile(durations, 50):>6.2f}s {percentile(durations, 95):>6.2f}s "
+              f"{in_tail / tail_total:>21.0%}")
+    print(f"\n   {len(spans)} spans exported, {series} role histogram series in metrics.prom")
+
+def bench_soak(runs: int):
+    requests = max(runs, 1) * 400
+    print(f"🧽 Soak: {requests} requests, memory and prompt size with and without history reset\n")
+    instant = {role.value: [{"provider": "stub", "model_id": "stub", "latency": 0.0}] for role in PIPELINE_ORDER}
+    for label, window in (("keep history", None), ("reset on checkout", 0), ("window of 4", 4)):
+        system = stub_system(role_models=instant, adaptive=False, history_window=window)
+        tracemalloc.start()
+        checkpoints = []
+        for i in range(1, requests + 1):
+            system.process_query(f"Plan a migration to Kubernetes #{i}", mode=ExecutionMode.SERIAL)
+            if i % (requests // 4) == 0:
+                prompt_tokens = max(agent.context_tokens for agent in system.agents.values())
+                checkpoints.append(f"{i}: {tracemalloc.get_traced_memory()[0] / 1e6:.2f}MB/{prompt_tokens}tok")
+        tracemalloc.stop()
+        waits = sum(stats["waits"] for stats in system.pool_stats().values())
+        print(f"   {label:<18} {'  '.join(checkpoints)}  checkout waits {waits}")
+
+class StubToolModule:
+    """Looks like a strands_tools module (TOOL_SPEC + function) with a fixed round-trip"""
+
+    def __init__(self, name: str, latency: float):
+        self.TOOL_SPEC = {"name": name, "description": f"stub {name}",
+                          "inputSchema": {"json": {"type": "object", "properties": {}}}}
+        self.latency = latency
+        self.calls = 0
+        setattr(self, name, self.run)
+
+    def run(self, tool_use, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return {"toolUseId": tool_use["toolUseId"], "status": "success",
+                "content": [{"text": f"{self.TOOL_SPEC['name']} result for {tool_use['input']}"}]}
+
+async def drive_tool(tool, arguments: dict, i: int):
+    async for _ in tool.stream({"toolUseId": f"call-{i}", "name": tool.tool_name, "input": arguments}, {}):
+        pass
+
+def bench_tools(runs: int):
+    # The same few URLs in different key orders, as an agent loop tends to produce them
+    urls = [{"method": "GET", "url": f"https://docs.aws.amazon.com/page-{i % 4}"} for i in range(12)]
+    urls = [dict(reversed(list(args.items()))) if i % 2 else args for i, args in enumerate(urls)]
+    # Repeated POSTs must reach the server every time
+    urls += [{"method": "POST", "url": "https://example.com/api/items"}] * 2
+    print(f"🧰 Tool result cache: {runs} rounds of {len(urls)} http_request calls (4 distinct GETs, "
+          f"2 identical POSTs) + file_write\n")
+
+    for label, backend in (("no cache", "none"), ("memory", "memory")):
+        http, writer = StubToolModule("http_request", 0.1), StubToolModule("file_write", 0.02)
+        cache = create_tool_cache(backend)
+        tools = [as_agent_tool(tool) for tool in (cache.wrap([http, writer]) if cache else [http, writer])]
+        start = time.time()
+        for _ in range(runs):
+            for i, args in enumerate(urls):
+                asyncio.run(drive_tool(tools[0], args, i))
+                asyncio.run(drive_tool(tools[1], {"path": "notes.md"}, i))
+        ratio = f"{cache.hit_ratio():.1%}" if cache else "-"
+        print(f"   {label:<9} {time.time() - start:.2f}s  http_request runs {http.calls:>3}  "
+              f"file_write runs {writer.calls:>3}  hit ratio {ratio}")
+
+BENCHMARKS = {
+    "modes": bench_modes,
+    "load": bench_load,
+    "cache": bench_cache,
+    "stream": bench_stream,
+    "context": bench_context,
+    "router": bench_router,
+    "models": bench_models,
+    "faults": bench_faults,
+    "trace": bench_trace,
+    "soak": bench_soak,
+    "tools": bench_tools,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-agent pipeline with stub agents")
+    parser.add_argument("benchmark", nargs="?", default="modes", choices=BENCHMARKS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args.runs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Progress Store Stress Test
+Hammers the progress store from many threads and processes and checks no update was lost or duplicated
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from progress_store import SqliteProgressStore, import_json_progress, student_id
+
+SKILLS = [f"Skill {i}" for i in range(12)]
+
+def json_track_progress(directory: str, student_name: str, completed_skill: str):
+    """The original read-modify-write of progress_<name>.json, for comparison"""
+    progress_file = os.path.join(directory, f"progress_{student_id(student_name)}.json")
+    try:
+        with open(progress_file, 'r') as f:
+            progress = json.load(f)
+    except (FileNotFoundError, ValueError):  # ValueError: caught another writer mid-write
+        progress = {"completed": [], "started": datetime.now().isoformat()}
+    if completed_skill not in progress["completed"]:
+        progress["completed"].append(completed_skill)
+        progress["last_updated"] = datetime.now().isoformat()
+        with open(progress_file, 'w') as f:
+            json.dump(progress, f, indent=2)
+
+def workload(students: int, updates: int, seed: int):
+    """(student, skill) updates with plenty of duplicates and contention on the same students"""
+    rng = random.Random(seed)
+    return [(f"Student {rng.randrange(students)}", rng.choice(SKILLS)) for _ in range(updates)]
+
+def expected(updates):
+    completed = {}
+    for name, skill in updates:
+        completed.setdefault(student_id(name), set()).add(skill)
+    return completed
+
+def sqlite_worker(path: str, updates):
+    store = SqliteProgressStore(path)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda update: store.record(*update, career_path="devops"), updates))
+    store.close()
+
+def json_worker(directory: str, updates):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda update: json_track_progress(directory, *update), updates))
+
+def run(worker, target, batches):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+        list(executor.map(worker, [target] * len(batches), batches))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrency stress test for the progress store")
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--updates", type=int, default=2000, help="updates per process")
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    batches = [workload(args.students, args.updates, seed) for seed in range(args.processes)]
+    want = expected([update for batch in batches for update in batch])
+    total = sum(len(skills) for skills in want.values())
+    print(f"{args.processes} processes x 8 threads, {args.processes * args.updates} updates, "
+          f"{total} distinct (student, skill) pairs")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed = run(json_worker, tmp, batches)
+        lost = 0
+        for sid, skills in want.items():
+            try:
+                with open(os.path.join(tmp, f"progress_{sid}.json"), 'r') as f:
+                    lost += len(skills - set(json.load(f)["completed"]))
+            except (FileNotFoundError, ValueError):
+                lost += len(skills)
+        print(f"\n=== progress_*.json ===\n   {elapsed:.2f}s, {lost} of {total} completions lost")
+
+        path = os.path.join(tmp, "progress.db")
+        elapsed = run(sqlite_worker, path, batches)
+        store = SqliteProgressStore(path)
+        lost = duplicated = 0
+        for sid, skills in want.items():
+            completed = store.progress(sid)["completed"]
+            lost += len(skills - set(completed))
+            duplicated += len(completed) - len(set(completed))
+        stats = store.cohort_stats("devops")
+        print(f"\n=== sqlite store ===\n   {elapsed:.2f}s, {lost} lost, {duplicated} duplicated, "
+              f"{stats['completions']} completions across {stats['students']} students")
+
+        # Migrating the JSON files the first run left behind is idempotent
+        imported = import_json_progress(store, tmp)
+        again = import_json_progress(store, tmp)
+        print(f"\n=== import of progress_*.json ===\n   {len(imported)} students imported, "
+              f"rerun left completions at {store.cohort_stats()['completions']} "
+              f"({len(again)} files re-read)")
+
+        start = time.perf_counter()
+        for _ in range(200):
+            store.cohort_stats("devops")
+        print(f"\n=== cohort_stats ===\n   {(time.perf_counter() - start) / 200 * 1000:.2f} ms per query")
+        store.close()
+
+    assert lost == 0 and duplicated == 0, "sqlite store lost or duplicated completions"
+
+if __name__ == "__main__":
+    main()
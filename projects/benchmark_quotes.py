@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Quote Client Benchmark
+Drives QuoteClient against a local stub quotes API that goes healthy -> down -> healthy - no internet needed
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from quote_client import CircuitBreaker, QuoteClient
+
+class StubQuotesAPI(BaseHTTPRequestHandler):
+    """quotable.io-shaped responses; the server's mode decides latency and failures"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_GET(self):
+        self.server.requests += 1
+        self.server.client_ports.add(self.client_address[1])
+        if self.server.mode == "down":
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        time.sleep(self.server.latency)
+        body = json.dumps({"content": f"Quote #{self.server.requests}", "author": "Stub"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_stub(latency: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubQuotesAPI)
+    server.mode, server.latency, server.requests, server.client_ports = "up", latency, 0, set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def bench_connections(server: ThreadingHTTPServer, calls: int):
+    url = f"http://127.0.0.1:{server.server_port}/random"
+    print(f"🔗 {calls} sequential requests: fresh connection each vs pooled keep-alive\n")
+    for label, get in (("requests.get", requests.get), ("QuoteClient", QuoteClient(url).session.get)):
+        server.client_ports.clear()
+        start = time.time()
+        for _ in range(calls):
+            get(url, timeout=(2, 3))
+        print(f"   {label:<13} {(time.time() - start) / calls * 1000:6.2f}ms/request  "
+              f"connections {len(server.client_ports)}")
+
+def bench_outage(server: ThreadingHTTPServer, calls: int):
+    url = f"http://127.0.0.1:{server.server_port}/random"
+    client = QuoteClient(url, buffer_size=5, low_watermark=2,
+                         breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.5))
+    client.start()
+    time.sleep(0.3)
+
+    print(f"\n💥 Tool calls while the API goes up -> down -> up ({calls} calls per phase)\n")
+    for phase in ("up", "down", "up"):
+        server.mode = phase
+        requests_before = server.requests
+        latencies, fallbacks = [], 0
+        for _ in range(calls):
+            start = time.time()
+            fallbacks += client.get_quote() is None
+            latencies.append(time.time() - start)
+            time.sleep(0.05)
+        print(f"   API {phase:<5} worst call {max(latencies) * 1000:5.2f}ms  local fallbacks {fallbacks:>2}  "
+              f"API requests {server.requests - requests_before:>2}  breaker {client.breaker.state}")
+    print(f"\n   stats {client.stats}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark QuoteClient against a local stub API")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub API latency (seconds)")
+    args = parser.parse_args()
+
+    server = start_stub(args.latency)
+    bench_connections(server, args.calls)
+    bench_outage(server, args.calls)
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Roadmap Batch Benchmark
+Runs RoadmapAgent batch mode against stubbed agents with injected latency - no model calls
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import threading
+import time
+from roadmap_agent import CAREER_SKILLS, assess_skills, run_batch
+
+CAREERS = {
+    "devops": ["Git", "Linux", "Docker", "Kubernetes", "CI/CD", "AWS"],
+    "cloud": ["AWS Basics", "Networking", "Security", "Serverless"],
+    "ai": ["Python", "Math", "ML Basics", "Deep Learning"],
+}
+
+class StubAgent:
+    """Stand-in for strands.Agent that sleeps instead of calling a model, keeping history like an Agent"""
+
+    latency = 0.2
+    calls = 0
+    max_history = 0  # most messages any call started from
+    lock = threading.Lock()
+
+    def __init__(self, **kwargs):
+        self.messages = []
+
+    def __call__(self, prompt: str) -> str:
+        with StubAgent.lock:
+            StubAgent.calls += 1
+            StubAgent.max_history = max(StubAgent.max_history, len(self.messages))
+        time.sleep(self.latency)
+        answer = f"stub answer to: {prompt.splitlines()[0]}"
+        self.messages += [{"role": "user", "content": [{"text": prompt}]},
+                          {"role": "assistant", "content": [{"text": answer}]}]
+        return answer
+
+def write_cohort(path: str, size: int):
+    random.seed(3)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "career_path", "current_skills", "timeline_months"])
+        for i in range(size):
+            career = random.choice(list(CAREERS))
+            skills = ", ".join(random.sample(CAREERS[career], 2))
+            writer.writerow([f"Student {i}", career, skills, random.choice([3, 6, 12])])
+
+def substring_assess(career_path: str, current_skills: str):
+    """The original per-skill substring scan, for comparison"""
+    path_skills = CAREER_SKILLS.get(career_path.lower(), [])
+    skill_list = [s.strip().lower() for s in current_skills.split(",")]
+    return sum(1 for skill in path_skills if any(s in skill.lower() for s in skill_list))
+
+def bench_assessment(rounds: int = 20000):
+    inputs = [("devops", "git, linux, docker, k8s, jenkins, terraform, bash, python, go, helm"),
+              ("ai", "python, machine learning, pytorch, statistics"),
+              ("cloud", "aws, vpc, lambda, iam")]
+    for label, assess in (("substring scan", substring_assess), ("skill index", assess_skills)):
+        start = time.perf_counter()
+        for i in range(rounds):
+            career, skills = inputs[i % len(inputs)]
+            assess(career, skills)
+        print(f"   {label:<15} {(time.perf_counter() - start) / rounds * 1e6:6.2f} us/assessment")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark roadmap batch generation with stub agents")
+    parser.add_argument("--students", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # progress.db is created in the working directory
+        os.chdir(tmp)
+        cohort = os.path.join(tmp, "cohort.csv")
+        write_cohort(cohort, args.students)
+
+        results = {}
+        for workers in (1, 4, 16):
+            print(f"\n=== {workers} worker(s) ===")
+            StubAgent.calls = 0
+            results[workers] = run_batch(cohort, os.path.join(tmp, f"out-{workers}"), workers, StubAgent)
+            results[workers]["calls_per_student"] = StubAgent.calls / max(1, results[workers]["generated"])
+
+        # Simulate a crash halfway through: drop half the outputs and rerun
+        out = os.path.join(tmp, "out-16")
+        for name in sorted(os.listdir(out))[::2]:
+            os.remove(os.path.join(out, name))
+        print("\n=== resume after losing half the outputs ===")
+        resumed = run_batch(cohort, out, 16, StubAgent)
+
+    print("\n📊 Students per minute")
+    for workers, report in results.items():
+        print(f"   {workers:>2} workers  {report['students_per_minute']:7.1f}  "
+              f"({report['calls_per_student']:.1f} model calls/student)")
+    print(f"   resume     skipped {resumed['skipped']}, regenerated {resumed['generated']}")
+    # Reused per-thread agents must not carry earlier students' conversations
+    print(f"   history    at most {StubAgent.max_history} messages before a student's call")
+    assert StubAgent.max_history == 0, "a student's prompt carried another student's conversation"
+
+    print("\n📊 Skill assessment (no model call)")
+    bench_assessment()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Context Handoff Between Pipeline Roles
+Forwards compacted upstream outputs to downstream roles within a token budget
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+# ~4 characters per token is close enough for English prose and costs nothing
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def output_text(output: Dict[str, Any]) -> str:
+    """Plain text of a step output (a string or a Bedrock-style message)"""
+    content = output.get("content", "")
+    if isinstance(content, dict):
+        return "\n".join(block.get("text", "") for block in content.get("content", [])
+                         if isinstance(block, dict)).strip()
+    return str(content).strip()
+
+def compact_text(text: str, budget_tokens: int) -> str:
+    """Shrink text to the budget, keeping headings and list items before prose.
+
+    Structured lines (headings, bullets, numbered steps) carry most of the
+    signal in planner/analyst output, so they are kept first in their
+    original order; remaining budget is filled with prose lines.
+    """
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    structured = re.compile(r"^(#+\s|[-*•]\s|\d+[.)]\s)")
+    ranked = sorted(range(len(lines)), key=lambda i: (not structured.match(lines[i]), i))
+
+    kept, used = set(), 0
+    for i in ranked:
+        cost = estimate_tokens(lines[i]) + 1
+        if used + cost > budget_tokens:
+            continue
+        kept.add(i)
+        used += cost
+
+    if not kept:
+        return text[:budget_tokens * CHARS_PER_TOKEN].rstrip() + "…"
+    return "\n".join(lines[i] for i in sorted(kept))
+
+def build_handoff(upstream: List[Tuple[str, Dict[str, Any]]], budget_tokens: int) -> Tuple[str, Dict[str, int]]:
+    """Context block from successful upstream steps, with the budget split evenly between them"""
+    usable = [(role, output_text(step["output"])) for role, step in upstream
+              if step["output"].get("status") == "success"]
+    usable = [(role, text) for role, text in usable if text]
+    if not usable or budget_tokens <= 0:
+        return "", {"full_tokens": 0, "forwarded_tokens": 0, "tokens_saved": 0}
+
+    share = budget_tokens // len(usable)
+    sections = [f"[{role}]\n{compact_text(text, share)}" for role, text in usable]
+    context = "\n\n".join(sections)
+
+    full_tokens = sum(estimate_tokens(text) for _, text in usable)
+    forwarded_tokens = estimate_tokens(context)
+    return context, {
+        "full_tokens": full_tokens,
+        "forwarded_tokens": forwarded_tokens,
+        "tokens_saved": max(0, full_tokens - forwarded_tokens)
+    }
@@ -0,0 +1,142 @@
+"""
+Rolling Conversation Window
+Sliding window of recent turns plus a rolling summary of evicted ones, so long chat loops keep a flat prompt size
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+from strands.agent.conversation_manager import ConversationManager
+from agent_pool import trim_history
+from context_handoff import estimate_tokens
+
+SUMMARY_HEADER = "Summary of the earlier conversation (oldest first):"
+
+def message_text(message: Dict[str, Any]) -> str:
+    """Text of a message's content blocks; tool calls and results are reduced to their name/status"""
+    parts = []
+    for block in message.get("content", []):
+        if "text" in block:
+            parts.append(block["text"])
+        elif "toolUse" in block:
+            parts.append(f"[called {block['toolUse'].get('name')}]")
+        elif "toolResult" in block:
+            parts.append(f"[tool {block['toolResult'].get('status', 'result')}]")
+    return " ".join(parts).strip()
+
+def history_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(estimate_tokens(message_text(message)) for message in messages)
+
+def bullet_summarizer(summary: str, evicted: List[Dict[str, Any]], budget_tokens: int) -> str:
+    """Default summarizer, no model call: one clipped bullet per evicted message, newest kept within budget"""
+    lines = [line for line in summary.splitlines() if line.strip()]
+    for message in evicted:
+        text = " ".join(message_text(message).split())
+        if text:
+            clipped = text if len(text) <= 160 else text[:157].rstrip() + "..."
+            lines.append(f"- {message['role']}: {clipped}")
+
+    kept, used = [], 0
+    for line in reversed(lines):
+        used += estimate_tokens(line) + 1
+        if used > budget_tokens:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+def agent_summarizer(agent_factory: Callable[..., Any]) -> Callable[[str, List[Dict[str, Any]], int], str]:
+    """Summarizer that folds evicted turns into the summary with a separate, history-free agent"""
+    summarizer = agent_factory(system_prompt="You maintain a running summary of a chat. Reply with the "
+                                             "updated summary only, as short bullet points.")
+
+    def summarize(summary: str, evicted: List[Dict[str, Any]], budget_tokens: int) -> str:
+        summarizer.messages.clear()
+        transcript = "\n".join(f"{message['role']}: {message_text(message)}" for message in evicted)
+        result = summarizer(f"Current summary:\n{summary or '(empty)'}\n\nNew turns:\n{transcript}\n\n"
+                            f"Updated summary in under {budget_tokens * 3 // 4} words:")
+        return bullet_summarizer(str(result).strip(), [], budget_tokens)
+
+    return summarize
+
+class RollingWindowConversationManager(ConversationManager):
+    """Keeps the last window_messages messages and at most max_tokens of history (None: no limit).
+
+    After every turn older messages are evicted (never splitting a toolUse from
+    its toolResult), folded into a rolling summary of at most summary_tokens
+    and shown to the model through the system prompt. turn() runs one chat turn
+    and records its prompt size and latency in self.turns.
+    """
+
+    def __init__(self, window_messages: Optional[int] = 10, max_tokens: Optional[int] = 2000,
+                 summary_tokens: int = 300,
+                 summarizer: Callable[[str, List[Dict[str, Any]], int], str] = bullet_summarizer):
+        super().__init__()
+        self.window_messages = window_messages
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.summarizer = summarizer
+        self.summary = ""
+        self.base_prompt: Optional[str] = None
+        self.turns: List[Dict[str, Any]] = []
+
+    def apply_management(self, agent: Any, **kwargs: Any) -> None:
+        kept = list(agent.messages)
+        if self.window_messages:
+            trim_history(kept, self.window_messages)
+        while self.max_tokens and len(kept) > 2 and history_tokens(kept) > self.max_tokens:
+            trim_history(kept, len(kept) - 2)
+        evicted = agent.messages[:len(agent.messages) - len(kept)]
+        if evicted:
+            self._evict(agent, evicted)
+
+    def reduce_context(self, agent: Any, e: Optional[Exception] = None, **kwargs: Any) -> None:
+        """Context overflow: evict down to the last full turn, then give up"""
+        kept = list(agent.messages)
+        trim_history(kept, max(1, len(kept) // 2))
+        if len(kept) == len(agent.messages):
+            if e:
+                raise e
+            return
+        self._evict(agent, agent.messages[:len(agent.messages) - len(kept)])
+
+    def _evict(self, agent: Any, evicted: List[Dict[str, Any]]):
+        if self.base_prompt is None:
+            self.base_prompt = agent.system_prompt or ""
+        self.summary = self.summarizer(self.summary, evicted, self.summary_tokens)
+        del agent.messages[:len(evicted)]
+        self.removed_message_count += len(evicted)
+        agent.system_prompt = self.prompt(self.base_prompt)
+
+    def prompt(self, base_prompt: str) -> str:
+        """base_prompt with the rolling summary appended, for building an agent that continues this chat"""
+        self.base_prompt = base_prompt
+        return f"{base_prompt}\n\n{SUMMARY_HEADER}\n{self.summary}" if self.summary else base_prompt
+
+    def get_state(self) -> Dict[str, Any]:
+        return {**super().get_state(), "summary": self.summary}
+
+    def restore_from_session(self, state: Dict[str, Any]):
+        super().restore_from_session(state)
+        self.summary = state.get("summary", "")
+        return None
+
+    def turn(self, agent: Any, message: str) -> Any:
+        """agent(message), recording prompt tokens (system + history + message) and latency"""
+        prompt_tokens = (estimate_tokens(agent.system_prompt or "") + history_tokens(agent.messages)
+                         + estimate_tokens(message))
+        start = time.time()
+        response = agent(message)
+        self.turns.append({
+            "turn": len(self.turns) + 1,
+            "prompt_tokens": prompt_tokens,
+            "history_messages": len(agent.messages),
+            "summary_tokens": estimate_tokens(self.summary),
+            "latency": time.time() - start
+        })
+        return response
+
+def create_conversation_manager(mode: str = "rolling", window_messages: int = 10, max_tokens: int = 2000,
+                                summary_tokens: int = 300):
+    """Conversation manager for a chat loop: "rolling" (window + summary) or "full" (whole history)"""
+    if mode == "full":
+        return RollingWindowConversationManager(window_messages=None, max_tokens=None)
+    return RollingWindowConversationManager(window_messages, max_tokens, summary_tokens)
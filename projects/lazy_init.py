@@ -0,0 +1,40 @@
+"""
+Lazy Initialization
+Opt-in deferred Agent construction (AGENT_LAZY_INIT=true) and on-demand imports of strands_tools modules
+"""
+
+import importlib
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Callable, List, Union
+
+def lazy_init_enabled() -> bool:
+    """AGENT_LAZY_INIT=true: build agents on first use instead of at construction"""
+    return os.getenv("AGENT_LAZY_INIT", "false").lower() == "true"
+
+@lru_cache(maxsize=None)
+def import_tool(name: str) -> Any:
+    """strands_tools module by name ("http_request"), imported the first time it's asked for"""
+    return importlib.import_module(f"strands_tools.{name}")
+
+def load_tools(tools: List[Union[str, Any]]) -> List[Any]:
+    """Tool list with strands_tools names replaced by their modules"""
+    return [import_tool(tool) if isinstance(tool, str) else tool for tool in tools]
+
+class LazyValue:
+    """Value built by factory on first get(), once, even with several threads asking at the same time"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.value = None
+        self.built = False
+        self.lock = threading.Lock()
+
+    def get(self) -> Any:
+        if not self.built:
+            with self.lock:
+                if not self.built:
+                    self.value = self.factory()
+                    self.built = True
+        return self.value
@@ -0,0 +1,297 @@
+"""
+Local Vector Memory
+Drop-in alternative to mem0_memory: on-disk embeddings per user, memory-mapped and searched with numpy, no API key
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+from strands.tools.tools import PythonAgentTool
+
+# Rows scored per numpy batch, so recall never needs more than one chunk of vectors in RAM
+SCAN_CHUNK = 65536
+
+TOOL_SPEC = {
+    "name": "local_memory",
+    "description": (
+        "Memory management tool for storing, retrieving, and managing memories on local disk.\n\n"
+        "Actions:\n"
+        "- store: Store new memory\n"
+        "- get: Get memory by ID\n"
+        "- list: List all memories\n"
+        "- retrieve: Semantic search\n"
+        "- delete: Delete memory\n"
+        "- history: Get memory history\n\n"
+        "Note: Tenant identity (user/agent) is configured by the operator and cannot be changed."
+    ),
+    "inputSchema": {
+        "json": {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "description": "Action to perform (store, get, list, retrieve, delete, history)",
+                    "enum": ["store", "get", "list", "retrieve", "delete", "history"]
+                },
+                "content": {"type": "string", "description": "Content to store (required for store action)"},
+                "memory_id": {"type": "string",
+                              "description": "Memory ID (required for get, delete, history actions)"},
+                "query": {"type": "string", "description": "Search query (required for retrieve action)"},
+                "metadata": {"type": "object", "description": "Optional metadata to store with the memory"}
+            },
+            "required": ["action"]
+        }
+    }
+}
+
+@lru_cache(maxsize=65536)
+def _feature(token: str):
+    # crc32 rather than hash(): str hashes change between processes and the vectors live on disk
+    h = zlib.crc32(token.encode())
+    return h >> 1, 1.0 if h & 1 else -1.0
+
+class HashingEmbedder:
+    """Local text embedding: signed feature hashing of word unigrams and bigrams, L2-normalized.
+
+    Needs no model, so it is only as good as word overlap. Any callable that
+    maps a list of texts to an (n, dim) float32 array can be used instead,
+    e.g. one backed by a Bedrock embedding model.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"\w+", text.lower())
+            for token in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                index, sign = _feature(token)
+                vectors[row, index % self.dim] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+class LocalMemoryStore:
+    """Memories under root/: metadata in memories.db, vectors in one <namespace>.f32 file per user.
+
+    A vector file is raw float32 rows, appended to on insert and opened with
+    np.memmap on recall, so opening the store reads nothing and recall pages
+    in only the user's own vectors. Row i of the file is the memory with
+    row = i in memories.db; deletes are tombstones.
+    """
+
+    def __init__(self, root: str = "memory_store", embedder: Optional[Callable[[Sequence[str]], np.ndarray]] = None,
+                 dim: int = 256):
+        self.root = root
+        self.embedder = embedder or HashingEmbedder(dim)
+        self.dim = dim
+        os.makedirs(root, exist_ok=True)
+        self.lock = threading.Lock()
+        self._maps: Dict[str, np.memmap] = {}
+        self.conn = sqlite3.connect(os.path.join(root, "memories.db"), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS memories (
+            id TEXT PRIMARY KEY, namespace TEXT, row INTEGER, memory TEXT, metadata TEXT,
+            created_at REAL, deleted_at REAL)""")
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_namespace_row ON memories (namespace, row)")
+        self.conn.commit()
+
+    def _vector_path(self, namespace: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^A-Za-z0-9_.-]", "_", namespace) + ".f32")
+
+    def _vectors(self, namespace: str) -> Optional[np.memmap]:
+        path = self._vector_path(namespace)
+        rows = os.path.getsize(path) // (self.dim * 4) if os.path.exists(path) else 0
+        if rows == 0:
+            return None
+        vectors = self._maps.get(namespace)
+        if vectors is None or len(vectors) != rows:
+            vectors = self._maps[namespace] = np.memmap(path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return vectors
+
+    def add_many(self, namespace: str, contents: Sequence[str], metadata: Optional[Sequence[dict]] = None,
+                 vectors: Optional[np.ndarray] = None) -> List[str]:
+        """Batch insert: one embedding call, one file append and one transaction; returns the new ids"""
+        if vectors is None:
+            vectors = self.embedder(contents)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(contents), self.dim)
+        metadata = metadata or [None] * len(contents)
+        ids = [str(uuid.uuid4()) for _ in contents]
+        now = time.time()
+        with self.lock:
+            path = self._vector_path(namespace)
+            # The sqlite write lock serializes inserts across every store and process on this root,
+            # so the next row comes from the committed rows and the vector write can't interleave
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                start = self.conn.execute("SELECT COALESCE(MAX(row), -1) + 1 FROM memories WHERE namespace = ?",
+                                          (namespace,)).fetchone()[0]
+                # Written at the row's offset: rows past the last committed one (a crash between
+                # write and commit) are never returned and get overwritten by the next insert
+                with open(path, 'r+b' if os.path.exists(path) else 'w+b') as f:
+                    f.seek(start * self.dim * 4)
+                    f.write(vectors.tobytes())
+                self.conn.executemany("INSERT INTO memories VALUES (?, ?, ?, ?, ?, ?, NULL)", [
+                    (memory_id, namespace, start + i, content, json.dumps(meta) if meta else None, now)
+                    for i, (memory_id, content, meta) in enumerate(zip(ids, contents, metadata))
+                ])
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+        return ids
+
+    def add(self, namespace: str, content: str, metadata: Optional[dict] = None) -> str:
+        return self.add_many(namespace, [content], [metadata])[0]
+
+    def _row(self, row) -> Dict[str, Any]:
+        memory = {"id": row[0], "memory": row[1], "metadata": json.loads(row[2]) if row[2] else None,
+                  "created_at": row[3]}
+        if len(row) > 4:
+            memory["score"] = row[4]
+        return memory
+
+    def get(self, namespace: str, memory_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT id, memory, metadata, created_at FROM memories "
+                                    "WHERE id = ? AND namespace = ? AND deleted_at IS NULL",
+                                    (memory_id, namespace)).fetchone()
+        return self._row(row) if row else None
+
+    def list(self, namespace: str, limit: int = 100) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute("SELECT id, memory, metadata, created_at FROM memories "
+                                     "WHERE namespace = ? AND deleted_at IS NULL ORDER BY row DESC LIMIT ?",
+                                     (namespace, limit)).fetchall()
+        return [self._row(row) for row in rows]
+
+    def delete(self, namespace: str, memory_id: str) -> bool:
+        with self.lock, self.conn:
+            return self.conn.execute("UPDATE memories SET deleted_at = ? WHERE id = ? AND namespace = ? "
+                                     "AND deleted_at IS NULL", (time.time(), memory_id, namespace)).rowcount > 0
+
+    def history(self, namespace: str, memory_id: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT memory, created_at, deleted_at FROM memories "
+                                    "WHERE id = ? AND namespace = ?", (memory_id, namespace)).fetchone()
+        if row is None:
+            return []
+        events = [{"memory_id": memory_id, "event": "ADD", "new_memory": row[0], "created_at": row[1]}]
+        if row[2]:
+            events.append({"memory_id": memory_id, "event": "DELETE", "old_memory": row[0], "created_at": row[2]})
+        return events
+
+    def search(self, namespace: str, query: str, k: int = 5, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """Top-k memories by cosine similarity to the query"""
+        with self.lock:
+            vectors = self._vectors(namespace)
+            if vectors is None:
+                return []
+            deleted = {row for (row,) in self.conn.execute(
+                "SELECT row FROM memories WHERE namespace = ? AND deleted_at IS NOT NULL", (namespace,))}
+        q = self.embedder([query])[0]
+        want = k + len(deleted)
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, len(vectors), SCAN_CHUNK):
+            scores = vectors[start:start + SCAN_CHUNK] @ q
+            if len(scores) > want:
+                top = np.argpartition(scores, -want)[-want:]
+            else:
+                top = np.arange(len(scores))
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_scores) > want:
+                keep = np.argpartition(best_scores, -want)[-want:]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+        order = np.argsort(-best_scores)
+        hits = [(int(best_rows[i]), float(best_scores[i])) for i in order
+                if int(best_rows[i]) not in deleted and best_scores[i] > min_score][:k]
+        if not hits:
+            return []
+        scores = dict(hits)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT id, memory, metadata, created_at, row FROM memories WHERE namespace = ? "
+                f"AND row IN ({','.join('?' * len(hits))})", (namespace, *scores)).fetchall()
+        results = [self._row((*row[:4], scores[row[4]])) for row in rows]
+        return sorted(results, key=lambda memory: -memory["score"])
+
+    def count(self, namespace: str) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM memories WHERE namespace = ? AND deleted_at IS NULL",
+                                     (namespace,)).fetchone()[0]
+
+    def close(self):
+        self._maps.clear()
+        self.conn.close()
+
+class LocalMemoryTool:
+    """local_memory tool bound to one user (or agent) namespace, like strands_tools' Mem0MemoryTool"""
+
+    def __init__(self, user_id: Optional[str] = None, agent_id: Optional[str] = None,
+                 store: Optional[LocalMemoryStore] = None, top_k: int = 5):
+        if not user_id and not agent_id:
+            raise ValueError("Either user_id or agent_id must be provided to LocalMemoryTool")
+        self.namespace = f"user_{user_id}" if user_id else f"agent_{agent_id}"
+        self.store = store or LocalMemoryStore(os.getenv("LOCAL_MEMORY_PATH", "memory_store"))
+        self.top_k = top_k
+
+    def local_memory(self, tool: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        tool_use_id = tool.get("toolUseId", "default-id")
+        tool_input = tool.get("input", {})
+        try:
+            result = self._run(tool_input.get("action"), tool_input)
+        except ValueError as error:
+            return {"toolUseId": tool_use_id, "status": "error", "content": [{"text": f"Error: {error}"}]}
+        return {"toolUseId": tool_use_id, "status": "success", "content": [{"text": json.dumps(result, indent=2)}]}
+
+    def agent_tool(self) -> PythonAgentTool:
+        return PythonAgentTool(TOOL_SPEC["name"], TOOL_SPEC, self.local_memory)
+
+    def _run(self, action: Optional[str], tool_input: Dict[str, Any]) -> Any:
+        required = {"store": "content", "retrieve": "query", "get": "memory_id", "delete": "memory_id",
+                    "history": "memory_id"}
+        if action not in TOOL_SPEC["inputSchema"]["json"]["properties"]["action"]["enum"]:
+            raise ValueError(f"Unknown action: {action}")
+        if action in required and not tool_input.get(required[action]):
+            raise ValueError(f"{required[action]} is required for {action} action")
+
+        if action == "store":
+            memory_id = self.store.add(self.namespace, tool_input["content"], tool_input.get("metadata"))
+            return [{"id": memory_id, "memory": tool_input["content"], "event": "ADD"}]
+        if action == "retrieve":
+            return self.store.search(self.namespace, tool_input["query"], self.top_k)
+        if action == "list":
+            return self.store.list(self.namespace)
+        if action == "get":
+            memory = self.store.get(self.namespace, tool_input["memory_id"])
+            if memory is None:
+                raise ValueError(f"Memory {tool_input['memory_id']} not found")
+            return memory
+        if action == "delete":
+            if not self.store.delete(self.namespace, tool_input["memory_id"]):
+                raise ValueError(f"Memory {tool_input['memory_id']} not found")
+            return {"status": "deleted", "memory_id": tool_input["memory_id"]}
+        return self.store.history(self.namespace, tool_input["memory_id"])
+
+def local_memory_tool(user_id: Optional[str] = None, path: Optional[str] = None):
+    """Tool for Agent(tools=[...]); the user defaults to MEM0_USER_ID, the same variable mem0_memory reads"""
+    user_id = user_id or os.getenv("MEM0_USER_ID") or "default"
+    store = LocalMemoryStore(path or os.getenv("LOCAL_MEMORY_PATH", "memory_store"))
+    return LocalMemoryTool(user_id=user_id, store=store).agent_tool()
+
+def memory_tool(user_id: Optional[str] = None):
+    """mem0_memory when MEM0_API_KEY is set, otherwise the local store"""
+    if os.getenv("MEM0_API_KEY"):
+        from strands_tools import mem0_memory
+        return mem0_memory
+    return local_memory_tool(user_id)
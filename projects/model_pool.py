@@ -0,0 +1,146 @@
+"""
+Per-Role Model Pools
+Each pipeline role gets an ordered list of models; a call falls back to the next one on timeout or error
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Any, Callable, Dict, List, Tuple
+from context_handoff import estimate_tokens
+from agent_pool import trim_history
+from lazy_init import LazyValue
+
+# Background threads for calls with a timeout, so a slow model can be abandoned
+_timed_calls = ThreadPoolExecutor(max_workers=32, thread_name_prefix="model-pool")
+
+# Used when a role has no models configured: the Agent's default model, no timeout
+DEFAULT_SPEC = {"provider": "default", "model_id": "default"}
+
+def create_model(spec: Dict[str, Any]) -> Any:
+    """Build a strands model from a spec (see models.json)"""
+    if spec["provider"] == "bedrock":
+        from strands.models import BedrockModel
+        return BedrockModel(
+            model_id=spec["model_id"],
+            region_name=spec.get("region_name", "us-west-2"),
+            temperature=spec.get("temperature", 0.3),
+        )
+    if spec["provider"] == "ollama":
+        from strands.models.ollama import OllamaModel
+        return OllamaModel(
+            host=spec.get("host", "http://localhost:11434"),
+            model_id=spec["model_id"],
+            temperature=spec.get("temperature", 0.3),
+        )
+    raise ValueError(f"Unknown model provider: {spec['provider']}")
+
+def load_role_models(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Read {"roles": {"planner": [spec, ...], ...}} from a JSON file"""
+    with open(path, 'r') as f:
+        return json.load(f)["roles"]
+
+def token_usage(response: Any, prompt: str) -> Tuple[int, int]:
+    """(input, output) tokens from the AgentResult metrics, estimated when unavailable"""
+    invocation = getattr(getattr(response, "metrics", None), "latest_agent_invocation", None)
+    if invocation is not None and invocation.usage.get("inputTokens"):
+        return invocation.usage["inputTokens"], invocation.usage.get("outputTokens", 0)
+    return estimate_tokens(prompt), estimate_tokens(str(response))
+
+class ModelPool:
+    """Ordered fallback chain of agents for one role; with lazy=True each agent is built on first use"""
+
+    def __init__(self, specs: List[Dict[str, Any]], agent_factory: Callable[..., Any],
+                 model_factory: Callable[[Dict[str, Any]], Any] = create_model, lazy: bool = False,
+                 **agent_kwargs):
+        self.entries = []
+        for spec in specs or [DEFAULT_SPEC]:
+            if spec["provider"] == "default":
+                build = lambda: agent_factory(**agent_kwargs)
+            else:
+                build = lambda spec=spec: agent_factory(model=model_factory(spec), **agent_kwargs)
+            agent = LazyValue(build)
+            if not lazy:
+                agent.get()
+            self.entries.append({"spec": spec, "agent": agent})
+        # Calls given up on after a timeout that are still running, and who to tell once they stop
+        self.abandoned = set()
+        self.idle_callbacks: List[Callable[[], None]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def primary(self) -> Any:
+        return self.entries[0]["agent"].get()
+
+    def reset_history(self, window: int = 0):
+        """Trim every built agent's conversation to its last window messages"""
+        for entry in self.entries:
+            messages = getattr(entry["agent"].value, "messages", None)
+            if messages is not None:
+                trim_history(messages, window)
+
+    def _call(self, entry: Dict[str, Any], call: Callable[[Any], Any]) -> Any:
+        agent = entry["agent"].get()
+        timeout = entry["spec"].get("timeout")
+        if not timeout:
+            return call(agent)
+
+        future = _timed_calls.submit(call, agent)
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeout:
+            # Stop the abandoned call at its next safe point so the agent frees up
+            if hasattr(agent, "cancel"):
+                agent.cancel()
+            with self.lock:
+                self.abandoned.add(future)
+            future.add_done_callback(self._abandoned_done)
+            raise TimeoutError(f"{entry['spec']['model_id']} timed out after {timeout}s")
+
+    def _abandoned_done(self, future: Future):
+        with self.lock:
+            self.abandoned.discard(future)
+            if self.abandoned:
+                return
+            callbacks, self.idle_callbacks = self.idle_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def when_idle(self, callback: Callable[[], None]):
+        """Run callback now, or once every timed-out call still running on this chain has finished"""
+        with self.lock:
+            if self.abandoned:
+                self.idle_callbacks.append(callback)
+                return
+        callback()
+
+    def invoke(self, call: Callable[[Any], Any], prompt: str) -> Tuple[Any, Dict[str, Any]]:
+        """Run call(agent) down the chain; returns the response and a usage report"""
+        errors = []
+        for position, entry in enumerate(self.entries):
+            spec = entry["spec"]
+            start = time.time()
+            try:
+                response = self._call(entry, call)
+            except Exception as error:
+                errors.append(f"{spec['model_id']}: {error}")
+                if len(self.entries) == 1:
+                    raise
+                if position == len(self.entries) - 1:
+                    raise RuntimeError("All models failed: " + "; ".join(errors)) from error
+                continue
+
+            input_tokens, output_tokens = token_usage(response, prompt)
+            cost = (input_tokens * spec.get("input_cost_per_1k", 0.0) +
+                    output_tokens * spec.get("output_cost_per_1k", 0.0)) / 1000
+            return response, {
+                "model_id": spec["model_id"],
+                "provider": spec["provider"],
+                "fallback": position > 0,
+                "errors": errors,
+                "latency": time.time() - start,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost_usd": cost
+            }
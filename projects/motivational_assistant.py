@@ -3,57 +3,74 @@ Simple Motivational Chat Assistant
 Demo project: Basic Agent + API Tools + Witty Responses
 """
 
+import os
 import random
+from typing import Optional
 from strands import Agent, tool
-from strands_tools import http_request
+from conversation_window import create_conversation_manager
+from quote_client import QuoteClient
+from lazy_init import LazyValue, lazy_init_enabled, load_tools
+
+MOTIVATIONS = [
+    "Feeling stuck? That's just your brain preparing for a breakthrough! 🚀",
+    "Every bug you fix makes you stronger. You're basically a code superhero! 💪",
+    "Remember: Google exists because even experts need to look things up! 🔍",
+    "Your future self is cheering you on right now! Keep going! 🎉",
+    "Debugging is like being a detective in a crime movie, except you're both the detective and the criminal! 🕵️"
+]
 
 # Module 1: Building your First AI Agent
 class MotivationalAssistant:
-    def __init__(self):
-        self.agent = Agent(
+    def __init__(self, quotes: Optional[QuoteClient] = None, history: str = "rolling", window_messages: int = 10,
+                 max_tokens: int = 2000, lazy: Optional[bool] = None):
+        # Quotes are prefetched in the background, so the quote tool never waits on the network
+        self.quotes = quotes or QuoteClient()
+        self.quotes.start()
+        # "rolling" keeps the last turns plus a summary of older ones, so long chats don't slow down
+        self.conversation = create_conversation_manager(history, window_messages, max_tokens)
+        self._agent = LazyValue(lambda: Agent(
             model="us.anthropic.claude-sonnet-4-20250514-v1:0",
             system_prompt="""You are a witty, motivational chat assistant. 
             Keep responses short, inspiring, and add humor when appropriate. 
             Always end with an encouraging note.""",
-            tools=[self.get_api_quote, self.get_daily_motivation, http_request],
-        )
+            tools=[self.get_api_quote, self.get_daily_motivation, *load_tools(["http_request"])],
+            conversation_manager=self.conversation,
+        ))
+        # Lazy (AGENT_LAZY_INIT=true): the agent and http_request are built on the first message
+        if not (lazy_init_enabled() if lazy is None else lazy):
+            self._agent.get()
+    
+    @property
+    def agent(self):
+        return self._agent.get()
     
     # Module 2: Powering up with Tools
     @tool
     def get_api_quote(self) -> str:
         """Get a motivational quote from free API"""
-        try:
-            # Using quotable.io - free quotes API
-            response = http_request("GET", "https://api.quotable.io/random?tags=motivational")
-            if response and 'content' in response and 'author' in response:
-                return f"{response['content']} - {response['author']}"
-            else:
-                return "Every expert was once a beginner. Keep going! 🚀"
-        except:
-            return "The only way to do great work is to love what you do. - Steve Jobs"
+        # Buffered quote from quotable.io; the local list while the API is down or the buffer is empty
+        return self.quotes.get_quote() or random.choice(MOTIVATIONS)
     
     @tool
     def get_daily_motivation(self) -> str:
         """Get daily motivation based on common challenges"""
-        motivations = [
-            "Feeling stuck? That's just your brain preparing for a breakthrough! 🚀",
-            "Every bug you fix makes you stronger. You're basically a code superhero! 💪",
-            "Remember: Google exists because even experts need to look things up! 🔍",
-            "Your future self is cheering you on right now! Keep going! 🎉",
-            "Debugging is like being a detective in a crime movie, except you're both the detective and the criminal! 🕵️"
-        ]
-        return random.choice(motivations)
+        return random.choice(MOTIVATIONS)
     
     def chat(self, message: str) -> str:
         """Simple chat interface"""
-        return self.agent(message)
+        return self.conversation.turn(self.agent, message)
 
 def main():
     """Interactive chat loop"""
     print("🌟 MOTIVATIONAL CHAT ASSISTANT")
     print("Type 'quit' to exit, 'quote' for inspiration, 'motivation' for daily boost!\n")
     
-    assistant = MotivationalAssistant()
+    assistant = MotivationalAssistant(
+        history=os.getenv("CHAT_HISTORY_MODE", "rolling"),
+        window_messages=int(os.getenv("CHAT_HISTORY_WINDOW", "10")),
+        max_tokens=int(os.getenv("CHAT_HISTORY_MAX_TOKENS", "2000"))
+    )
+    show_metrics = os.getenv("CHAT_HISTORY_METRICS", "false").lower() == "true"
     
     while True:
         try:
@@ -68,6 +85,10 @@ def main():
             
             response = assistant.chat(user_input)
             print(f"Assistant: {response}\n")
+            if show_metrics:
+                turn = assistant.conversation.turns[-1]
+                print(f"   (prompt ~{turn['prompt_tokens']} tokens, {turn['history_messages']} messages, "
+                      f"{turn['latency']:.1f}s)\n")
             
         except KeyboardInterrupt:
             print("\nAssistant: Stay motivated! Bye! 👋")
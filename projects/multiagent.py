@@ -1,10 +1,22 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, AsyncIterator, Callable, Optional
+import asyncio
 import json
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from enum import Enum
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from strands import Agent
-from strands_tools import http_request
+from response_cache import ResponseCache, create_cache
+from tool_cache import ToolResultCache, create_tool_cache
+from context_handoff import build_handoff, estimate_tokens, output_text
+from query_router import Complexity, classify_query, classify_plan, strip_verdict
+from model_pool import ModelPool, create_model, load_role_models
+from agent_pool import AgentPool
+from lazy_init import lazy_init_enabled, load_tools
+from resilience import DEFAULT_RETRY_POLICY, LatencyTracker, hedged_call, retry_call
+from telemetry import Telemetry, create_exporter, tool_usage
 
 app = BedrockAgentCoreApp()
 
@@ -14,47 +26,275 @@ class AgentRole(Enum):
     ANALYST = "analyst"
     VALIDATOR = "validator"
 
+class ExecutionMode(Enum):
+    SERIAL = "serial"
+    PARALLEL = "parallel"
+
+# Canonical pipeline order - execution_trace is always reported in this order
+PIPELINE_ORDER = [AgentRole.PLANNER, AgentRole.RETRIEVER, AgentRole.ANALYST, AgentRole.VALIDATOR]
+
+# Inputs each role waits for before it can start (PLANNER -> RETRIEVER|ANALYST -> VALIDATOR)
+ROLE_DEPENDENCIES = {
+    AgentRole.PLANNER: [],
+    AgentRole.RETRIEVER: [AgentRole.PLANNER],
+    AgentRole.ANALYST: [AgentRole.PLANNER],
+    AgentRole.VALIDATOR: [AgentRole.RETRIEVER, AgentRole.ANALYST]
+}
+
+# Roles each query complexity needs; the rest are skipped
+ROUTES = {
+    Complexity.TRIVIAL: [AgentRole.PLANNER],
+    Complexity.SIMPLE: [AgentRole.PLANNER, AgentRole.ANALYST],
+    Complexity.COMPLEX: PIPELINE_ORDER
+}
+
+ROLE_PROMPTS = {
+    AgentRole.PLANNER: "Analyze and break down this request: {query}",
+    AgentRole.RETRIEVER: "Identify key information sources for: {query}",
+    AgentRole.ANALYST: "Provide expert analysis for: {query}",
+    AgentRole.VALIDATOR: "Validate the analysis quality for: {query}"
+}
+
+# Token budget for compacted upstream outputs forwarded to each role
+ROLE_CONTEXT_BUDGET = {
+    AgentRole.PLANNER: 0,
+    AgentRole.RETRIEVER: 250,
+    AgentRole.ANALYST: 400,
+    AgentRole.VALIDATOR: 600
+}
+
+# Longest a role may take, retries included (seconds)
+ROLE_DEADLINES = {
+    AgentRole.PLANNER: 30,
+    AgentRole.RETRIEVER: 60,
+    AgentRole.ANALYST: 90,
+    AgentRole.VALIDATOR: 45
+}
+
+ROLE_SYSTEM_PROMPTS = {
+    AgentRole.PLANNER: "Break complex problems into 2-3 actionable subtasks. "
+                       "Provide clear, structured response. "
+                       "End with one line 'Complexity: SIMPLE' if a direct answer will do, or "
+                       "'Complexity: COMPLEX' if it needs research and multi-step analysis.",
+    AgentRole.RETRIEVER: "Identify relevant information sources and key data points. "
+                         "Provide structured information summary.",
+    AgentRole.ANALYST: "Provide expert analysis and actionable insights. "
+                       "Give clear findings and recommendations.",
+    AgentRole.VALIDATOR: "Validate analysis quality, accuracy, and completeness. "
+                         "Provide validation status and quality assessment."
+}
+
+# strands_tools modules by name, imported when the role's first agent pool is built
+ROLE_TOOLS = {
+    AgentRole.RETRIEVER: ["http_request"]
+}
+
+def without_verdict(content: Any) -> Any:
+    """PLANNER content (a string or a Bedrock-style message) with the router's verdict line removed"""
+    if isinstance(content, dict):
+        return {**content, "content": [{**block, "text": strip_verdict(block["text"])}
+                                       if isinstance(block, dict) and "text" in block else block
+                                       for block in content.get("content", [])]}
+    return strip_verdict(str(content))
+
+class DeltaStream:
+    """One role's text deltas, forwarded from whichever call is streaming them now.
+    
+    Each streaming call (first try, retry or fallback model) opens a channel
+    that replaces the previous one; if text already went out, on_delta(None)
+    tells the client to drop it first. Closed channels are muted, so a call
+    that lost a hedge or was abandoned can't add text after the role is done.
+    """
+    
+    def __init__(self, on_delta: Callable[[Optional[str]], None]):
+        self.on_delta = on_delta
+        self.live = None
+        self.emitted = False
+        self.lock = threading.Lock()
+    
+    def open(self) -> Callable[[str], None]:
+        channel = object()
+        with self.lock:
+            self.live = channel
+            self._reset()
+        
+        def send(text: str):
+            with self.lock:
+                if self.live is channel:
+                    self.emitted = True
+                    self.on_delta(text)
+        return send
+    
+    def discard(self):
+        """Mute the live call and drop its text (the role's result came from a call that didn't stream)"""
+        with self.lock:
+            self.live = None
+            self._reset()
+    
+    def close(self):
+        with self.lock:
+            self.live = None
+    
+    def _reset(self):
+        if self.emitted:
+            self.on_delta(None)
+            self.emitted = False
+
 class MultiAgentSystem:
-    def __init__(self):
-        self.agents = {
-            AgentRole.PLANNER: Agent(
-                system_prompt="Break complex problems into 2-3 actionable subtasks. "
-                             "Provide clear, structured response."
-            ),
-            AgentRole.RETRIEVER: Agent(
-                system_prompt="Identify relevant information sources and key data points. "
-                             "Provide structured information summary.",
-                tools=[http_request]
-            ),
-            AgentRole.ANALYST: Agent(
-                system_prompt="Provide expert analysis and actionable insights. "
-                             "Give clear findings and recommendations."
-            ),
-            AgentRole.VALIDATOR: Agent(
-                system_prompt="Validate analysis quality, accuracy, and completeness. "
-                             "Provide validation status and quality assessment."
-            )
+    def __init__(self, execution_mode: ExecutionMode = ExecutionMode.PARALLEL,
+                 agent_factory: Callable[..., Any] = Agent, cache: Optional[ResponseCache] = None,
+                 adaptive: bool = True, role_models: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 model_factory: Callable[[Dict[str, Any]], Any] = create_model,
+                 retry_policy: Optional[Dict[str, Any]] = None, hedge: bool = False,
+                 request_timeout: Optional[float] = None, telemetry: Optional[Telemetry] = None,
+                 pool_size: int = 1, max_pool_size: int = 4, history_window: Optional[int] = 0,
+                 tool_cache: Optional[ToolResultCache] = None, lazy: Optional[bool] = None):
+        self.execution_mode = ExecutionMode(execution_mode)
+        self.cache = cache
+        self.tool_cache = tool_cache
+        self.adaptive = adaptive
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.hedge = hedge
+        self.request_timeout = request_timeout
+        self.latency = LatencyTracker()
+        self.telemetry = telemetry or Telemetry()
+        # Roles missing from role_models use the Agent's default model
+        self.role_models = role_models or {}
+        self.agent_factory = agent_factory
+        self.model_factory = model_factory
+        # Lazy (AGENT_LAZY_INIT=true): no agent or tool module is built until a request needs it
+        self.lazy = lazy_init_enabled() if lazy is None else lazy
+        # Hedged attempts add their checkout waits from two threads
+        self.calls_lock = threading.Lock()
+        
+        # Per-role pools of model chains: an Agent never serves two calls at once,
+        # and its history is trimmed to history_window messages on checkout
+        # (None keeps the full history across requests)
+        reset = None if history_window is None else lambda pool: pool.reset_history(history_window)
+        self.agent_pools = {
+            role: AgentPool(lambda role=role: self._new_pool(role), 0 if self.lazy else pool_size,
+                            max_pool_size, reset)
+            for role in PIPELINE_ORDER
         }
-        self.execution_trace = []
     
-    def execute_agent(self, role: AgentRole, prompt: str) -> Dict[str, Any]:
-        start_time = time.time()
+    @property
+    def agents(self) -> Dict[AgentRole, Any]:
+        """Primary agent of an idle pooled chain per role, built on access in lazy mode.
         
+        A role whose chains are all checked out at max_pool_size is left out.
+        """
+        chains = {role: pool.warm() for role, pool in self.agent_pools.items()}
+        return {role: chain.primary for role, chain in chains.items() if chain is not None}
+    
+    def _new_pool(self, role: AgentRole) -> ModelPool:
+        tools = load_tools(ROLE_TOOLS.get(role, []))
+        if self.tool_cache:
+            tools = self.tool_cache.wrap(tools)
+        return ModelPool(self.role_models.get(role.value), self.agent_factory, self.model_factory,
+                         lazy=self.lazy, system_prompt=ROLE_SYSTEM_PROMPTS[role], tools=tools)
+    
+    def _invoke_pool(self, role: AgentRole, prompt: str, deadline: float, calls: Dict[str, Any],
+                     stream: Optional[DeltaStream] = None) -> tuple:
+        """One attempt on a pooled model chain for the role; checked back in once the call ends"""
+        pool, waited = self.agent_pools[role].checkout(timeout=deadline - time.time())
+        with self.calls_lock:
+            calls["checkout_wait"] += waited
         try:
-            agent = self.agents[role]
-            response = agent(prompt)
+            # Every model down the fallback chain streams on a fresh channel
+            return pool.invoke(lambda agent: self._call_agent(agent, prompt, stream.open() if stream else None),
+                               prompt)
+        finally:
+            # A timed-out call may still be running on one of the chain's agents: keep the chain
+            # checked out until it stops, so no other request shares that conversation
+            pool.when_idle(lambda: self.agent_pools[role].checkin(pool))
+    
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {role.value: pool.snapshot() for role, pool in self.agent_pools.items()}
+    
+    def _call_agent(self, agent: Any, prompt: str, on_delta: Optional[Callable[[str], None]] = None) -> Any:
+        """Invoke an agent, forwarding text deltas to on_delta when the agent can stream"""
+        if on_delta is None or not hasattr(agent, "stream_async"):
+            return agent(prompt)
+        
+        async def consume():
+            result = None
+            async for event in agent.stream_async(prompt):
+                if "data" in event:
+                    on_delta(event["data"])
+                if "result" in event:
+                    result = event["result"]
+            return result
+        
+        # Runs on a worker thread, so it gets its own event loop
+        return asyncio.run(consume())
+    
+    def execute_agent(self, role: AgentRole, prompt: str, on_delta: Optional[Callable[[Optional[str]], None]] = None,
+                      deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Run one role with retries and optional hedging, bounded by ROLE_DEADLINES and the request deadline.
+        
+        on_delta gets the streamed text of the call currently answering, and
+        None when the text sent so far should be dropped (a retry or fallback
+        starts over, or a non-streaming hedge wins).
+        """
+        start_time = time.time()
+        system_prompt = ROLE_SYSTEM_PROMPTS[role]
+        deadline = min(start_time + ROLE_DEADLINES[role], deadline or float("inf"))
+        
+        cached = self.cache.get(role.value, system_prompt, prompt) if self.cache else None
+        model_usage = None
+        tools = []
+        calls = {"attempts": 0, "hedged": False, "checkout_wait": 0.0}
+        stream = DeltaStream(on_delta) if on_delta else None
+        
+        def attempt(remaining: float) -> tuple:
+            calls["attempts"] += 1
+            attempt_deadline = time.time() + remaining
+            # Hedge after the role's p95 latency; the hedge doesn't stream to avoid duplicate deltas
+            hedge_delay = self.latency.percentile(role.value, 95) if self.hedge else None
+            backup_results = []
             
-            # Simple response extraction
-            response_text = str(response)
-            if hasattr(response, 'message'):
-                response_text = response.message
+            def backup() -> tuple:
+                result = self._invoke_pool(role, prompt, attempt_deadline, calls)
+                backup_results.append(result)
+                return result
             
-            output = {"content": response_text, "status": "success"}
+            result, hedged = hedged_call(
+                lambda: self._invoke_pool(role, prompt, attempt_deadline, calls, stream),
+                backup, hedge_delay, remaining
+            )
+            calls["hedged"] = calls["hedged"] or hedged
+            if stream and any(result is backup_result for backup_result in backup_results):
+                stream.discard()
+            return result
+        
+        if cached is not None:
+            output = {"content": cached, "status": "success"}
             confidence = 0.9
-            
-        except Exception as error:
-            output = {"error": str(error), "status": "failed"}
-            confidence = 0.2
+        else:
+            try:
+                try:
+                    response, model_usage = retry_call(attempt, self.retry_policy, deadline)
+                finally:
+                    if stream:
+                        stream.close()
+                self.latency.record(role.value, model_usage["latency"])
+                tools = tool_usage(response)
+                
+                # Simple response extraction
+                response_text = str(response)
+                if hasattr(response, 'message'):
+                    response_text = response.message
+                
+                output = {"content": response_text, "status": "success"}
+                confidence = 0.9
+                
+                # Only successful responses are cached
+                if self.cache:
+                    self.cache.set(role.value, system_prompt, prompt, response_text)
+                
+            except Exception as error:
+                output = {"error": str(error), "status": "failed"}
+                confidence = 0.2
         
         execution_time = time.time() - start_time
         
@@ -62,70 +302,425 @@ class MultiAgentSystem:
             "role": role.value,
             "output": output,
             "confidence": confidence,
-            "execution_time": execution_time
+            "started_at": start_time,
+            "execution_time": execution_time,
+            "cache_hit": cached is not None,
+            "tools": tools,
+            "model": model_usage,
+            "attempts": calls["attempts"],
+            "hedged": calls["hedged"],
+            "checkout_wait": calls["checkout_wait"]
+        }
+    
+    def _build_prompt(self, role: AgentRole, user_query: str,
+                      upstream: Dict[AgentRole, Dict[str, Any]]) -> tuple:
+        """Role prompt plus a compacted handoff of its upstream outputs"""
+        prompt = ROLE_PROMPTS[role].format(query=user_query)
+        context, stats = build_handoff(
+            [(dep.value, upstream[dep]) for dep in ROLE_DEPENDENCIES[role] if dep in upstream],
+            ROLE_CONTEXT_BUDGET[role]
+        )
+        if context:
+            prompt += f"\n\nContext from earlier steps:\n{context}"
+        stats["prompt_tokens"] = estimate_tokens(prompt)
+        return prompt, stats
+    
+    def _route(self, user_query: str, results: Dict[AgentRole, Dict[str, Any]], adaptive: bool) -> Optional[tuple]:
+        """(complexity, decided_by), or None while waiting for the PLANNER output"""
+        if not adaptive:
+            return Complexity.COMPLEX, "disabled"
+        
+        complexity = classify_query(user_query)
+        if complexity:
+            return complexity, "heuristic"
+        
+        planner = results.get(AgentRole.PLANNER)
+        if planner is None:
+            return None
+        if planner["output"]["status"] != "success":
+            return Complexity.COMPLEX, "planner"
+        return planner["complexity"], "planner"
+    
+    def _skip_role(self, role: AgentRole, complexity: Complexity,
+                   on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        result = {
+            "role": role.value,
+            "output": {"status": "skipped", "reason": f"not needed for {complexity.value} query"},
+            "confidence": None,
+            "started_at": time.time(),
+            "execution_time": 0.0,
+            "cache_hit": False,
+            "tools": [],
+            "model": None,
+            "attempts": 0,
+            "hedged": False,
+            "checkout_wait": 0.0,
+            "context": {"full_tokens": 0, "forwarded_tokens": 0, "tokens_saved": 0, "prompt_tokens": 0}
         }
+        if on_event:
+            on_event({"event": "agent_result", **self._format_step(result)})
+        return result
+    
+    def _format_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "step": PIPELINE_ORDER.index(AgentRole(step["role"])) + 1,
+            "agent": step["role"],
+            "confidence": f"{step['confidence']:.1%}" if step["confidence"] is not None else "skipped",
+            "execution_time": f"{step['execution_time']:.2f}s",
+            # Raw numbers for aggregation alongside the formatted fields
+            "execution_time_seconds": step["execution_time"],
+            "started_at": step["started_at"],
+            "context": step["context"],
+            "model": step["model"],
+            "tools": step["tools"],
+            "attempts": step["attempts"],
+            "hedged": step["hedged"],
+            "checkout_wait_seconds": step["checkout_wait"],
+            "output": step["output"]
+        }
+    
+    def _run_role(self, role: AgentRole, user_query: str, upstream: Dict[AgentRole, Dict[str, Any]],
+                  on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Execute one role, emitting its deltas and result when streaming"""
+        on_delta = None
+        if on_event:
+            # None: a retry, fallback or hedge replaces the text streamed so far
+            on_delta = lambda text: on_event({"event": "delta_reset", "agent": role.value} if text is None
+                                             else {"event": "delta", "agent": role.value, "data": text})
+        
+        prompt, context_stats = self._build_prompt(role, user_query, upstream)
+        result = self.execute_agent(role, prompt, on_delta, deadline)
+        result["context"] = context_stats
+        
+        # Route on the PLANNER's verdict line, then drop it before the output reaches the trace or a handoff
+        if role == AgentRole.PLANNER and result["output"]["status"] == "success":
+            result["complexity"] = classify_plan(output_text(result["output"]))
+            result["output"] = {**result["output"], "content": without_verdict(result["output"]["content"])}
+        
+        if on_event:
+            on_event({"event": "agent_result", **self._format_step(result)})
+        return result
+    
+    def _run_serial(self, user_query: str, adaptive: bool, on_event=None,
+                    deadline: Optional[float] = None) -> Dict[AgentRole, Dict[str, Any]]:
+        """Execute agents one after another in pipeline order"""
+        results = {}
+        for role in PIPELINE_ORDER:
+            route = self._route(user_query, results, adaptive)
+            if route and role not in ROUTES[route[0]]:
+                results[role] = self._skip_role(role, route[0], on_event)
+            else:
+                results[role] = self._run_role(role, user_query, dict(results), on_event, deadline)
+        return results
+    
+    def _run_parallel(self, user_query: str, adaptive: bool, on_event=None,
+                      deadline: Optional[float] = None) -> Dict[AgentRole, Dict[str, Any]]:
+        """Execute each agent as soon as the roles it depends on have finished"""
+        results = {}
+        pending = {}
+        
+        with ThreadPoolExecutor(max_workers=len(PIPELINE_ORDER)) as executor:
+            while len(results) < len(PIPELINE_ORDER):
+                for role in PIPELINE_ORDER:
+                    if role in results or role in pending.values():
+                        continue
+                    
+                    # Until the route is known only the PLANNER may start
+                    route = self._route(user_query, results, adaptive)
+                    if route and role not in ROUTES[route[0]]:
+                        results[role] = self._skip_role(role, route[0], on_event)
+                        continue
+                    
+                    ready = all(dep in results for dep in ROLE_DEPENDENCIES[role])
+                    if ready and (route or role == AgentRole.PLANNER):
+                        future = executor.submit(self._run_role, role, user_query, dict(results),
+                                                 on_event, deadline)
+                        pending[future] = role
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+        
+        return results
     
-    def process_query(self, user_query: str) -> Dict[str, Any]:
+    def process_query(self, user_query: str, mode: Optional[ExecutionMode] = None,
+                      on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                      adaptive: Optional[bool] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run the pipeline; on_event receives delta/agent_result events as they happen.
+        
+        timeout (default request_timeout) is an overall deadline in seconds: roles
+        still running or not yet started when it passes are reported as failed.
+        """
         pipeline_start = time.time()
-        self.execution_trace = []
+        mode = ExecutionMode(mode) if mode else self.execution_mode
+        adaptive = self.adaptive if adaptive is None else adaptive
+        timeout = self.request_timeout if timeout is None else timeout
+        deadline = pipeline_start + timeout if timeout else None
         
-        # Execute agents in sequence
-        agents_sequence = [
-            (AgentRole.PLANNER, f"Analyze and break down this request: {user_query}"),
-            (AgentRole.RETRIEVER, f"Identify key information sources for: {user_query}"),
-            (AgentRole.ANALYST, f"Provide expert analysis for: {user_query}"),
-            (AgentRole.VALIDATOR, f"Validate the analysis quality for: {user_query}")
-        ]
+        if mode == ExecutionMode.PARALLEL:
+            results = self._run_parallel(user_query, adaptive, on_event, deadline)
+        else:
+            results = self._run_serial(user_query, adaptive, on_event, deadline)
         
-        for role, prompt in agents_sequence:
-            result = self.execute_agent(role, prompt)
-            self.execution_trace.append(result)
+        # Per-request trace - never stored on the instance
+        execution_trace = [results[role] for role in PIPELINE_ORDER]
+        executed = [step for step in execution_trace if step["confidence"] is not None]
+        complexity, decided_by = self._route(user_query, results, adaptive)
         
         # Calculate metrics
         total_time = time.time() - pipeline_start
-        avg_confidence = sum(step["confidence"] for step in self.execution_trace) / len(self.execution_trace)
+        avg_confidence = sum(step["confidence"] for step in executed) / len(executed)
+        
+        summary = {
+            "total_execution_time": f"{total_time:.2f}s",
+            "total_execution_time_seconds": total_time,
+            "execution_mode": mode.value,
+            "average_confidence": f"{avg_confidence:.1%}",
+            "agents_executed": len(executed),
+            "agents_skipped": [step["role"] for step in execution_trace if step["confidence"] is None],
+            "route": {"complexity": complexity.value, "decided_by": decided_by},
+            "prompt_tokens": sum(step["context"]["prompt_tokens"] for step in execution_trace),
+            "context_tokens_saved": sum(step["context"]["tokens_saved"] for step in execution_trace),
+            "models": {
+                step["role"]: {"model_id": step["model"]["model_id"], "fallback": step["model"]["fallback"],
+                               "latency": f"{step['model']['latency']:.2f}s",
+                               "cost_usd": round(step["model"]["cost_usd"], 6)}
+                for step in execution_trace if step["model"]
+            },
+            "retries": sum(max(step["attempts"] - 1, 0) for step in execution_trace),
+            "hedged_requests": sum(1 for step in execution_trace if step["hedged"]),
+            "checkout_wait_seconds": sum(step["checkout_wait"] for step in execution_trace),
+            "deadline_exceeded": deadline is not None and time.time() > deadline,
+            "total_cost_usd": round(sum(step["model"]["cost_usd"] for step in execution_trace if step["model"]), 6)
+        }
+        if self.cache:
+            hits = sum(1 for step in executed if step["cache_hit"])
+            summary["cache"] = {
+                "hits": hits,
+                "misses": len(executed) - hits,
+                "overall_hit_ratio": f"{self.cache.hit_ratio():.1%}"
+            }
+        if self.tool_cache:
+            summary["tool_cache"] = {
+                "tool_calls": sum(tool["call_count"] for step in executed for tool in step["tools"]),
+                "overall_hit_ratio": f"{self.tool_cache.hit_ratio():.1%}"
+            }
+        
+        trace_id = self.telemetry.record(user_query, pipeline_start, total_time, mode.value, execution_trace, {
+            "complexity": complexity.value,
+            "average_confidence": avg_confidence,
+            "total_cost_usd": summary["total_cost_usd"]
+        })
         
         # Build response
         return {
             "query": user_query,
+            "trace_id": trace_id,
             "status": "success" if avg_confidence > 0.6 else "needs_review",
-            "execution_trace": [
-                {
-                    "step": idx + 1,
-                    "agent": step["role"],
-                    "confidence": f"{step['confidence']:.1%}",
-                    "execution_time": f"{step['execution_time']:.2f}s",
-                    "output": step["output"]
-                }
-                for idx, step in enumerate(self.execution_trace)
-            ],
-            "summary": {
-                "total_execution_time": f"{total_time:.2f}s",
-                "average_confidence": f"{avg_confidence:.1%}",
-                "agents_executed": len(self.execution_trace)
-            },
+            "execution_trace": [self._format_step(step) for step in execution_trace],
+            "summary": summary,
             "results": {
                 "confidence_level": "high" if avg_confidence > 0.8 else "medium" if avg_confidence > 0.6 else "low"
             }
         }
 
-multi_agent_system = MultiAgentSystem()
+    async def stream_query(self, user_query: str, mode: Optional[ExecutionMode] = None,
+                           executor: Optional[ThreadPoolExecutor] = None,
+                           timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming process_query: yields delta and agent_result events, then the summary event last"""
+        _, events = self.start_stream(user_query, mode, executor, timeout)
+        async for event in events:
+            yield event
+    
+    def start_stream(self, user_query: str, mode: Optional[ExecutionMode] = None,
+                     executor: Optional[ThreadPoolExecutor] = None, timeout: Optional[float] = None) -> tuple:
+        """Start process_query on the executor; returns its future and an async iterator of its events.
+        
+        The future outlives the iterator: it only finishes when the query does,
+        even if the consumer stops reading halfway.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        emit = lambda event: loop.call_soon_threadsafe(events.put_nowait, event)
+        
+        def run():
+            try:
+                emit({"event": "summary", **self.process_query(user_query, mode, on_event=emit, timeout=timeout)})
+            except Exception as error:
+                emit({"event": "error", "query": user_query, "status": "error", "error_message": str(error)})
+            finally:
+                emit(None)
+        
+        future = loop.run_in_executor(executor, run)
+        
+        async def drain() -> AsyncIterator[Dict[str, Any]]:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+        
+        return future, drain()
+
+class ServerBusyError(Exception):
+    """Raised when the request queue is full"""
+
+class RequestScheduler:
+    """Runs queries concurrently on a bounded pool of MultiAgentSystem workers.
+    
+    Agent instances can't serve two invocations at once, so every in-flight
+    request checks out its own MultiAgentSystem. At most max_concurrency
+    requests run at a time, up to max_queue more wait for a worker, and
+    anything beyond that is rejected with ServerBusyError.
+    """
+    
+    def __init__(self, system_factory: Callable[[], MultiAgentSystem] = MultiAgentSystem,
+                 max_concurrency: int = 4, max_queue: int = 16):
+        self.system_factory = system_factory
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.idle_systems: List[MultiAgentSystem] = []
+        self.stats = {"in_flight": 0, "waiting": 0, "completed": 0, "rejected": 0}
+        self._semaphore = None
+    
+    async def checkout(self) -> MultiAgentSystem:
+        """Wait for a free worker slot, or raise ServerBusyError when the queue is full"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # Backpressure: refuse work instead of growing the queue without bound
+        if self._semaphore.locked() and self.stats["waiting"] >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise ServerBusyError(f"Server busy: {self.stats['waiting']} requests already queued")
+        
+        self.stats["waiting"] += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.stats["waiting"] -= 1
+        
+        self.stats["in_flight"] += 1
+        if self.idle_systems:
+            return self.idle_systems.pop()
+        # Building a system (in eager mode every role's agents and model chains) blocks,
+        # so it runs on a worker thread instead of stalling every request on the event loop
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self.system_factory)
+        except BaseException:
+            self.stats["in_flight"] -= 1
+            self._semaphore.release()
+            raise
+    
+    def checkin(self, system: MultiAgentSystem):
+        self.idle_systems.append(system)
+        self.stats["in_flight"] -= 1
+        self.stats["completed"] += 1
+        self._semaphore.release()
+    
+    async def submit(self, user_query: str, mode: Optional[ExecutionMode] = None,
+                     timeout: Optional[float] = None) -> Dict[str, Any]:
+        system = await self.checkout()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, lambda: system.process_query(user_query, mode, timeout=timeout))
+        # The worker slot is released when the query finishes, not when the caller stops waiting
+        future.add_done_callback(lambda _: self.checkin(system))
+        return await asyncio.shield(future)
+    
+    async def stream(self, user_query: str, mode: Optional[ExecutionMode] = None,
+                     timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            system = await self.checkout()
+        except ServerBusyError as error:
+            yield {"event": "error", "query": user_query, "status": "busy", "error_message": str(error)}
+            return
+        
+        # Checked in once the query finishes: a client that disconnects mid-stream
+        # doesn't free the slot (or the busy system) while the query still runs
+        future, events = system.start_stream(user_query, mode, self.executor, timeout)
+        future.add_done_callback(lambda _: self.checkin(system))
+        async for event in events:
+            yield event
+
+# Per-role model chains (see models.json); unset means the default model for every role
+role_models = load_role_models(os.environ["MULTIAGENT_MODELS_CONFIG"]) if os.getenv("MULTIAGENT_MODELS_CONFIG") else None
+
+# Tool results shared by every worker; only opted-in tools (CACHEABLE_TOOLS) are cached
+tool_cache = create_tool_cache(
+    backend=os.getenv("MULTIAGENT_TOOL_CACHE_BACKEND", "memory"),
+    path=os.getenv("MULTIAGENT_TOOL_CACHE_PATH", "tool_cache.db"),
+    default_ttl=float(os.getenv("MULTIAGENT_TOOL_CACHE_TTL", "300"))
+)
+
+# Shared by every worker: spans go to MULTIAGENT_TRACE_EXPORTER, metrics are served on {"metrics": true}
+telemetry = Telemetry(create_exporter(
+    kind=os.getenv("MULTIAGENT_TRACE_EXPORTER", "none"),
+    path=os.getenv("MULTIAGENT_TRACE_PATH", "traces.jsonl"),
+    metrics_path=os.getenv("MULTIAGENT_METRICS_PATH", "metrics.prom")
+))
+
+# Shared by every worker; MULTIAGENT_CACHE_BACKEND=sqlite shares it between processes too
+response_cache = create_cache(
+    backend=os.getenv("MULTIAGENT_CACHE_BACKEND", "memory"),
+    path=os.getenv("MULTIAGENT_CACHE_PATH", "response_cache.db"),
+    ttl_seconds=float(os.getenv("MULTIAGENT_CACHE_TTL", "3600")),
+    similarity_threshold=float(os.environ["MULTIAGENT_CACHE_SIMILARITY"])
+    if os.getenv("MULTIAGENT_CACHE_SIMILARITY") else None
+)
+
+scheduler = RequestScheduler(
+    system_factory=lambda: MultiAgentSystem(
+        cache=response_cache,
+        tool_cache=tool_cache,
+        role_models=role_models,
+        telemetry=telemetry,
+        pool_size=int(os.getenv("MULTIAGENT_AGENT_POOL_SIZE", "1")),
+        max_pool_size=int(os.getenv("MULTIAGENT_AGENT_POOL_MAX", "4")),
+        history_window=int(os.getenv("MULTIAGENT_HISTORY_WINDOW", "0")),
+        adaptive=os.getenv("MULTIAGENT_ADAPTIVE_ROUTING", "true").lower() == "true",
+        retry_policy={**DEFAULT_RETRY_POLICY, "max_attempts": int(os.getenv("MULTIAGENT_MAX_ATTEMPTS", "3"))},
+        hedge=os.getenv("MULTIAGENT_HEDGE", "false").lower() == "true",
+        request_timeout=float(os.environ["MULTIAGENT_REQUEST_TIMEOUT"])
+        if os.getenv("MULTIAGENT_REQUEST_TIMEOUT") else None
+    ),
+    max_concurrency=int(os.getenv("MULTIAGENT_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("MULTIAGENT_MAX_QUEUE", "16"))
+)
 
 @app.entrypoint
-def invoke(payload: Dict[str, Any]) -> Dict[str, Any]:
+async def invoke(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Prometheus scrape of the per-role latency histograms
+    if payload.get("metrics"):
+        return {"status": "success", "metrics": telemetry.metrics.render()}
+    
     user_query = payload.get("prompt", "Hello! How can I help you today?")
+    mode = payload.get("mode")
+    timeout = payload.get("timeout")
     
     print(f"\n Processing Query: {user_query}")
     print("=" * 60)
     
+    # Streaming: server-sent events for each delta / role result, summary last
+    if payload.get("stream"):
+        return scheduler.stream(user_query, mode=mode, timeout=timeout)
+    
     try:
-        result = multi_agent_system.process_query(user_query)
+        result = await scheduler.submit(user_query, mode=mode, timeout=timeout)
         
         print(f"Status: {result['status']}")
         print(f"Time: {result['summary']['total_execution_time']}")
         print(f"Confidence: {result['summary']['average_confidence']}")
         
         return result
+    
+    except ServerBusyError as error:
+        print(f"Busy: {str(error)}")
+        return {
+            "query": user_query,
+            "status": "busy",
+            "error_message": str(error)
+        }
         
     except Exception as error:
         print(f"Error: {str(error)}")
@@ -0,0 +1,147 @@
+"""
+Student Progress Store
+Completed skills per student in one transactional store, with cohort-wide stats and import of the old progress_*.json files
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+def student_id(student_name: str) -> str:
+    """Same slug the per-student progress_<id>.json files used"""
+    return student_name.lower().replace(' ', '_')
+
+class MemoryProgressStore:
+    """In-process store, for tests and one-off runs"""
+
+    def __init__(self):
+        self.students: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def record(self, student_name: str, skill: str, career_path: str = "", when: Optional[str] = None) -> int:
+        when = when or datetime.now().isoformat()
+        with self.lock:
+            student = self.students.setdefault(student_id(student_name), {
+                "name": student_name, "career_path": career_path, "started": when, "completed": {}
+            })
+            student["career_path"] = career_path or student["career_path"]
+            if skill not in student["completed"]:
+                student["completed"][skill] = when
+                student["last_updated"] = when
+            return len(student["completed"])
+
+    def progress(self, student_name: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            student = self.students.get(student_id(student_name))
+            if student is None:
+                return None
+            return {**student, "completed": sorted(student["completed"], key=student["completed"].get)}
+
+    def cohort_stats(self, career_path: Optional[str] = None) -> Dict[str, Any]:
+        with self.lock:
+            cohort = [s for s in self.students.values() if career_path is None or s["career_path"] == career_path]
+            skills: Dict[str, int] = {}
+            for student in cohort:
+                for skill in student["completed"]:
+                    skills[skill] = skills.get(skill, 0) + 1
+            return _stats(len(cohort), sum(len(s["completed"]) for s in cohort), skills)
+
+class SqliteProgressStore:
+    """On-disk store (default), safe to share between threads and worker processes.
+
+    Every update is one transaction: the student row is upserted and the skill
+    inserted with INSERT OR IGNORE against a (student, skill) primary key, so
+    concurrent updates can't lose each other's skills or record one twice.
+    """
+
+    def __init__(self, path: str = "progress.db"):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS students (
+            student_id TEXT PRIMARY KEY, name TEXT, career_path TEXT, started TEXT, last_updated TEXT)""")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS completed_skills (
+            student_id TEXT, skill TEXT, completed_at TEXT, PRIMARY KEY (student_id, skill))""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_career_path ON students (career_path)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_skill ON completed_skills (skill)")
+        self.conn.commit()
+
+    def record(self, student_name: str, skill: str, career_path: str = "", when: Optional[str] = None) -> int:
+        """Mark a skill completed; returns the student's completed skill count"""
+        sid, when = student_id(student_name), when or datetime.now().isoformat()
+        with self.lock, self.conn:
+            self.conn.execute("""INSERT INTO students (student_id, name, career_path, started) VALUES (?, ?, ?, ?)
+                ON CONFLICT (student_id) DO UPDATE SET career_path = COALESCE(NULLIF(excluded.career_path, ''),
+                                                                              career_path)""",
+                              (sid, student_name, career_path, when))
+            added = self.conn.execute("INSERT OR IGNORE INTO completed_skills VALUES (?, ?, ?)",
+                                      (sid, skill, when)).rowcount
+            if added:
+                self.conn.execute("UPDATE students SET last_updated = ? WHERE student_id = ?", (when, sid))
+            return self.conn.execute("SELECT COUNT(*) FROM completed_skills WHERE student_id = ?",
+                                     (sid,)).fetchone()[0]
+
+    def progress(self, student_name: str) -> Optional[Dict[str, Any]]:
+        sid = student_id(student_name)
+        with self.lock:
+            row = self.conn.execute("SELECT name, career_path, started, last_updated FROM students "
+                                    "WHERE student_id = ?", (sid,)).fetchone()
+            if row is None:
+                return None
+            skills = self.conn.execute("SELECT skill FROM completed_skills WHERE student_id = ? "
+                                       "ORDER BY completed_at", (sid,)).fetchall()
+        return {"name": row[0], "career_path": row[1], "started": row[2], "last_updated": row[3],
+                "completed": [skill for (skill,) in skills]}
+
+    def cohort_stats(self, career_path: Optional[str] = None) -> Dict[str, Any]:
+        """Students, completions and per-skill completion counts, optionally for one career path"""
+        where, params = ("WHERE s.career_path = ?", (career_path,)) if career_path is not None else ("", ())
+        with self.lock:
+            students = self.conn.execute(f"SELECT COUNT(*) FROM students s {where}", params).fetchone()[0]
+            skills = dict(self.conn.execute(f"""SELECT c.skill, COUNT(*) FROM completed_skills c
+                JOIN students s ON s.student_id = c.student_id {where} GROUP BY c.skill""", params).fetchall())
+        return _stats(students, sum(skills.values()), skills)
+
+    def close(self):
+        self.conn.close()
+
+def _stats(students: int, completions: int, skills: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        "students": students,
+        "completions": completions,
+        "avg_completed": completions / students if students else 0.0,
+        "skills": {skill: {"students": count, "ratio": count / students}
+                   for skill, count in sorted(skills.items(), key=lambda item: -item[1])}
+    }
+
+def import_json_progress(store, directory: str = ".", remove: bool = False) -> List[str]:
+    """Load progress_*.json files into the store; returns the imported student ids.
+
+    Safe to rerun: skills already in the store are left as they are. Files
+    that don't parse (e.g. torn by two concurrent writers) are skipped and kept.
+    """
+    imported = []
+    for path in sorted(glob.glob(os.path.join(directory, "progress_*.json"))):
+        try:
+            with open(path, 'r') as f:
+                progress = json.load(f)
+        except ValueError as error:
+            print(f"⚠️ Skipping unreadable {path}: {error}")
+            continue
+        name = os.path.basename(path)[len("progress_"):-len(".json")].replace('_', ' ')
+        for skill in progress.get("completed", []):
+            store.record(name, skill, when=progress.get("last_updated") or progress.get("started"))
+        imported.append(student_id(name))
+        if remove:
+            os.remove(path)
+    return imported
+
+def create_progress_store(backend: str = "sqlite", path: str = "progress.db"):
+    """Build a progress store from simple settings ("sqlite" or "memory")"""
+    if backend == "memory":
+        return MemoryProgressStore()
+    return SqliteProgressStore(path)
@@ -0,0 +1,48 @@
+"""
+Adaptive Query Router
+Decides how much of the multi-agent pipeline a query needs
+"""
+
+import re
+from enum import Enum
+from typing import Optional
+
+class Complexity(Enum):
+    TRIVIAL = "trivial"    # greetings, small talk - PLANNER answers alone
+    SIMPLE = "simple"      # single-step questions - PLANNER + ANALYST
+    COMPLEX = "complex"    # multi-step problems - full pipeline
+
+GREETING = re.compile(r"^(hi|hello|hey|howdy|thanks|thank you|good (morning|afternoon|evening)|"
+                      r"how are you|what'?s up|bye|goodbye)\b", re.IGNORECASE)
+
+COMPLEX_HINTS = {"compare", "design", "architecture", "migrate", "migration", "strategy", "plan",
+                 "evaluate", "analyze", "analyse", "tradeoff", "tradeoffs", "optimize", "roadmap",
+                 "implement", "troubleshoot", "assess"}
+
+# The PLANNER is asked to end with "Complexity: SIMPLE" or "Complexity: COMPLEX"
+VERDICT_LINE = re.compile(r"^\W*complexity\W*:\W*(simple|complex)\b", re.IGNORECASE | re.MULTILINE)
+
+# Without a verdict: numbered steps only - the PLANNER always lists 2-3 subtasks and uses headings
+STEP_LINE = re.compile(r"^\s*\d+[.)]\s+\S", re.MULTILINE)
+
+def classify_query(query: str) -> Optional[Complexity]:
+    """Cheap local heuristic; returns None when the query needs the planner's opinion"""
+    words = re.findall(r"[\w'-]+", query.lower())
+
+    if not words or (GREETING.match(query.strip()) and len(words) <= 8):
+        return Complexity.TRIVIAL
+    if len(words) >= 25 or query.count("?") > 1 or (COMPLEX_HINTS & set(words) and len(words) >= 4):
+        return Complexity.COMPLEX
+    return None
+
+def classify_plan(planner_output: str) -> Complexity:
+    """Fallback decision from the PLANNER output: its verdict line, else at least 3 numbered steps is complex"""
+    verdicts = VERDICT_LINE.findall(planner_output)
+    if verdicts:
+        return Complexity(verdicts[-1].lower())
+    steps = len(STEP_LINE.findall(planner_output))
+    return Complexity.COMPLEX if steps >= 3 else Complexity.SIMPLE
+
+def strip_verdict(planner_output: str) -> str:
+    """The PLANNER output without its verdict line, which is for the router, not the user or later roles"""
+    return "\n".join(line for line in planner_output.splitlines() if not VERDICT_LINE.match(line)).strip()
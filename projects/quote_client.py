@@ -0,0 +1,138 @@
+"""
+Quote API Client
+Pooled keep-alive HTTP client for the quotes API, with a circuit breaker and a prefetched quote buffer
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+QUOTE_API_URL = "https://api.quotable.io/random?tags=motivational"
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures, then lets one trial call through after reset_timeout"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.state = self.CLOSED
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+class QuoteClient:
+    """Keeps a buffer of quotes filled from the API in the background.
+
+    get_quote() never touches the network: it pops a buffered quote (or
+    returns None when the buffer is empty) and kicks off a refill once the
+    buffer drops below low_watermark. Refills stop as soon as a request fails
+    and are skipped entirely while the circuit breaker is open.
+    """
+
+    def __init__(self, url: str = QUOTE_API_URL, connect_timeout: float = 2.0, read_timeout: float = 3.0,
+                 buffer_size: int = 10, low_watermark: int = 3, pool_size: int = 4,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.low_watermark = low_watermark
+        self.buffer = deque(maxlen=buffer_size)
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = {"fetched": 0, "failed": 0, "short_circuited": 0, "served": 0, "empty": 0}
+        self.last_error: Optional[str] = None
+
+        # One keep-alive connection pool for every request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._refill_lock = threading.Lock()
+        self._refilling = False
+
+    def fetch(self) -> Optional[str]:
+        """One API call; None on failure or while the breaker is open"""
+        if not self.breaker.allow():
+            self.stats["short_circuited"] += 1
+            return None
+        try:
+            response = self.session.get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+            # Some quote APIs wrap the quote in a one-element list
+            if isinstance(data, list):
+                data = data[0]
+            quote = f"{data['content']} - {data['author']}"
+        # Malformed payloads (a string, null, an empty list...) are failures too, so the breaker sees them
+        except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as error:
+            self.breaker.record_failure()
+            self.stats["failed"] += 1
+            self.last_error = str(error)
+            return None
+        self.breaker.record_success()
+        self.stats["fetched"] += 1
+        return quote
+
+    def refill(self):
+        """Fill the buffer, stopping at the first failure"""
+        while len(self.buffer) < self.buffer.maxlen:
+            quote = self.fetch()
+            if quote is None:
+                break
+            self.buffer.append(quote)
+
+    def _refill_in_background(self):
+        with self._refill_lock:
+            if self._refilling:
+                return
+            self._refilling = True
+
+        def run():
+            try:
+                self.refill()
+            finally:
+                with self._refill_lock:
+                    self._refilling = False
+
+        threading.Thread(target=run, daemon=True, name="quote-prefetch").start()
+
+    def start(self):
+        """Prefetch the first batch of quotes"""
+        self._refill_in_background()
+
+    def get_quote(self) -> Optional[str]:
+        try:
+            quote = self.buffer.popleft()
+            self.stats["served"] += 1
+        except IndexError:
+            quote = None
+            self.stats["empty"] += 1
+        if len(self.buffer) < self.low_watermark:
+            self._refill_in_background()
+        return quote
+
+    def close(self):
+        self.session.close()
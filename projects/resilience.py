@@ -0,0 +1,97 @@
+"""
+Resilient Agent Calls
+Deadlines, retries with jittered exponential backoff, and hedged requests
+"""
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+# Attempts run in the background so the caller can stop waiting at its deadline
+_attempts = ThreadPoolExecutor(max_workers=64, thread_name_prefix="agent-attempt")
+
+DEFAULT_RETRY_POLICY = {"max_attempts": 3, "base_delay": 0.5, "max_delay": 4.0}
+
+def backoff_delay(attempt: int, policy: Dict[str, Any]) -> float:
+    """Full jitter: uniform in [0, min(max_delay, base_delay * 2^attempt)]"""
+    return random.uniform(0, min(policy["max_delay"], policy["base_delay"] * 2 ** attempt))
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile: the smallest value with at least pct% of values at or below it (nan when empty)"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered), max(1, math.ceil(pct * len(ordered) / 100))) - 1]
+
+class LatencyTracker:
+    """Recent successful call latencies per key, used to derive hedge delays"""
+
+    def __init__(self, window: int = 100, min_samples: int = 20):
+        self.min_samples = min_samples
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: str, pct: float) -> Optional[float]:
+        """Nearest-rank percentile, or None until min_samples calls have been seen"""
+        with self._lock:
+            samples = list(self.samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return percentile(samples, pct)
+
+def hedged_call(primary: Callable[[], Any], backup: Optional[Callable[[], Any]],
+                hedge_delay: Optional[float], timeout: float) -> Tuple[Any, bool]:
+    """Run primary; if it hasn't finished after hedge_delay also start backup.
+
+    Returns (first successful result, whether the backup was started). Raises
+    TimeoutError when nothing succeeds within timeout, or the last error when
+    every attempt failed. Losing attempts are left to finish in the background.
+    """
+    deadline = time.time() + timeout
+    pending = {_attempts.submit(primary)}
+    hedged = False
+
+    if backup and hedge_delay is not None and hedge_delay < timeout:
+        done, _ = wait(pending, timeout=hedge_delay)
+        if not done:
+            pending.add(_attempts.submit(backup))
+            hedged = True
+
+    error = None
+    while pending:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise TimeoutError(f"No response within {timeout:.1f}s")
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result(), hedged
+            error = future.exception()
+    raise error
+
+def retry_call(attempt: Callable[[float], Any], policy: Dict[str, Any], deadline: float) -> Any:
+    """Call attempt(seconds_remaining) until it succeeds, backing off between tries.
+
+    Gives up after policy["max_attempts"] tries or when the next backoff would
+    overrun the absolute deadline, re-raising the last error.
+    """
+    for n in range(policy["max_attempts"]):
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise TimeoutError("Deadline exceeded before the call could start")
+        try:
+            return attempt(remaining)
+        except Exception:
+            delay = backoff_delay(n, policy)
+            if n == policy["max_attempts"] - 1 or time.time() + delay >= deadline:
+                raise
+            time.sleep(delay)
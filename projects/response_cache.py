@@ -0,0 +1,187 @@
+"""
+Response Cache for Multi-Agent Pipelines
+Caches agent responses by (role, system prompt, normalized prompt) with TTL and LRU eviction
+"""
+
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(re.sub(r"[^\w\s]", " ", prompt.lower()).split())
+
+def bag_of_words(text: str) -> Dict[str, float]:
+    """Cheap local embedding: term frequencies of the normalized text"""
+    return dict(Counter(text.split()))
+
+def cosine_similarity(a: Dict[str, float], b: Dict[str, float]) -> float:
+    dot = sum(weight * b.get(term, 0.0) for term, weight in a.items())
+    norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    return dot / norm if norm else 0.0
+
+class MemoryCacheBackend:
+    """In-process LRU store (default)"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Dict[str, Any]):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def scan(self, namespace: str) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        with self.lock:
+            return [(key, entry) for key, entry in self.entries.items() if entry["namespace"] == namespace]
+
+class SqliteCacheBackend:
+    """On-disk store shared between worker processes"""
+
+    def __init__(self, path: str = "response_cache.db", max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY, namespace TEXT, entry TEXT, last_access REAL)""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_namespace ON responses (namespace)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT entry FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            return json.loads(row[0])
+
+    def set(self, key: str, entry: Dict[str, Any]):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                              (key, entry["namespace"], json.dumps(entry), time.time()))
+            # Evict least recently used rows beyond the size limit
+            self.conn.execute("""DELETE FROM responses WHERE key IN (
+                SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)""",
+                              (self.max_entries,))
+            self.conn.commit()
+
+    def delete(self, key: str):
+        with self.lock:
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.conn.commit()
+
+    def scan(self, namespace: str) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        with self.lock:
+            rows = self.conn.execute("SELECT key, entry FROM responses WHERE namespace = ?",
+                                     (namespace,)).fetchall()
+        return [(key, json.loads(entry)) for key, entry in rows]
+
+class ResponseCache:
+    """TTL response cache with optional near-duplicate lookup.
+
+    Exact hits are keyed on a hash of (role, system prompt, normalized prompt).
+    When similarity_threshold is set, an exact miss falls back to the most
+    similar cached prompt for the same role and system prompt, compared with
+    embed (bag-of-words by default) and cosine similarity.
+    """
+
+    def __init__(self, backend=None, ttl_seconds: float = 3600,
+                 similarity_threshold: Optional[float] = None,
+                 embed: Callable[[str], Dict[str, float]] = bag_of_words):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self.stats = {"hits": 0, "near_hits": 0, "misses": 0}
+        self.lock = threading.Lock()
+
+    def _namespace(self, role: str, system_prompt: str) -> str:
+        return hashlib.sha256(f"{role}\0{system_prompt}".encode()).hexdigest()
+
+    def _key(self, namespace: str, normalized: str) -> str:
+        return hashlib.sha256(f"{namespace}\0{normalized}".encode()).hexdigest()
+
+    def _fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["created"] < self.ttl_seconds
+
+    def _count(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def get(self, role: str, system_prompt: str, prompt: str) -> Optional[Any]:
+        namespace = self._namespace(role, system_prompt)
+        normalized = normalize_prompt(prompt)
+        key = self._key(namespace, normalized)
+
+        entry = self.backend.get(key)
+        if entry is not None and self._fresh(entry):
+            self._count("hits")
+            return entry["response"]
+        if entry is not None:
+            self.backend.delete(key)
+
+        if self.similarity_threshold is not None:
+            query_vector = self.embed(normalized)
+            best_score, best_entry = 0.0, None
+            for candidate_key, candidate in self.backend.scan(namespace):
+                if not self._fresh(candidate):
+                    self.backend.delete(candidate_key)
+                    continue
+                score = cosine_similarity(query_vector, self.embed(candidate["prompt"]))
+                if score > best_score:
+                    best_score, best_entry = score, candidate
+            if best_entry is not None and best_score >= self.similarity_threshold:
+                self._count("near_hits")
+                return best_entry["response"]
+
+        self._count("misses")
+        return None
+
+    def set(self, role: str, system_prompt: str, prompt: str, response: Any):
+        namespace = self._namespace(role, system_prompt)
+        normalized = normalize_prompt(prompt)
+        self.backend.set(self._key(namespace, normalized), {
+            "namespace": namespace,
+            "prompt": normalized,
+            "response": response,
+            "created": time.time()
+        })
+
+    def hit_ratio(self) -> float:
+        lookups = self.stats["hits"] + self.stats["near_hits"] + self.stats["misses"]
+        return (self.stats["hits"] + self.stats["near_hits"]) / lookups if lookups else 0.0
+
+def create_cache(backend: str = "memory", path: str = "response_cache.db", max_entries: int = 1024,
+                 ttl_seconds: float = 3600, similarity_threshold: Optional[float] = None) -> Optional[ResponseCache]:
+    """Build a ResponseCache from simple settings ("memory", "sqlite" or "none")"""
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        store = SqliteCacheBackend(path, max_entries=max_entries)
+    else:
+        store = MemoryCacheBackend(max_entries=max_entries)
+    return ResponseCache(store, ttl_seconds=ttl_seconds, similarity_threshold=similarity_threshold)
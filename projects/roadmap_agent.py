@@ -5,129 +5,262 @@ Comprehensive project demonstrating: Basic Agent + Tools + Memory + Integration
 """
 
 import os
+import re
+import csv
 import json
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from strands import Agent, tool
-from strands_tools import file_read, file_write, mem0_memory
+from lazy_init import LazyValue, lazy_init_enabled, load_tools
+from progress_store import create_progress_store, import_json_progress
+
+CAREER_SKILLS = {
+    "devops": ["Git", "Linux", "Docker", "Kubernetes", "CI/CD", "AWS"],
+    "cloud": ["AWS Basics", "Networking", "Security", "Infrastructure", "Serverless"],
+    "ai": ["Python", "Math", "ML Basics", "Deep Learning", "MLOps"]
+}
+
+# Other ways students write each skill (matched after normalization)
+SKILL_ALIASES = {
+    "Git": ["github", "gitlab", "version control"],
+    "Linux": ["bash", "shell", "unix", "ubuntu"],
+    "Docker": ["containers", "containerization", "podman"],
+    "Kubernetes": ["k8s", "eks", "aks", "gke", "helm"],
+    "CI/CD": ["cicd", "ci cd", "ci", "jenkins", "github actions", "gitlab ci", "continuous integration"],
+    "AWS": ["amazon web services", "aws basics", "ec2", "s3"],
+    "AWS Basics": ["aws", "amazon web services", "ec2", "s3"],
+    "Networking": ["network", "networks", "vpc", "tcp ip", "dns"],
+    "Security": ["iam", "cybersecurity", "infosec"],
+    "Infrastructure": ["iac", "terraform", "cloudformation", "infrastructure as code"],
+    "Serverless": ["lambda", "aws lambda", "functions"],
+    "Python": ["py", "python3"],
+    "Math": ["maths", "mathematics", "statistics", "linear algebra", "calculus"],
+    "ML Basics": ["ml", "machine learning", "scikit learn", "sklearn"],
+    "Deep Learning": ["dl", "neural networks", "pytorch", "tensorflow"],
+    "MLOps": ["ml ops", "mlflow", "sagemaker", "kubeflow"]
+}
+
+ROADMAP_TEMPLATES = {
+    "devops": {
+        "Beginner": ["Linux Basics", "Git/GitHub", "Docker", "Basic AWS", "CI/CD"],
+        "Intermediate": ["Kubernetes", "Terraform", "Monitoring", "Security", "Advanced AWS"],
+        "Advanced": ["GitOps", "Service Mesh", "Platform Engineering", "SRE Practices"]
+    },
+    "cloud": {
+        "Beginner": ["AWS Fundamentals", "Networking", "EC2/S3", "IAM", "Basic Security"],
+        "Intermediate": ["Serverless", "Containers", "Databases", "Monitoring", "Cost Optimization"],
+        "Advanced": ["Multi-Cloud", "Architecture Design", "Well-Architected", "Enterprise Patterns"]
+    },
+    "ai": {
+        "Beginner": ["Python", "Statistics", "ML Fundamentals", "Data Processing", "Basic Models"],
+        "Intermediate": ["Deep Learning", "NLP", "Computer Vision", "MLOps", "Cloud ML"],
+        "Advanced": ["Research", "Custom Models", "Production ML", "AI Ethics", "Leadership"]
+    }
+}
+
+@lru_cache(maxsize=4096)
+def normalize_skill(skill: str) -> str:
+    """Lowercase, punctuation to spaces, collapsed whitespace ("CI/CD" -> "ci cd")"""
+    return " ".join(re.sub(r"[^a-z0-9+#]", " ", skill.lower()).split())
+
+# career -> normalized name or alias -> canonical skill, built once at import
+SKILL_INDEX = {
+    career: {alias: skill for skill in skills
+             for alias in [normalize_skill(skill)] + [normalize_skill(a) for a in SKILL_ALIASES.get(skill, [])]}
+    for career, skills in CAREER_SKILLS.items()
+}
+
+@lru_cache(maxsize=4096)
+def _assess(career_path: str, skills: Tuple[str, ...]) -> Tuple[str, int, int]:
+    index = SKILL_INDEX.get(career_path, {})
+    matched = len({index[skill] for skill in skills if skill in index})
+    level = "Beginner" if matched < 2 else "Intermediate" if matched < 4 else "Advanced"
+    return level, matched, len(CAREER_SKILLS.get(career_path, []))
+
+def assess_skills(career_path: str, current_skills: str) -> Tuple[str, int, int]:
+    """(level, matched, total) from one dict lookup per listed skill"""
+    skills = tuple(sorted({normalize_skill(s) for s in current_skills.split(",")} - {""}))
+    return _assess(career_path.lower(), skills)
+
+@lru_cache(maxsize=1024)
+def skeleton_roadmap(career_path: str, skill_level: str, timeline_months: int) -> str:
+    """Week-by-week roadmap from ROADMAP_TEMPLATES"""
+    path_skills = ROADMAP_TEMPLATES.get(career_path.lower(), {}).get(skill_level, [])
+    weeks_per_skill = max(1, timeline_months * 4 // len(path_skills)) if path_skills else 4
+    
+    roadmap = f"# {career_path.title()} Roadmap - {skill_level} Level\n\n"
+    for i, skill in enumerate(path_skills, 1):
+        roadmap += f"## Week {(i-1)*weeks_per_skill + 1}-{i*weeks_per_skill}: {skill}\n"
+        roadmap += f"- Focus: {skill} fundamentals and hands-on practice\n\n"
+    
+    return roadmap
+
+def roadmap_filename(student_name: str, career_path: str) -> str:
+    return f"roadmap_{student_name.lower().replace(' ', '_')}_{career_path}.md"
 
 # Module 1: Building your First AI Agent
 class RoadmapAgent:
-    def __init__(self):
-        self.agent = Agent(
+    def __init__(self, agent_factory: Callable[..., Any] = Agent, progress_store=None,
+                 lazy: Optional[bool] = None):
+        self._progress = LazyValue(lambda: progress_store if progress_store is not None
+                                   else create_progress_store())
+        self._agent = LazyValue(lambda: agent_factory(
             model="us.anthropic.claude-sonnet-4-20250514-v1:0",
             system_prompt="""You are a Career Roadmap Advisor for students. 
             Create personalized learning paths for DevOps, Cloud, and AI Engineering careers.
             Always provide actionable, step-by-step guidance with realistic timelines.""",
             tools=self._get_tools()
-        )
+        ))
+        # Lazy (AGENT_LAZY_INIT=true): the agent and its tool modules are built on first use,
+        # and progress.db is opened on the first tracking call
+        if not (lazy_init_enabled() if lazy is None else lazy):
+            self._progress.get()
+            self._agent.get()
+    
+    @property
+    def agent(self):
+        return self._agent.get()
+    
+    @property
+    def progress(self):
+        return self._progress.get()
     
     # Module 2: Powering up the Agent with Tools
     def _get_tools(self):
+        # Imported here: the memory store pulls in numpy (and mem0 with MEM0_API_KEY)
+        from local_memory import memory_tool
         return [
             self.assess_skill_level,
             self.generate_roadmap,
             self.track_progress,
-            file_read,
-            file_write,
-            mem0_memory
+            *load_tools(["file_read", "file_write"]),
+            memory_tool()  # mem0_memory with MEM0_API_KEY, else the local store
         ]
     
     @tool
     def assess_skill_level(self, career_path: str, current_skills: str) -> str:
         """Assess student's current skill level for career path"""
-        levels = {
-            "devops": ["Git", "Linux", "Docker", "Kubernetes", "CI/CD", "AWS"],
-            "cloud": ["AWS Basics", "Networking", "Security", "Infrastructure", "Serverless"],
-            "ai": ["Python", "Math", "ML Basics", "Deep Learning", "MLOps"]
-        }
-        
-        path_skills = levels.get(career_path.lower(), [])
-        skill_list = [s.strip().lower() for s in current_skills.split(",")]
-        
-        matched = sum(1 for skill in path_skills if any(s in skill.lower() for s in skill_list))
-        level = "Beginner" if matched < 2 else "Intermediate" if matched < 4 else "Advanced"
-        
-        return f"Assessment: {level} ({matched}/{len(path_skills)} skills matched)"
+        level, matched, total = assess_skills(career_path, current_skills)
+        return f"Assessment: {level} ({matched}/{total} skills matched)"
     
     @tool
     def generate_roadmap(self, career_path: str, skill_level: str, timeline_months: int) -> str:
         """Generate structured learning roadmap"""
-        roadmaps = {
-            "devops": {
-                "Beginner": ["Linux Basics", "Git/GitHub", "Docker", "Basic AWS", "CI/CD"],
-                "Intermediate": ["Kubernetes", "Terraform", "Monitoring", "Security", "Advanced AWS"],
-                "Advanced": ["GitOps", "Service Mesh", "Platform Engineering", "SRE Practices"]
-            },
-            "cloud": {
-                "Beginner": ["AWS Fundamentals", "Networking", "EC2/S3", "IAM", "Basic Security"],
-                "Intermediate": ["Serverless", "Containers", "Databases", "Monitoring", "Cost Optimization"],
-                "Advanced": ["Multi-Cloud", "Architecture Design", "Well-Architected", "Enterprise Patterns"]
-            },
-            "ai": {
-                "Beginner": ["Python", "Statistics", "ML Fundamentals", "Data Processing", "Basic Models"],
-                "Intermediate": ["Deep Learning", "NLP", "Computer Vision", "MLOps", "Cloud ML"],
-                "Advanced": ["Research", "Custom Models", "Production ML", "AI Ethics", "Leadership"]
-            }
-        }
-        
-        path_skills = roadmaps.get(career_path.lower(), {}).get(skill_level, [])
-        weeks_per_skill = max(1, timeline_months * 4 // len(path_skills)) if path_skills else 4
-        
-        roadmap = f"# {career_path.title()} Roadmap - {skill_level} Level\n\n"
-        for i, skill in enumerate(path_skills, 1):
-            roadmap += f"## Week {(i-1)*weeks_per_skill + 1}-{i*weeks_per_skill}: {skill}\n"
-            roadmap += f"- Focus: {skill} fundamentals and hands-on practice\n\n"
-        
-        return roadmap
+        return skeleton_roadmap(career_path, skill_level, timeline_months)
     
     @tool
-    def track_progress(self, student_name: str, completed_skill: str) -> str:
+    def track_progress(self, student_name: str, completed_skill: str, career_path: str = "") -> str:
         """Track student progress"""
-        progress_file = f"progress_{student_name.lower().replace(' ', '_')}.json"
-        
-        try:
-            with open(progress_file, 'r') as f:
-                progress = json.load(f)
-        except FileNotFoundError:
-            progress = {"completed": [], "started": datetime.now().isoformat()}
-        
-        if completed_skill not in progress["completed"]:
-            progress["completed"].append(completed_skill)
-            progress["last_updated"] = datetime.now().isoformat()
-            
-            with open(progress_file, 'w') as f:
-                json.dump(progress, f, indent=2)
-        
-        return f"Progress updated! {len(progress['completed'])} skills completed."
+        completed = self.progress.record(student_name, completed_skill, career_path)
+        return f"Progress updated! {completed} skills completed."
     
     # Module 4: Summing it up together
     def create_personalized_roadmap(self, student_name: str, career_path: str, 
-                                  current_skills: str, timeline_months: int = 6):
+                                  current_skills: str, timeline_months: int = 6, output_dir: str = "."):
         """Complete workflow: assess -> generate -> save -> track"""
         
-        # Step 1: Assess current level
-        assessment = self.agent(f"Assess my skills for {career_path}: {current_skills}")
+        # Step 1: Assess current level - deterministic, no model call
+        level, matched, total = assess_skills(career_path, current_skills)
+        assessment = f"{level} ({matched}/{total} skills matched)"
         
-        # Step 2: Generate personalized roadmap
-        roadmap_query = f"""Create a {timeline_months}-month {career_path} roadmap for {student_name}.
-        Current skills: {current_skills}
-        Include: specific resources, projects, and milestones."""
+        # Step 2: Enrich the template roadmap - the only model call
+        skeleton = skeleton_roadmap(career_path, level, timeline_months)
+        roadmap_query = f"""Personalize this {timeline_months}-month {career_path} roadmap for {student_name}.
+        Current skills: {current_skills} (assessed {assessment})
+        Keep the week headings; add specific resources, projects, and milestones under each.
         
+        {skeleton}"""
+        
+        # Batch workers reuse one agent per thread: start every student from an empty conversation
+        self.agent.messages.clear()
         roadmap = self.agent(roadmap_query)
         
-        # Step 3: Save roadmap to file
-        filename = f"roadmap_{student_name.lower().replace(' ', '_')}_{career_path}.md"
-        with open(filename, 'w') as f:
+        # Step 3: Save roadmap to file (write-then-rename, so a crash never leaves half a roadmap)
+        filename = os.path.join(output_dir, roadmap_filename(student_name, career_path))
+        with open(filename + ".tmp", 'w') as f:
             f.write(f"# {student_name}'s {career_path.title()} Learning Roadmap\n\n")
             f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d')}\n\n")
             f.write(f"**Assessment:** {assessment}\n\n")
-            f.write(roadmap)
+            f.write(str(roadmap))
+        os.replace(filename + ".tmp", filename)
         
         # Step 4: Initialize progress tracking
-        self.track_progress(student_name, "Roadmap Created")
+        self.track_progress(student_name, "Roadmap Created", career_path)
         
         return f"✅ Personalized roadmap created: {filename}"
 
+def load_students(path: str) -> List[Dict[str, Any]]:
+    """Students from a CSV (header: name,career_path,current_skills,timeline_months) or JSONL file"""
+    with open(path, 'r', newline='') as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    return [{
+        "name": row["name"].strip(),
+        "career_path": row["career_path"].strip().lower(),
+        "current_skills": row.get("current_skills", "").strip(),
+        "timeline_months": int(row.get("timeline_months") or 6)
+    } for row in rows]
+
+def run_batch(students_path: str, output_dir: str = "roadmaps", workers: int = 4,
+              agent_factory: Callable[..., Any] = Agent, progress_store=None) -> Dict[str, Any]:
+    """Generate roadmaps for a whole cohort with a bounded worker pool.
+
+    Each worker thread gets its own RoadmapAgent, since an Agent can't serve two
+    students at once. Roadmaps are written as they complete, and students whose
+    roadmap already exists in output_dir are skipped, so a crashed batch can
+    simply be rerun. All workers share one progress store.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    progress_store = progress_store if progress_store is not None else create_progress_store()
+    students = load_students(students_path)
+    pending = [s for s in students
+               if not os.path.exists(os.path.join(output_dir, roadmap_filename(s["name"], s["career_path"])))]
+    
+    local = threading.local()
+    
+    def generate(student):
+        if not hasattr(local, "roadmap_agent"):
+            local.roadmap_agent = RoadmapAgent(agent_factory, progress_store)
+        return local.roadmap_agent.create_personalized_roadmap(
+            student["name"], student["career_path"], student["current_skills"],
+            student["timeline_months"], output_dir
+        )
+    
+    print(f"📚 {len(students)} students, {len(students) - len(pending)} already done, "
+          f"{len(pending)} to generate with {workers} workers")
+    start = time.time()
+    failed = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(generate, student): student for student in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            student = futures[future]
+            try:
+                print(f"[{done}/{len(pending)}] {future.result()}")
+            except Exception as error:
+                failed[student["name"]] = str(error)
+                print(f"[{done}/{len(pending)}] ❌ {student['name']}: {error}")
+    
+    elapsed = time.time() - start
+    generated = len(pending) - len(failed)
+    report = {
+        "students": len(students),
+        "skipped": len(students) - len(pending),
+        "generated": generated,
+        "failed": failed,
+        "elapsed_seconds": elapsed,
+        "students_per_minute": generated / elapsed * 60 if elapsed else 0.0
+    }
+    print(f"\n📊 {generated} roadmaps in {elapsed:.1f}s ({report['students_per_minute']:.1f} students/minute), "
+          f"{len(failed)} failed")
+    return report
+
 def main():
     """Interactive roadmap generation"""
     print("🎯 STUDENT CAREER ROADMAP AGENT")
@@ -152,4 +285,23 @@ def main():
     print(f"agent.track_progress('{name}', 'skill_name')")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Student career roadmap agent")
+    parser.add_argument("--batch", metavar="STUDENTS", help="CSV or JSONL of students to generate roadmaps for")
+    parser.add_argument("--output-dir", default="roadmaps")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--progress-db", default="progress.db", help="sqlite progress store")
+    parser.add_argument("--import-progress", metavar="DIR", help="import progress_*.json files from DIR")
+    parser.add_argument("--stats", nargs="?", const="", metavar="CAREER", help="print cohort completion stats")
+    args = parser.parse_args()
+    
+    if args.import_progress or args.stats is not None:
+        store = create_progress_store(path=args.progress_db)
+        if args.import_progress:
+            imported = import_json_progress(store, args.import_progress)
+            print(f"📥 Imported progress for {len(imported)} students into {args.progress_db}")
+        if args.stats is not None:
+            print(json.dumps(store.cohort_stats(args.stats or None), indent=2))
+    elif args.batch:
+        run_batch(args.batch, args.output_dir, args.workers, progress_store=create_progress_store(path=args.progress_db))
+    else:
+        main()
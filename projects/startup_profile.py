@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Startup Profile
+Import-time breakdown (from -X importtime) and time-to-ready per entry point, eager vs lazy (AGENT_LAZY_INIT)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Any, Dict, List
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (import, ready: what a first request/session has to build, first agent: forces an agent to exist)
+ENTRY_POINTS = {
+    "multiagent": (
+        "import multiagent",
+        "system = multiagent.scheduler.system_factory()",
+        "system.agent_pools[multiagent.AgentRole.RETRIEVER].checkout()[0].primary",
+    ),
+    "roadmap_agent": (
+        "import roadmap_agent",
+        "advisor = roadmap_agent.RoadmapAgent()",
+        "advisor.agent",
+    ),
+    "motivational_assistant": (
+        "import motivational_assistant",
+        "assistant = motivational_assistant.MotivationalAssistant()",
+        "assistant.agent",
+    ),
+}
+
+PHASES = ["import", "ready", "first_agent"]
+
+# Runs in the child; phase markers go to stderr so each importtime line can be attributed to a phase
+CHILD = """
+import json, sys, time
+timings = {{}}
+for phase, code in zip({phases!r}, {steps!r}):
+    sys.stderr.write("@@phase " + phase + "\\n")
+    start = time.perf_counter()
+    exec(code)
+    timings[phase] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, float]]:
+    """phase -> top-level package -> self import time in seconds"""
+    phases: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    phase = "startup"  # the interpreter's own imports, before the first marker
+    for line in stderr.splitlines():
+        if line.startswith("@@phase "):
+            phase = line.split(" ", 1)[1]
+            continue
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header row
+        package = fields[2].strip().split(".")[0]
+        phases[phase][package] += int(fields[0]) / 1e6
+    return phases
+
+def profile_once(entry: str, lazy: bool) -> Dict[str, Any]:
+    env = {**os.environ, "AGENT_LAZY_INIT": "true" if lazy else "false",
+           "PYTHONPATH": os.pathsep.join(filter(None, [PROJECT_DIR, os.getenv("PYTHONPATH")]))}
+    env.setdefault("AWS_REGION", "us-east-1")
+    code = CHILD.format(phases=PHASES, steps=list(ENTRY_POINTS[entry]))
+    # A scratch working directory: the progress and memory stores an entry point opens land there
+    with tempfile.TemporaryDirectory(prefix="startup-profile-") as directory:
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=directory, env=env,
+                                capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith(("import time:", "@@"))]
+        raise RuntimeError(f"{entry} failed: " + "\n".join(errors[-5:]))
+    return {"timings": json.loads(result.stdout.strip().splitlines()[-1]),
+            "imports": parse_importtime(result.stderr)}
+
+def profile(entry: str, lazy: bool, runs: int) -> Dict[str, Any]:
+    """Median timings over runs; the import breakdown of the median-total run"""
+    samples = sorted((profile_once(entry, lazy) for _ in range(runs)),
+                     key=lambda sample: sum(sample["timings"].values()))
+    timings = {phase: statistics.median(s["timings"][phase] for s in samples) for phase in PHASES}
+    return {"entry": entry, "mode": "lazy" if lazy else "eager", "timings": timings,
+            "imports": samples[len(samples) // 2]["imports"]}
+
+def format_breakdown(imports: Dict[str, Dict[str, float]], top: int) -> List[str]:
+    lines = []
+    for phase in PHASES:
+        packages = sorted(imports.get(phase, {}).items(), key=lambda item: -item[1])
+        if not packages:
+            continue
+        total = sum(seconds for _, seconds in packages)
+        shown = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in packages[:top])
+        lines.append(f"      {phase:<12} {total * 1000:>6.0f}ms imports: {shown}")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile startup time of the project entry points")
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS),
+                        help="entry point to profile (repeatable, default: all)")
+    parser.add_argument("--mode", choices=["eager", "lazy", "both"], default="both")
+    parser.add_argument("--runs", type=int, default=3, help="processes per entry point and mode (median)")
+    parser.add_argument("--top", type=int, default=6, help="packages listed per phase")
+    args = parser.parse_args()
+
+    modes = {"eager": [False], "lazy": [True], "both": [False, True]}[args.mode]
+    results = [profile(entry, lazy, args.runs) for entry in args.entry or ENTRY_POINTS for lazy in modes]
+
+    print(f"=== Startup profile, median of {args.runs} run(s) ===")
+    print(f"   {'entry point':<24} {'mode':<6} {'import':>8} {'ready':>8} {'to ready':>9} {'1st agent':>10}")
+    for result in results:
+        t = result["timings"]
+        print(f"   {result['entry']:<24} {result['mode']:<6} {t['import']:>7.2f}s {t['ready']:>7.2f}s "
+              f"{t['import'] + t['ready']:>8.2f}s {t['first_agent']:>9.2f}s")
+
+    print("\n=== Import-time breakdown (self time per top-level package) ===")
+    for result in results:
+        print(f"   {result['entry']} ({result['mode']})")
+        for line in format_breakdown(result["imports"], args.top):
+            print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Stub Models
+Base for the offline strands Models the benchmarks run against - no model calls
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+from strands.models import Model
+
+class StubModel(Model):
+    """strands Model without a backend; subclasses implement stream().
+
+    structured_output validates structured_payload (a dict or JSON string)
+    into the requested output model, so agents that ask for structured output
+    get a real answer; without a payload it raises a NotImplementedError that
+    names the model and what to pass.
+    """
+
+    def __init__(self, model_id: str = "stub", structured_payload: Optional[Union[Dict[str, Any], str]] = None):
+        self.config = {"model_id": model_id}
+        self.structured_payload = structured_payload
+
+    def update_config(self, **model_config):
+        self.config.update(model_config)
+
+    def get_config(self):
+        return self.config
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        if self.structured_payload is None:
+            raise NotImplementedError(f"{type(self).__name__} has no structured_payload to return as "
+                                      f"{output_model.__name__}; pass structured_payload= to use structured output")
+        payload = self.structured_payload
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        yield {"output": output_model.model_validate(payload)}
@@ -0,0 +1,206 @@
+"""
+Pipeline Telemetry
+OpenTelemetry-style spans per request, role and tool call, plus Prometheus histograms of latency
+"""
+
+import json
+import os
+import secrets
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+def tool_usage(response: Any) -> List[Dict[str, Any]]:
+    """Per-tool call counts and time from the AgentResult metrics, if the agent reports them"""
+    tool_metrics = getattr(getattr(response, "metrics", None), "tool_metrics", None) or {}
+    return [{
+        "name": name,
+        "call_count": metrics.call_count,
+        "error_count": metrics.error_count,
+        "total_time": metrics.total_time
+    } for name, metrics in tool_metrics.items()]
+
+def _labels(labels: Dict[str, str]) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+class Histogram:
+    """Prometheus histogram with one series per label set"""
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.series: Dict[Tuple, Dict[str, Any]] = {}
+
+    def observe(self, value: float, **labels: str):
+        series = self.series.setdefault(tuple(sorted(labels.items())),
+                                        {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series["counts"][i] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self.series.items()):
+            labels = dict(key)
+            for bound, count in zip(self.buckets, series["counts"]):
+                lines.append(f"{self.name}_bucket{{{_labels({**labels, 'le': str(bound)})}}} {count}")
+            lines.append(f"{self.name}_bucket{{{_labels({**labels, 'le': '+Inf'})}}} {series['count']}")
+            lines.append(f"{self.name}_sum{{{_labels(labels)}}} {series['sum']:.6f}")
+            lines.append(f"{self.name}_count{{{_labels(labels)}}} {series['count']}")
+        return lines
+
+class Counter:
+    """Prometheus counter with one value per label set"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{{{_labels(dict(key))}}} {value:g}")
+        return lines
+
+class PipelineMetrics:
+    """Request/role latency histograms and role outcome counters"""
+
+    def __init__(self):
+        self.request_latency = Histogram("multiagent_request_latency_seconds",
+                                         "End-to-end process_query latency")
+        self.role_latency = Histogram("multiagent_role_latency_seconds", "Per-role execution latency")
+        self.tool_latency = Histogram("multiagent_tool_latency_seconds", "Time spent in tool calls per role call")
+        self.checkout_wait = Histogram("multiagent_agent_checkout_wait_seconds",
+                                       "Time waiting for an idle pooled agent per role call")
+        self.role_calls = Counter("multiagent_role_calls_total", "Role executions by outcome")
+        self.lock = threading.Lock()
+
+    def observe(self, total_time: float, mode: str, execution_trace: List[Dict[str, Any]]):
+        with self.lock:
+            self.request_latency.observe(total_time, mode=mode)
+            for step in execution_trace:
+                status = step["output"]["status"]
+                if step["cache_hit"]:
+                    status = "cache_hit"
+                self.role_calls.inc(role=step["role"], status=status)
+                if step["output"]["status"] == "skipped":
+                    continue
+                self.role_latency.observe(step["execution_time"], role=step["role"])
+                self.checkout_wait.observe(step.get("checkout_wait", 0.0), role=step["role"])
+                for tool in step.get("tools", []):
+                    self.tool_latency.observe(tool["total_time"], role=step["role"], tool=tool["name"])
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        with self.lock:
+            metrics = [self.request_latency, self.role_latency, self.tool_latency, self.checkout_wait,
+                       self.role_calls]
+            return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+def build_spans(query: str, started_at: float, total_time: float,
+                execution_trace: List[Dict[str, Any]], attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Root span for the request, a child per executed role and a grandchild per tool.
+
+    Tool spans come from aggregated agent metrics, so they start with their
+    role and last for the tool's total time rather than per individual call.
+    """
+    trace_id = secrets.token_hex(16)
+
+    def span(name, parent, start, duration, attrs, ok=True):
+        return {
+            "trace_id": trace_id,
+            "span_id": secrets.token_hex(8),
+            "parent_span_id": parent,
+            "name": name,
+            "start_time_unix_nano": int(start * 1e9),
+            "end_time_unix_nano": int((start + duration) * 1e9),
+            "duration_seconds": duration,
+            "attributes": attrs,
+            "status": "OK" if ok else "ERROR"
+        }
+
+    root = span("multiagent.process_query", None, started_at, total_time, {"query": query, **attributes})
+    spans = [root]
+    for step in execution_trace:
+        if step["output"]["status"] == "skipped":
+            continue
+        model = step.get("model") or {}
+        role_span = span(f"multiagent.role.{step['role']}", root["span_id"], step["started_at"],
+                         step["execution_time"], {
+                             "role": step["role"],
+                             "cache_hit": step["cache_hit"],
+                             "attempts": step["attempts"],
+                             "hedged": step["hedged"],
+                             "checkout_wait": step.get("checkout_wait"),
+                             "model_id": model.get("model_id"),
+                             "input_tokens": model.get("input_tokens"),
+                             "output_tokens": model.get("output_tokens"),
+                             "cost_usd": model.get("cost_usd"),
+                             "error": step["output"].get("error")
+                         }, ok=step["output"]["status"] == "success")
+        spans.append(role_span)
+        for tool in step.get("tools", []):
+            spans.append(span(f"multiagent.tool.{tool['name']}", role_span["span_id"], step["started_at"],
+                              tool["total_time"], {"role": step["role"], **tool}, ok=tool["error_count"] == 0))
+    return spans
+
+class ConsoleExporter:
+    """Prints each span as a JSON line to stdout"""
+
+    def export(self, spans: List[Dict[str, Any]], metrics: PipelineMetrics):
+        for span in spans:
+            print(json.dumps(span, default=str))
+
+class FileExporter:
+    """Appends spans to a JSON Lines file and rewrites a Prometheus textfile with the metrics"""
+
+    def __init__(self, path: str = "traces.jsonl", metrics_path: Optional[str] = "metrics.prom"):
+        self.path = path
+        self.metrics_path = metrics_path
+        self.lock = threading.Lock()
+
+    def export(self, spans: List[Dict[str, Any]], metrics: PipelineMetrics):
+        with self.lock:
+            with open(self.path, 'a') as f:
+                for span in spans:
+                    f.write(json.dumps(span, default=str) + "\n")
+            if self.metrics_path:
+                # Write-then-rename so a scraper never reads a half-written file
+                tmp_path = f"{self.metrics_path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(metrics.render())
+                os.replace(tmp_path, self.metrics_path)
+
+class Telemetry:
+    """Collects metrics for every request and hands its spans to the exporter"""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self.metrics = PipelineMetrics()
+
+    def record(self, query: str, started_at: float, total_time: float, mode: str,
+               execution_trace: List[Dict[str, Any]], attributes: Dict[str, Any]) -> str:
+        """Record one process_query call; returns its trace id"""
+        self.metrics.observe(total_time, mode, execution_trace)
+        spans = build_spans(query, started_at, total_time, execution_trace, {"mode": mode, **attributes})
+        if self.exporter:
+            self.exporter.export(spans, self.metrics)
+        return spans[0]["trace_id"]
+
+def create_exporter(kind: str = "none", path: str = "traces.jsonl", metrics_path: Optional[str] = "metrics.prom"):
+    """Build a span exporter from simple settings ("none", "stdout" or "file")"""
+    if kind == "stdout":
+        return ConsoleExporter()
+    if kind == "file":
+        return FileExporter(path, metrics_path)
+    return None
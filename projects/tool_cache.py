@@ -0,0 +1,162 @@
+"""
+Tool Result Cache
+Wraps agent tools so repeated calls with the same arguments are served from a TTL cache
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from strands.tools.tools import PythonAgentTool
+from strands.types.tools import AgentTool
+from response_cache import MemoryCacheBackend, SqliteCacheBackend
+
+# Opt-in: only these tools are cached, with their TTL in seconds (None: the cache's default_ttl).
+# Callers opt in more with ttl= (07_mcp_integration.py does for the read-only aws-docs MCP tools);
+# anything else - new tools, anything with side effects - always runs.
+CACHEABLE_TOOLS: Dict[str, Optional[float]] = {"http_request": 600}
+
+# Per-tool check on the call's arguments: only calls that pass are cached
+CACHEABLE_CALLS: Dict[str, Callable[[Dict[str, Any]], bool]] = {
+    "http_request": lambda arguments: str(arguments.get("method", "")).upper() in ("GET", "HEAD")
+}
+
+def canonical_args(arguments: Any) -> str:
+    """Argument JSON with sorted keys and no whitespace, so equal calls hash equally"""
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+def as_agent_tool(tool: Any) -> AgentTool:
+    """AgentTool for a strands_tools-style module (TOOL_SPEC + function); AgentTools pass through"""
+    if isinstance(tool, AgentTool):
+        return tool
+    spec = getattr(tool, "TOOL_SPEC", None)
+    if spec is None:
+        raise TypeError(f"Can't cache tool {tool!r}: not an AgentTool or a module with TOOL_SPEC")
+    return PythonAgentTool(spec["name"], spec, getattr(tool, spec["name"]))
+
+class CachedTool(AgentTool):
+    """AgentTool that answers from a ToolResultCache and only runs the wrapped tool on a miss"""
+
+    def __init__(self, tool: AgentTool, cache: "ToolResultCache"):
+        super().__init__()
+        self.tool = tool
+        self.cache = cache
+
+    @property
+    def tool_name(self) -> str:
+        return self.tool.tool_name
+
+    @property
+    def tool_spec(self) -> Dict[str, Any]:
+        return self.tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self.tool.tool_type
+
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        if not self.cache.cacheable_call(self.tool_name, tool_use["input"]):
+            async for event in self.tool.stream(tool_use, invocation_state, **kwargs):
+                yield event
+            return
+
+        cached = self.cache.get(self.tool_name, tool_use["input"])
+        if cached is not None:
+            # A plain ToolResult as the last event is what strands takes as a non-SDK tool's result
+            yield {**cached, "toolUseId": tool_use["toolUseId"]}
+            return
+
+        # Each event is held back until the next arrives: strands stops reading at the result event,
+        # so the result has to be stored before it's yielded
+        last = None
+        async for event in self.tool.stream(tool_use, invocation_state, **kwargs):
+            if last is not None:
+                yield last
+            last = event
+
+        # SDK tools (MCP ones included) end with a result event carrying .tool_result, others with the dict
+        result = getattr(last, "tool_result", last)
+        if isinstance(result, dict) and result.get("status") == "success":
+            self.cache.set(self.tool_name, tool_use["input"], result)
+        if last is not None:
+            yield last
+
+class ToolResultCache:
+    """TTL cache of successful tool results keyed on (tool name, canonical arguments).
+
+    Only tools in CACHEABLE_TOOLS or ttl are cached (a TTL of 0 opts a tool
+    back out); wrap() hands every other tool back unwrapped, and calls failing
+    the tool's CACHEABLE_CALLS check (an http_request POST) always run.
+    Entries live in a response_cache backend, so memory and sqlite stores and
+    their LRU eviction are shared with the response cache.
+    """
+
+    def __init__(self, backend=None, default_ttl: float = 300, ttl: Optional[Dict[str, Optional[float]]] = None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.default_ttl = default_ttl
+        self.ttl = {**CACHEABLE_TOOLS, **(ttl or {})}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.lock = threading.Lock()
+
+    def _key(self, tool_name: str, arguments: Any) -> str:
+        return hashlib.sha256(f"tool\0{tool_name}\0{canonical_args(arguments)}".encode()).hexdigest()
+
+    def _count(self, tool_name: str, stat: str):
+        with self.lock:
+            self.stats.setdefault(tool_name, {"hits": 0, "misses": 0})[stat] += 1
+
+    def ttl_for(self, tool_name: str) -> float:
+        ttl = self.ttl.get(tool_name, 0)
+        return self.default_ttl if ttl is None else ttl
+
+    def cacheable(self, tool_name: str) -> bool:
+        return self.ttl_for(tool_name) > 0
+
+    def cacheable_call(self, tool_name: str, arguments: Any) -> bool:
+        check = CACHEABLE_CALLS.get(tool_name)
+        return self.cacheable(tool_name) and (check is None or check(arguments or {}))
+
+    def get(self, tool_name: str, arguments: Any) -> Optional[Dict[str, Any]]:
+        key = self._key(tool_name, arguments)
+        entry = self.backend.get(key)
+        if entry is not None and time.time() - entry["created"] < self.ttl_for(tool_name):
+            self._count(tool_name, "hits")
+            return entry["result"]
+        if entry is not None:
+            self.backend.delete(key)
+        self._count(tool_name, "misses")
+        return None
+
+    def set(self, tool_name: str, arguments: Any, result: Dict[str, Any]):
+        entry = {"namespace": f"tool:{tool_name}", "result": result, "created": time.time()}
+        try:
+            json.dumps(entry)
+        except TypeError:
+            return  # binary content (images, documents) isn't worth caching
+        self.backend.set(self._key(tool_name, arguments), entry)
+
+    def wrap(self, tools: List[Any]) -> List[Any]:
+        """Tools for Agent(tools=...) with every cacheable one wrapped in a CachedTool"""
+        wrapped = []
+        for tool in tools:
+            agent_tool = as_agent_tool(tool)
+            wrapped.append(CachedTool(agent_tool, self) if self.cacheable(agent_tool.tool_name) else tool)
+        return wrapped
+
+    def hit_ratio(self) -> float:
+        hits = sum(stats["hits"] for stats in self.stats.values())
+        lookups = hits + sum(stats["misses"] for stats in self.stats.values())
+        return hits / lookups if lookups else 0.0
+
+def create_tool_cache(backend: str = "memory", path: str = "tool_cache.db", max_entries: int = 1024,
+                      default_ttl: float = 300,
+                      ttl: Optional[Dict[str, Optional[float]]] = None) -> Optional[ToolResultCache]:
+    """Build a ToolResultCache from simple settings ("memory", "sqlite" or "none")"""
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        store = SqliteCacheBackend(path, max_entries=max_entries)
+    else:
+        store = MemoryCacheBackend(max_entries=max_entries)
+    return ToolResultCache(store, default_ttl=default_ttl, ttl=ttl)
@@ -46,5 +46,9 @@ print(f"\nTime: {ollama_time:.2f}s")
 
 print(f"\n📊 Speed difference: {ollama_time/bedrock_time:.1f}x")
 
+# One timing of one question is just a demo - benchmark_models.py does warmup, repeats, concurrency and percentiles
+print("\nFor a real comparison: python benchmark_models.py "
+      "--model bedrock:us.anthropic.claude-sonnet-4-20250514-v1:0 --model ollama:llama3")
+
 
 
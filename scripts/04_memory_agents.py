@@ -5,7 +5,9 @@ Simple demo: Agent remembers conversation context
 
 import os
 from strands import Agent
-from strands_tools import mem0_memory
+
+import projects_path  # noqa: F401 - makes ../projects importable
+from local_memory import local_memory_tool
 
 
 # Check if Mem0 API key is available
@@ -14,6 +16,7 @@ mem0_key = os.getenv("MEM0_API_KEY")
 if mem0_key:
     print("✅ MEM0_API_KEY found - using real memory")
     try:
+        from strands_tools import mem0_memory
         agent = Agent(
             model="us.anthropic.claude-sonnet-4-20250514-v1:0",
             tools=[mem0_memory],
@@ -24,9 +27,13 @@ if mem0_key:
         agent = None
         memory_type = "No memory (Mem0 error)"
 else:
-    print("⚠️ No MEM0_API_KEY provided")
-    agent = None
-    memory_type = "No memory (no API key)"
+    print("⚠️ No MEM0_API_KEY provided - using local vector memory (./memory_store)")
+    agent = Agent(
+        model="us.anthropic.claude-sonnet-4-20250514-v1:0",
+        # Memories are kept per MEM0_USER_ID ("default" when unset)
+        tools=[local_memory_tool()],
+    )
+    memory_type = "Local vector memory"
 
 print(f"🔧 Using: {memory_type}")
 
@@ -3,42 +3,32 @@ Advanced Example: Code Review Agent
 Simple demo: Agent reviews code and provides feedback
 """
 
+import argparse
+import functools
 import os
 from strands import Agent, tool
 from strands_tools import file_read, shell
+from code_analysis import (analyze_code_cached, analyze_tree, create_analysis_cache, format_analysis,
+                           format_tree_summary, summarize_tree)
+from repo_review import format_review, review_repository
 
 # Configure environment
 os.environ.setdefault("AWS_REGION", "us-west-2")
 
-print("👨‍💻 Creating a code review agent...")
+# Repository analyses are cached by file content, so re-reviewing a tree only re-parses changed files;
+# in memory unless CODE_ANALYSIS_CACHE=sqlite, so importing this never writes a file
+analysis_cache = create_analysis_cache(os.getenv("CODE_ANALYSIS_CACHE", "memory"),
+                                       os.getenv("CODE_ANALYSIS_CACHE_PATH", "analysis_cache.db"))
 
 @tool
 def analyze_code(code: str) -> str:
-    """Analyze code for basic metrics"""
-    lines = len([l for l in code.split('\n') if l.strip()])
-    functions = code.count('def ')
-    classes = code.count('class ')
-    complexity = "Low" if lines < 10 else "Medium" if lines < 50 else "High"
-    
-    return f"Analysis: {lines} lines, {functions} functions, {classes} classes, {complexity} complexity"
+    """Analyze Python code: functions, classes, cyclomatic complexity, nesting depth and style issues"""
+    return format_analysis(analyze_code_cached(code))
 
 @tool
-def check_style(code: str) -> str:
-    """Check basic Python style"""
-    issues = []
-    if '\t' in code:
-        issues.append("Uses tabs instead of spaces")
-    if any(len(line) > 100 for line in code.split('\n')):
-        issues.append("Lines too long (>100 chars)")
-    
-    return f"Style issues: {', '.join(issues) if issues else 'None found'}"
-
-# Create specialized agent
-agent = Agent(
-    model="us.anthropic.claude-sonnet-4-20250514-v1:0",
-    tools=[analyze_code, check_style, file_read, shell],
-    system_prompt="You are a senior code reviewer. Analyze code and provide constructive feedback."
-)
+def analyze_repository(path: str) -> str:
+    """Analyze every Python file under a directory: totals, style issues and the most complex functions"""
+    return format_tree_summary(summarize_tree(analyze_tree(path, cache=analysis_cache)))
 
 # Sample code to review
 sample_code = """
@@ -52,22 +42,41 @@ def calculate_total(items):
 class ShoppingCart:
     def __init__(self):
         self.items = []
-    
+
     def add_item(self, name, price, quantity=1):
         self.items.append({'name': name, 'price': price, 'quantity': quantity})
 """
 
-print(f"\n📝 Code to review:\n{sample_code}")
+def main():
+    parser = argparse.ArgumentParser(description="Code review agent")
+    parser.add_argument("--review", metavar="PATH", help="review this repository incrementally instead of running the demo")
+    parser.add_argument("--manifest", help="review manifest (default: PATH/.review_manifest.json)")
+    parser.add_argument("--chunk-tokens", type=int, default=1500, help="max code tokens per model call")
+    args = parser.parse_args()
+
+    if args.review:
+        reviewer = functools.partial(Agent, model="us.anthropic.claude-sonnet-4-20250514-v1:0")
+        result = review_repository(args.review, reviewer, args.manifest, args.chunk_tokens)
+        print(format_review(result))
+        return
+
+    print("👨‍💻 Creating a code review agent...")
+
+    # Create specialized agent
+    agent = Agent(
+        model="us.anthropic.claude-sonnet-4-20250514-v1:0",
+        tools=[analyze_code, analyze_repository, file_read, shell],
+        system_prompt="You are a senior code reviewer. Analyze code and provide constructive feedback."
+    )
+
+    print(f"\n📝 Code to review:\n{sample_code}")
 
-print("\n💬 Asking agent to review the code...")
-response = agent(f"Please review this Python code and provide feedback:\n{sample_code}")
+    print("\n💬 Asking agent to review the code...")
+    response = agent(f"Please review this Python code and provide feedback:\n{sample_code}")
 
-# Create new specialized agent
-agent = Agent(
-    model="us.anthropic.claude-sonnet-4-20250514-v1:0",
-    tools=[file_read, shell],
-    system_prompt="You are a senior code reviewer with all the special tools for reading files.\
-         Analyze code and provide constructive feedback."
-)
+    # A whole-repository review costs a model call per chunk on its first run, so it's opt-in
+    print("\n📂 To review a whole repository incrementally: python 05_advanced_examples.py --review PATH")
 
-response = agent(f"Please review code from file /Users/lshubh/Documents/work/aws/strands-agents/strands-agents-workshop/scripts/04_memory_agents.py and provide feedback:\n{sample_code}")
+# Guarded: the repository analysis process pool re-imports this module in its workers on spawn platforms
+if __name__ == "__main__":
+    main()
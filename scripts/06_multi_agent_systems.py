@@ -7,27 +7,33 @@ Demonstrates swarm-based and graph-based multi-agent coordination
 import os
 from strands import Agent
 from strands_tools import swarm
-from strands.multiagent import GraphBuilder
+from swarm_budget import budgeted_swarm
+from graph_runner import GraphRunner
 
 os.environ.setdefault("AWS_REGION", "us-west-2")
 
 print("🤖 MULTI-AGENT SYSTEMS DEMO")
 
-# Swarm coordinator
-coordinator = Agent(tools=[swarm])
+# Swarm coordinator: budgeted by default (SWARM_MODE=unbounded for the plain strands_tools swarm)
+if os.getenv("SWARM_MODE", "budgeted") == "unbounded":
+    coordinator = Agent(tools=[swarm])
+else:
+    coordinator = Agent(tools=[budgeted_swarm(max_agents=int(os.getenv("SWARM_MAX_AGENTS", "4")),
+                                              token_budget=int(os.getenv("SWARM_TOKEN_BUDGET", "20000")),
+                                              time_budget=float(os.getenv("SWARM_TIME_BUDGET", "120")))])
 print("🐝 Swarm analysis:", coordinator("Use 3 agents to analyze AI impact on DevOps jobs"))
 
-# Graph-based workflow with 2 reusable agents
+# Graph-based workflow: one lead fanning out to experts, run in parallel (capped) with memoized nodes
 lead = Agent(name="lead", system_prompt="Research leader. Coordinate analysis.")
-expert = Agent(name="expert", system_prompt="Domain expert. Provide technical insights.")
+runner = GraphRunner(max_concurrency=int(os.getenv("GRAPH_MAX_CONCURRENCY", "4")))
+runner.add_node(lead, "lead").set_entry_point("lead")
+for focus in ("security", "cost", "performance"):
+    expert = Agent(name=f"{focus}_expert", system_prompt=f"Domain expert. Provide technical insights on {focus}.")
+    runner.add_node(expert, f"{focus}_expert").add_edge("lead", f"{focus}_expert")
 
-builder = GraphBuilder()
-builder.add_node(lead, "lead")
-builder.add_node(expert, "expert")
-builder.add_edge("lead", "expert")
-builder.set_entry_point("lead")
-
-result = builder.build()("Evaluate microservices architecture migration")
+result = runner("Evaluate microservices architecture migration")
 print(f"🕸️ Graph workflow: {[n.node_id for n in result.execution_order]} - {result.status}")
+for node in runner.last_report:
+    print(f"   ⏱️ {node['node_id']}: {node['execution_time']:.1f}s{' (cached)' if node['cache_hit'] else ''}")
 
 print("✅ Multi-agent patterns: Swarm + Graph workflows complete!")
@@ -1,37 +1,56 @@
 import json
+import os
+import sys
 from pathlib import Path
-from mcp import stdio_client, StdioServerParameters
+from typing import Callable, Optional
 from strands import Agent
 from strands.models import BedrockModel
-from strands.tools.mcp import MCPClient
+import projects_path  # noqa: F401 - makes ../projects importable
+from mcp_sessions import MCPSessionManager, load_mcp_servers, namespaced
+from conversation_window import create_conversation_manager
+from tool_cache import create_tool_cache
+
+# Read-only aws-docs tools whose results are cached, with their TTL in seconds: docs pages change rarely
+DOCS_SERVER = "awslabs.aws-documentation-mcp-server"
+CACHEABLE_DOC_TOOLS = {"search_documentation": 3600, "read_documentation": 3600, "recommend": 3600}
+
+def ask_approval(tool_name: str, arguments: dict) -> bool:
+    """Confirm tool calls that aren't listed in the server's autoApprove"""
+    answer = input(f"\n  Allow {tool_name}({json.dumps(arguments)})? [y/N] ")
+    return answer.strip().lower() in ("y", "yes")
+
+def deny_approval(tool_name: str, arguments: dict) -> bool:
+    """No one to confirm with: only tools in the server's autoApprove run"""
+    return False
 
 class AWSDocsAgent:
     """AWSDocs Agent with MCP integration for Better Docs Summary"""
     
-    def __init__(self):
-        self.mcp_client = self._create_mcp_client()
+    def __init__(self, lazy: bool = False, history: str = "fresh", window_messages: int = 10,
+                 max_tokens: int = 2000, approve: Optional[Callable[[str, dict], bool]] = None,
+                 cache_backend: str = "memory", cache_path: str = "tool_cache.db"):
+        # Every enabled server in mcp.json stays up between queries instead of starting per query;
+        # lazy=True spawns a server only when one of its tools is first called
+        self.mcp_sessions = MCPSessionManager(self._load_mcp_config(),
+                                              spec_cache=str(Path.cwd() / ".mcp_tools.json"))
+        self.lazy = lazy
+        # Asked before any tool not in its server's autoApprove runs; None runs them all
+        self.approve = approve
+        # Repeated doc searches and page reads are answered from here instead of the server
+        self.tool_cache = create_tool_cache(
+            cache_backend, cache_path,
+            ttl={namespaced(DOCS_SERVER, name): ttl for name, ttl in CACHEABLE_DOC_TOOLS.items()})
         self.model = self._create_model()
         self.system_prompt = self._get_system_prompt()
+        self.agent = None
+        self.agent_tools_version = None
+        # "fresh" starts every query from scratch; "rolling"/"full" keep a conversation across queries
+        self.history = history
+        self.conversation = create_conversation_manager("full" if history == "fresh" else history,
+                                                        window_messages, max_tokens)
     
     def _load_mcp_config(self) -> dict:
-        mcp_config_path = Path.cwd() / "mcp.json"
-        
-        with open(mcp_config_path, 'r') as f:
-            config = json.load(f)
-        
-        return config["mcpServers"]["awslabs.aws-documentation-mcp-server"]
-    
-    def _create_mcp_client(self) -> MCPClient:
-        """Create AWS Documentation client using stdio transport"""
-        aws_docs_config = self._load_mcp_config()
-        
-        return MCPClient(lambda: stdio_client(
-            StdioServerParameters(
-                command=aws_docs_config["command"],
-                args=aws_docs_config["args"],
-                env=aws_docs_config.get("env", {})
-            )
-        ))
+        return load_mcp_servers(str(Path.cwd() / "mcp.json"))
     
     def _create_model(self) -> BedrockModel:
         """Create Bedrock model for the agent"""
@@ -51,19 +70,42 @@ Keep responses concise and short."""
     
     def query(self, user_input: str) -> str:
         """Process user query with AWS Docs MCP tools"""
-        with self.mcp_client:
-            tools = self.mcp_client.list_tools_sync()
-            
-            agent = Agent(
+        # Rebuild the agent only when a server restarted or its tools changed
+        if self.agent is None or self.agent_tools_version != self.mcp_sessions.tools_version():
+            tools = self.mcp_sessions.registry(lazy=self.lazy, approve=self.approve)
+            if self.tool_cache:
+                tools = self.tool_cache.wrap(tools)
+            # The conversation so far carries over to the rebuilt agent
+            self.agent = Agent(
                 model=self.model,
-                system_prompt=self.system_prompt,
-                tools=tools
+                system_prompt=self.conversation.prompt(self.system_prompt),
+                tools=tools,
+                messages=self.agent.messages if self.agent else None,
+                conversation_manager=self.conversation
             )
-            
-            return agent(user_input)
+            self.agent_tools_version = self.mcp_sessions.tools_version()
+        
+        if self.history == "fresh":
+            self.agent.messages.clear()
+        return self.conversation.turn(self.agent, user_input)
+    
+    def close(self):
+        self.mcp_sessions.close()
 
 def main():
-    docs_agent = AWSDocsAgent()
+    # Confirmation prompts need someone at the terminal (MCP_CONFIRM_TOOLS=true asks regardless);
+    # without one, tools outside autoApprove are refused rather than run unconfirmed
+    confirm = sys.stdin.isatty() or os.getenv("MCP_CONFIRM_TOOLS", "false").lower() == "true"
+    docs_agent = AWSDocsAgent(
+        lazy=os.getenv("MCP_LAZY_START", "false").lower() == "true",
+        approve=ask_approval if confirm else deny_approval,
+        history=os.getenv("CHAT_HISTORY_MODE", "fresh"),
+        window_messages=int(os.getenv("CHAT_HISTORY_WINDOW", "10")),
+        max_tokens=int(os.getenv("CHAT_HISTORY_MAX_TOKENS", "2000")),
+        cache_backend=os.getenv("MCP_TOOL_CACHE_BACKEND", "memory"),
+        cache_path=os.getenv("MCP_TOOL_CACHE_PATH", "tool_cache.db")
+    )
+    show_metrics = os.getenv("CHAT_HISTORY_METRICS", "false").lower() == "true"
     
     print("AWS Docs Agent Ready! Type 'quit' to exit.")
     print("-" * 40)
@@ -82,12 +124,24 @@ def main():
             print("\nAgent:", end=" ")
             response = docs_agent.query(user_input)
             print(response)
+            if show_metrics:
+                turn = docs_agent.conversation.turns[-1]
+                print(f"   (prompt ~{turn['prompt_tokens']} tokens, {turn['history_messages']} messages, "
+                      f"{turn['latency']:.1f}s)")
+                if docs_agent.tool_cache:
+                    print(f"   (docs tool cache hit ratio {docs_agent.tool_cache.hit_ratio():.0%})")
             
         except KeyboardInterrupt:
             print("\nBye from AWS Docs Agent!")
             break
         except Exception as e:
             print(f"Error: {e}")
+    
+    if docs_agent.tool_cache:
+        for name, stats in docs_agent.tool_cache.stats.items():
+            print(f"📊 {name}: {stats['hits']} cached / {stats['hits'] + stats['misses']} calls")
+        print(f"📊 Docs tool cache hit ratio: {docs_agent.tool_cache.hit_ratio():.0%}")
+    docs_agent.close()
 
 if __name__ == "__main__":
     main()
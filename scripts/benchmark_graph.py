@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Graph Runner Benchmark
+Wall time of a 1-lead/N-expert graph by concurrency cap, and what a re-run recomputes after one expert changes
+"""
+
+import argparse
+import time
+from strands import Agent
+from benchmark_models import FakeModel
+from graph_runner import GraphRunner, NodeCache
+
+TASK = "Evaluate microservices architecture migration"
+
+def build(experts: int, latency: float, max_concurrency: int, cache: NodeCache, changed: int = -1):
+    runner = GraphRunner(max_concurrency=max_concurrency, cache=cache)
+    runner.add_node(Agent(name="lead", model=FakeModel(ttft=latency), callback_handler=None,
+                          system_prompt="Research leader. Coordinate analysis."), "lead")
+    runner.set_entry_point("lead")
+    for i in range(experts):
+        focus = "cost" if i == changed else f"area {i}"
+        expert = Agent(name=f"expert_{i}", model=FakeModel(ttft=latency), callback_handler=None,
+                       system_prompt=f"Domain expert. Provide technical insights on {focus}.")
+        runner.add_node(expert, f"expert_{i}").add_edge("lead", f"expert_{i}")
+    return runner
+
+def timed(runner: GraphRunner):
+    start = time.perf_counter()
+    result = runner(TASK)
+    wall = time.perf_counter() - start
+    recomputed = [node["node_id"] for node in runner.last_report if not node["cache_hit"]]
+    return result, wall, recomputed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the graph runner with stub agents")
+    parser.add_argument("--experts", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub model latency per node, seconds")
+    parser.add_argument("--concurrency", default="1,4,8", help="comma-separated concurrency caps")
+    args = parser.parse_args()
+
+    print(f"=== 1 lead -> {args.experts} experts, {args.latency * 1000:.0f}ms per node ===")
+    print(f"   {'cap':>4} {'wall':>9} {'nodes run':>10}")
+    for cap in (int(cap) for cap in args.concurrency.split(",")):
+        _, wall, recomputed = timed(build(args.experts, args.latency, cap, NodeCache()))
+        print(f"   {cap:>4} {wall * 1000:>7.0f}ms {len(recomputed):>10}")
+
+    cap = max(int(cap) for cap in args.concurrency.split(","))
+    cache = NodeCache()
+    print(f"\n=== re-runs sharing one cache (cap {cap}) ===")
+    for label, changed in (("cold", -1), ("unchanged", -1), ("expert_0 changed", 0)):
+        runner = build(args.experts, args.latency, cap, cache, changed)
+        result, wall, recomputed = timed(runner)
+        print(f"   {label:<17} {wall * 1000:>7.0f}ms  {result.status.value:<10} recomputed: "
+              f"{', '.join(recomputed) or 'nothing'}")
+
+    print("\nPer-node timings of the last run (result.execution_order):")
+    for node in runner.last_report:
+        print(f"   {node['node_id']:<10} {node['execution_time'] * 1000:>7.1f}ms "
+              f"{'cached' if node['cache_hit'] else 'ran':<7} waited {node['queued'] * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
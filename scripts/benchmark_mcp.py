@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+MCP Session Benchmark
+Cold vs warm per-query latency, serial vs concurrent vs lazy startup and the docs tool result cache
+against local stub MCP servers - no model calls
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from strands import Agent
+import projects_path  # noqa: F401 - makes ../projects importable
+from mcp_sessions import MCPSessionManager, namespaced, stdio_client_factory
+from tool_cache import create_tool_cache
+
+STUB_SERVER = {
+    "command": sys.executable,
+    "args": ["stub_mcp_server.py"],
+    "env": {"STUB_MCP_STARTUP_DELAY": "0.5", "FASTMCP_LOG_LEVEL": "ERROR"}
+}
+
+def cold_query(i: int):
+    """What AWSDocsAgent.query used to do: spawn, handshake and list tools every time"""
+    with stdio_client_factory(STUB_SERVER) as client:
+        client.list_tools_sync()
+        client.call_tool_sync(f"cold-{i}", "search_documentation", {"search_phrase": "S3 lifecycle"})
+
+def stub_servers(*delays: float) -> dict:
+    """One stub server per startup delay, all exposing the same tool name"""
+    return {f"stub-{i}": {**STUB_SERVER, "env": {**STUB_SERVER["env"], "STUB_MCP_STARTUP_DELAY": str(delay)}}
+            for i, delay in enumerate(delays)}
+
+def bench_startup(args):
+    servers = stub_servers(1.0, 2.0, 3.0)
+    print(f"🚀 Starting {len(servers)} stub servers (1s / 2s / 3s startup delay)\n")
+
+    with MCPSessionManager(servers) as sessions:
+        each = []
+        for session in sessions.sessions.values():
+            start = time.time()
+            session.start()
+            each.append(time.time() - start)
+        print(f"   serial      {sum(each):.2f}s  slowest server {max(each):.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spec_cache = os.path.join(tmp, "tools.json")
+        with MCPSessionManager(servers, spec_cache=spec_cache) as sessions:
+            start = time.time()
+            tools = sessions.registry()
+            print(f"   concurrent  {time.time() - start:.2f}s  registry={[tool.tool_name for tool in tools]}")
+
+        with MCPSessionManager(servers, spec_cache=spec_cache) as sessions:
+            start = time.time()
+            tools = sessions.registry(lazy=True)
+            ready = time.time() - start
+            start = time.time()
+            tool_use = {"toolUseId": "lazy-0", "name": tools[0].tool_name, "input": {"search_phrase": "S3"}}
+            asyncio.run(first_event(tools[0].stream(tool_use, {})))
+            started = sum(session.client is not None for session in sessions.sessions.values())
+            print(f"   lazy        {ready:.2f}s  first call {time.time() - start:.2f}s  "
+                  f"servers running {started}/{len(servers)}")
+
+async def first_event(stream):
+    async for event in stream:
+        return event
+
+def bench_cache(args):
+    phrases = ["S3 lifecycle", "Lambda timeout", "DynamoDB TTL"]
+    print(f"🗄️  {args.queries} search_documentation calls over {len(phrases)} distinct phrases\n")
+
+    name = namespaced("stub", "search_documentation")
+    with MCPSessionManager({"stub": STUB_SERVER}) as sessions:
+        tools = sessions.registry()
+        cache = create_tool_cache("memory", ttl={name: 3600})
+        for label, agent_tools in (("uncached", tools), ("cached", cache.wrap(tools))):
+            # Direct tool calls go through the same executor as model-requested ones
+            agent = Agent(tools=agent_tools, callback_handler=None, record_direct_tool_call=False)
+            timings = []
+            for i in range(args.queries):
+                start = time.time()
+                getattr(agent.tool, name)(search_phrase=phrases[i % len(phrases)])
+                timings.append(time.time() - start)
+            print(f"   {label:<9} median {statistics.median(timings) * 1000:.1f}ms  total {sum(timings):.3f}s")
+
+    stats = cache.stats[name]
+    print(f"\n📊 Hit ratio {cache.hit_ratio():.0%}: {stats['misses']} of {args.queries} calls reached the server")
+
+def bench_sessions(args):
+    print(f"🔌 {args.queries} queries against the stub MCP server\n")
+
+    cold = []
+    for i in range(args.queries):
+        start = time.time()
+        cold_query(i)
+        cold.append(time.time() - start)
+
+    warm = []
+    with MCPSessionManager({"stub": STUB_SERVER}) as sessions:
+        for i in range(args.queries):
+            start = time.time()
+            session = sessions.session("stub")
+            session.tools()
+            session.client.call_tool_sync(f"warm-{i}", "search_documentation", {"search_phrase": "S3 lifecycle"})
+            warm.append(time.time() - start)
+        stats = sessions.sessions["stub"].stats
+
+    for label, timings in (("cold", cold), ("warm", warm)):
+        print(f"   {label}  first {timings[0]:.3f}s  median {statistics.median(timings):.3f}s  "
+              f"max {max(timings):.3f}s")
+    print(f"\n📊 Median speedup: {statistics.median(cold) / statistics.median(warm):.1f}x  "
+          f"(warm session: {stats['starts']} start, {stats['tool_refreshes']} tool list fetch)")
+
+BENCHMARKS = {
+    "cache": bench_cache,
+    "sessions": bench_sessions,
+    "startup": bench_startup,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP session reuse, startup and tool caching")
+    parser.add_argument("benchmark", nargs="?", default="sessions", choices=BENCHMARKS)
+    parser.add_argument("--queries", type=int, default=10)
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Model Comparison Benchmark
+Time-to-first-token, total latency, tokens/sec and error rate per model and concurrency level, with percentiles
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import itertools
+import json
+import random
+import time
+from typing import Any, Dict, List
+from strands import Agent
+
+import projects_path  # noqa: F401 - makes ../projects importable
+from context_handoff import estimate_tokens
+from model_pool import create_model
+from resilience import percentile
+from stub_model import StubModel
+
+DEFAULT_PROMPTS = [
+    "Explain quantum computing in one sentence.",
+    "What is the difference between a container and a virtual machine?",
+    "Give three tips for writing a good Dockerfile.",
+    "Summarize what Kubernetes does for a beginner.",
+    "What is infrastructure as code?",
+]
+
+PERCENTILES = (50, 90, 99)
+
+class FakeModel(StubModel):
+    """Deterministic local strands Model for offline runs and CI.
+
+    Answers after ttft seconds and then streams output_tokens words at
+    tokens_per_second. The answer depends only on the prompt; an injected
+    failure (error_rate) on the prompt, seed and the request key passed as
+    invocation_state["request"], so runs are reproducible at any concurrency.
+    Without a request key the call number stands in for it.
+    """
+
+    def __init__(self, ttft: float = 0.05, tokens_per_second: float = 200, output_tokens: int = 40,
+                 error_rate: float = 0.0, seed: int = 0, chunk_tokens: int = 5, **kwargs):
+        super().__init__(model_id="fake", **kwargs)
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.seed = seed
+        self.chunk_tokens = chunk_tokens
+        self.call_numbers = itertools.count()
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, invocation_state=None, **kwargs):
+        prompt = json.dumps(messages[-1]["content"], default=str)
+        request = (invocation_state or {}).get("request")
+        if request is None:
+            request = next(self.call_numbers)
+        # One rng per request, so concurrent requests can't shift each other's draws
+        rng = random.Random(f"{self.seed}\0{request}\0{prompt}")
+        if rng.random() < self.error_rate:
+            await asyncio.sleep(self.ttft)
+            raise RuntimeError("fake model error (injected)")
+        words = hashlib.sha256(prompt.encode()).hexdigest()
+        await asyncio.sleep(self.ttft)
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        for start in range(0, self.output_tokens, self.chunk_tokens):
+            n = min(self.chunk_tokens, self.output_tokens - start)
+            yield {"contentBlockDelta": {"delta": {"text": " ".join(words[i % 60:i % 60 + 4]
+                                                                     for i in range(start, start + n)) + " "}}}
+            await asyncio.sleep(n / self.tokens_per_second)
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        input_tokens = estimate_tokens(prompt)
+        yield {"metadata": {"usage": {"inputTokens": input_tokens, "outputTokens": self.output_tokens,
+                                      "totalTokens": input_tokens + self.output_tokens},
+                            "metrics": {"latencyMs": 0}}}
+
+def parse_model(text: str) -> Dict[str, Any]:
+    """provider:model_id[,key=value...] e.g. bedrock:us.anthropic.claude-sonnet-4-20250514-v1:0 or fake,ttft=0.2"""
+    head, *options = text.split(",")
+    provider, _, model_id = head.partition(":")
+    spec = {"provider": provider, "model_id": model_id or provider, "name": head}
+    for option in options:
+        key, _, value = option.partition("=")
+        try:
+            spec[key] = json.loads(value)
+        except ValueError:
+            spec[key] = value
+    return spec
+
+def build_model(spec: Dict[str, Any]) -> Any:
+    if spec["provider"] == "fake":
+        options = {key: spec[key] for key in ("ttft", "tokens_per_second", "output_tokens", "error_rate", "seed")
+                   if key in spec}
+        return FakeModel(**options)
+    return create_model(spec)
+
+def load_prompts(path: str) -> List[str]:
+    """One prompt per line, or JSON Lines with a "prompt" field"""
+    with open(path, 'r') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    return [json.loads(line)["prompt"] if path.endswith(".jsonl") else line for line in lines]
+
+async def timed_request(model: Any, prompt: str, timeout: float, request: str = None) -> Dict[str, Any]:
+    """One fresh Agent call, streamed so the first text chunk can be timed; request keys the fake's faults"""
+    agent = Agent(model=model, callback_handler=None)
+    start = time.perf_counter()
+    first_token = None
+    result = None
+
+    async def consume():
+        nonlocal first_token, result
+        async for event in agent.stream_async(prompt, invocation_state={"request": request}):
+            if "data" in event and first_token is None:
+                first_token = time.perf_counter() - start
+            if "result" in event:
+                result = event["result"]
+
+    try:
+        await asyncio.wait_for(consume(), timeout)
+    except Exception as error:
+        return {"ok": False, "error": f"{type(error).__name__}: {error}", "total": time.perf_counter() - start}
+
+    total = time.perf_counter() - start
+    invocation = getattr(result.metrics, "latest_agent_invocation", None)
+    output_tokens = (invocation.usage.get("outputTokens") if invocation else None) or estimate_tokens(str(result))
+    ttft = first_token if first_token is not None else total
+    return {
+        "ok": True,
+        "ttft": ttft,
+        "total": total,
+        "output_tokens": output_tokens,
+        # Decode speed: tokens after the first one arrived
+        "tokens_per_second": output_tokens / (total - ttft) if total > ttft else 0.0
+    }
+
+async def run_level(model: Any, prompts: List[str], repeats: int, concurrency: int, timeout: float):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(prompt, request):
+        async with semaphore:
+            return await timed_request(model, prompt, timeout, request)
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*(one(prompt, f"{repeat}:{index}")
+                                     for repeat in range(repeats) for index, prompt in enumerate(prompts)))
+    return samples, time.perf_counter() - start
+
+def summarize(name: str, concurrency: int, samples: List[Dict[str, Any]], wall: float) -> Dict[str, Any]:
+    ok = [sample for sample in samples if sample["ok"]]
+    row = {
+        "model": name,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "error_rate": (len(samples) - len(ok)) / len(samples) if samples else 0.0,
+        "requests_per_second": len(samples) / wall if wall else 0.0
+    }
+    for metric in ("ttft", "total", "tokens_per_second"):
+        values = [sample[metric] for sample in ok]
+        for pct in PERCENTILES:
+            row[f"{metric}_p{pct}"] = percentile(values, pct)
+    return row
+
+def write_results(path: str, rows: List[Dict[str, Any]], errors: Dict[str, List[str]]):
+    if path.endswith(".csv"):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w') as f:
+            json.dump({"results": rows, "errors": errors}, f, indent=2)
+
+async def run(args):
+    prompts = load_prompts(args.prompts) if args.prompts else DEFAULT_PROMPTS
+    specs = [parse_model(text) for text in args.model]
+    levels = [int(level) for level in args.concurrency.split(",")]
+    rows, errors = [], {}
+
+    for spec in specs:
+        model = build_model(spec)
+        print(f"\n🔥 {spec['name']}: {args.warmup} warmup request(s)")
+        for i in range(args.warmup):
+            await timed_request(model, prompts[i % len(prompts)], args.timeout, f"warmup:{i}")
+        for level in levels:
+            samples, wall = await run_level(model, prompts, args.repeats, level, args.timeout)
+            row = summarize(spec["name"], level, samples, wall)
+            rows.append(row)
+            errors.setdefault(spec["name"], []).extend(sample["error"] for sample in samples if not sample["ok"])
+            print(f"   c={level:<3} {row['requests']} req  ttft p50 {row['ttft_p50'] * 1000:7.0f}ms "
+                  f"p90 {row['ttft_p90'] * 1000:7.0f}ms  total p50 {row['total_p50'] * 1000:7.0f}ms "
+                  f"p90 {row['total_p90'] * 1000:7.0f}ms  {row['tokens_per_second_p50']:6.1f} tok/s  "
+                  f"errors {row['error_rate']:.0%}  {row['requests_per_second']:.1f} req/s")
+
+    if args.output:
+        write_results(args.output, rows, errors)
+        print(f"\n📄 Results written to {args.output}")
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare models: TTFT, latency, tokens/sec, error rate")
+    parser.add_argument("--model", action="append",
+                        help="provider:model_id[,key=value...]; providers: bedrock, ollama, fake (repeatable)")
+    parser.add_argument("--prompts", help="prompt corpus: text file (one per line) or JSONL with \"prompt\"")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=3, help="passes over the corpus per concurrency level")
+    parser.add_argument("--concurrency", default="1,4", help="comma-separated concurrency levels")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request timeout in seconds")
+    parser.add_argument("--output", help="results file, .json or .csv")
+    args = parser.parse_args()
+    # Offline by default: two fake models that differ in first-token latency and decode speed
+    args.model = args.model or ["fake:fast,ttft=0.05,tokens_per_second=400",
+                                "fake:slow,ttft=0.3,tokens_per_second=100,error_rate=0.05"]
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Repository Review Benchmark
+Model calls and code tokens sent per review run with a stub model: whole-file reviews vs the incremental reviewer
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+from strands import Agent
+from benchmark_models import FakeModel
+from code_analysis import iter_python_files
+from context_handoff import estimate_tokens
+from repo_review import review_repository
+
+class CountingModel(FakeModel):
+    """FakeModel that counts its calls, to check the reviewer's own model_calls figure"""
+
+    calls = 0
+    lock = threading.Lock()
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        with CountingModel.lock:
+            CountingModel.calls += 1
+        async for event in super().stream(messages, tool_specs, system_prompt, **kwargs):
+            yield event
+
+def stub_agent(**kwargs):
+    return Agent(model=CountingModel(ttft=0.001, tokens_per_second=100000), **kwargs)
+
+def whole_file_cost(root: str):
+    """The old approach: every file, whole, on every run"""
+    paths = iter_python_files(root)
+    tokens = 0
+    for path in paths:
+        with open(path, 'r', errors="replace") as f:
+            tokens += estimate_tokens(f.read())
+    return len(paths), tokens
+
+def edit_one_function(root: str) -> str:
+    """Add a statement to the first function of the largest file"""
+    path = max(iter_python_files(root), key=os.path.getsize)
+    with open(path, 'r') as f:
+        lines = f.read().split("\n")
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith("def ") and line.rstrip().endswith(":"):
+            indent = len(line) - len(line.lstrip()) + 4
+            lines.insert(i + 1, " " * indent + "pass  # edited")
+            break
+    with open(path, 'w') as f:
+        f.write("\n".join(lines))
+    return os.path.relpath(path, root)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental repository review with a stub model")
+    parser.add_argument("root", nargs="?", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                "..", "projects"),
+                        help="tree to review, copied to a temp dir first (default: ../projects)")
+    parser.add_argument("--chunk-tokens", type=int, default=1500)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="review-bench-")
+    try:
+        tree = os.path.join(directory, "repo")
+        shutil.copytree(args.root, tree, ignore=shutil.ignore_patterns("__pycache__", "*.db*", ".git"))
+        files, file_tokens = whole_file_cost(tree)
+        print(f"=== {files} files, ~{file_tokens:,} code tokens ===")
+        print(f"   {'run':<24} {'calls':>6} {'tokens sent':>12} {'reused chunks':>14}")
+        print(f"   {'whole files (every run)':<24} {files:>6} {file_tokens:>12,} {'-':>14}")
+
+        def run(label: str):
+            before = CountingModel.calls
+            stats = review_repository(tree, stub_agent, chunk_tokens=args.chunk_tokens)["stats"]
+            assert CountingModel.calls - before == stats["model_calls"]
+            print(f"   {label:<24} {stats['model_calls']:>6} {stats['tokens_sent']:>12,} "
+                  f"{stats['reused_chunks']:>7}/{stats['chunks']:<6}")
+
+        run("first run")
+        run("unchanged")
+        edited = edit_one_function(tree)
+        run("one function edited")
+        with open(os.path.join(tree, "new_module.py"), 'w') as f:
+            f.write("def added(x):\n    return x * 2\n")
+        run("one file added")
+        print(f"\n   (edited the first function of {edited})")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
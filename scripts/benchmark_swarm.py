@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Swarm Budget Benchmark
+Wall time and tokens of a stub swarm with stragglers, unbounded vs agent-capped, time- and token-budgeted
+"""
+
+import argparse
+import asyncio
+from strands import Agent
+from benchmark_models import FakeModel
+from swarm_budget import format_report, run_swarm
+
+TASK = "Analyze the impact of AI on DevOps jobs"
+
+def team(size: int, stragglers: int):
+    return [{"name": f"{'straggler' if i < stragglers else 'analyst'}_{i}",
+             "system_prompt": f"You are analyst {i}. Cover one angle of the question."} for i in range(size)]
+
+def stub_factory(fast: float, slow: float):
+    """Stragglers think for `slow` seconds before answering and write 10x more"""
+    def factory(name: str, system_prompt: str):
+        straggler = name.startswith("straggler")
+        model = FakeModel(ttft=slow if straggler else fast, tokens_per_second=400,
+                          output_tokens=400 if straggler else 40)
+        return Agent(model=model, name=name, system_prompt=system_prompt, callback_handler=None)
+    return factory
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the budgeted swarm with stub agents")
+    parser.add_argument("--agents", type=int, default=8, help="agents the coordinator asks for")
+    parser.add_argument("--stragglers", type=int, default=2)
+    parser.add_argument("--fast", type=float, default=0.2, help="first-token latency of normal agents")
+    parser.add_argument("--slow", type=float, default=5.0, help="first-token latency of stragglers")
+    args = parser.parse_args()
+
+    factory = stub_factory(args.fast, args.slow)
+    scenarios = [
+        ("unbounded", dict(max_agents=args.agents, token_budget=None, time_budget=None)),
+        ("max 4 agents", dict(max_agents=4, token_budget=None, time_budget=None)),
+        ("1.5s budget", dict(max_agents=args.agents, token_budget=None, time_budget=1.5)),
+        ("600 tokens", dict(max_agents=args.agents, token_budget=600, time_budget=None)),
+    ]
+    print(f"=== {args.agents} agents requested, {args.stragglers} stragglers ({args.slow:g}s) ===")
+    print(f"   {'scenario':<14} {'wall':>7} {'tokens':>7} {'completed':>10} {'cancelled':>10} {'skipped':>8}")
+    results = {}
+    for label, limits in scenarios:
+        result = results[label] = asyncio.run(run_swarm(TASK, team(args.agents, args.stragglers), factory, **limits))
+        counts = {status: sum(agent["status"] == status for agent in result["agents"])
+                  for status in ("completed", "cancelled", "skipped")}
+        print(f"   {label:<14} {result['execution_time']:>6.2f}s {result['total_tokens']:>7,} "
+              f"{counts['completed']:>10} {counts['cancelled']:>10} {counts['skipped']:>8}")
+
+    for label in ("1.5s budget", "600 tokens"):
+        print(f"\nReport returned with the {label} answer:\n{format_report(results[label])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Code Analysis Engine
+Parses Python source once with ast for functions, classes, cyclomatic complexity, nesting depth and
+style issues; results are cached by content hash and whole trees are analyzed across a process pool
+"""
+
+import ast
+import hashlib
+import io
+import os
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import projects_path  # noqa: F401 - makes ../projects importable
+from response_cache import MemoryCacheBackend, SqliteCacheBackend
+
+# Bump when the metrics change so cached results from an older engine are ignored
+ENGINE_VERSION = "2"
+
+MAX_LINE_LENGTH = 100
+
+EXCLUDE_DIRS = {".git", ".hg", ".svn", "__pycache__", ".venv", "venv", "env", "node_modules", "build", "dist",
+                ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".eggs"}
+
+# Each adds one decision point (McCabe); boolean operators and comprehension filters are counted separately
+BRANCHES = {ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.Assert, ast.match_case}
+
+# Blocks that count towards nesting depth
+BLOCKS = {ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try, ast.Match} | (
+    {ast.TryStar} if hasattr(ast, "TryStar") else set())
+
+FUNCTIONS = {ast.FunctionDef, ast.AsyncFunctionDef}
+
+STRINGS = {ast.Constant, ast.JoinedStr}
+
+def complexity_rating(complexity: int) -> str:
+    return "Low" if complexity <= 5 else "Medium" if complexity <= 10 else "High"
+
+class _Visitor:
+    """One walk over the tree: counts, per-function complexity, nesting depth and multi-line string rows"""
+
+    def __init__(self):
+        self.functions: List[Dict[str, Any]] = []
+        self.classes = 0
+        self.max_nesting = 0
+        self.string_rows: set = set()
+
+    def visit(self, node: ast.AST, scope: str = "", depth: int = 0, function: Optional[Dict[str, Any]] = None):
+        for child in ast.iter_child_nodes(node):
+            kind = type(child)
+            if kind in FUNCTIONS:
+                record = {"name": f"{scope}{child.name}", "line": child.lineno, "complexity": 1, "nesting": 0}
+                self.functions.append(record)
+                self.visit(child, f"{scope}{child.name}.", 0, record)
+                continue
+            if kind is ast.ClassDef:
+                self.classes += 1
+                self.visit(child, f"{scope}{child.name}.", 0, None)
+                continue
+            if kind in STRINGS:
+                # Rows inside a multi-line string are neither comments nor indentation
+                if child.end_lineno > child.lineno:
+                    self.string_rows.update(range(child.lineno + 1, child.end_lineno + 1))
+                if kind is ast.Constant:
+                    continue
+
+            if function is not None:
+                if kind in BRANCHES:
+                    function["complexity"] += 1
+                elif kind is ast.BoolOp:
+                    function["complexity"] += len(child.values) - 1
+                elif kind is ast.comprehension:
+                    function["complexity"] += 1 + len(child.ifs)
+
+            child_depth = depth
+            # An elif is an If alone in its parent If's orelse: same level as the if it continues
+            is_elif = kind is ast.If and type(node) is ast.If and len(node.orelse) == 1 and node.orelse[0] is child
+            if kind in BLOCKS and not is_elif:
+                child_depth += 1
+                if child_depth > self.max_nesting:
+                    self.max_nesting = child_depth
+                if function is not None and child_depth > function["nesting"]:
+                    function["nesting"] = child_depth
+            self.visit(child, scope, child_depth, function)
+
+def _scan_lines(lines: List[str], string_rows: set, max_line_length: int) -> Dict[str, Any]:
+    """Line metrics in one pass: code/comment/blank lines, tab indentation, long lines"""
+    code = comments = blank = 0
+    long_rows, tab_rows = [], []
+    for row, line in enumerate(lines, 1):
+        if len(line) > max_line_length:
+            long_rows.append(row)
+        if row in string_rows:
+            code += 1
+            continue
+        stripped = line.lstrip()
+        if not stripped:
+            blank += 1
+            continue
+        if stripped[0] == "#":
+            comments += 1
+        else:
+            code += 1
+        if "\t" in line[:len(line) - len(stripped)]:
+            tab_rows.append(row)
+    return {"lines": len(lines), "code_lines": code, "comment_lines": comments, "blank_lines": blank,
+            "long_lines": long_rows, "tab_indented_lines": tab_rows}
+
+def source_lines(code: str) -> List[str]:
+    """Physical lines as ast numbers them (str.splitlines would also split on form feeds)"""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return lines[:-1] if lines and not lines[-1] else lines
+
+def decode_source(data: bytes) -> str:
+    """Source bytes as text, honouring a PEP 263 coding cookie"""
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    except SyntaxError:
+        encoding = "utf-8"
+    return data.decode(encoding, errors="replace")
+
+def analyze_source(code: str, max_line_length: int = MAX_LINE_LENGTH) -> Dict[str, Any]:
+    """All metrics for one Python source, parsing it once"""
+    visitor = _Visitor()
+    try:
+        visitor.visit(ast.parse(code))
+        syntax_error = None
+    except (SyntaxError, ValueError) as error:
+        syntax_error = f"line {getattr(error, 'lineno', '?')}: {getattr(error, 'msg', error)}"
+    metrics = _scan_lines(source_lines(code), visitor.string_rows, max_line_length)
+    metrics["syntax_error"] = syntax_error
+
+    complexities = [function["complexity"] for function in visitor.functions]
+    metrics.update({
+        "functions": len(visitor.functions),
+        "classes": visitor.classes,
+        "max_complexity": max(complexities, default=0),
+        "average_complexity": round(sum(complexities) / len(complexities), 2) if complexities else 0.0,
+        "max_nesting": visitor.max_nesting,
+        "complex_functions": [function for function in visitor.functions if function["complexity"] > 10]
+    })
+    return metrics
+
+def style_issues(metrics: Dict[str, Any], max_line_length: int = MAX_LINE_LENGTH) -> List[str]:
+    issues = []
+    if metrics["syntax_error"]:
+        issues.append(f"Syntax error ({metrics['syntax_error']})")
+    if metrics["tab_indented_lines"]:
+        issues.append(f"Tab indentation on {len(metrics['tab_indented_lines'])} line(s), "
+                      f"first at line {metrics['tab_indented_lines'][0]}")
+    if metrics["long_lines"]:
+        issues.append(f"{len(metrics['long_lines'])} line(s) longer than {max_line_length} chars, "
+                      f"first at line {metrics['long_lines'][0]}")
+    if metrics["max_nesting"] > 4:
+        issues.append(f"Nesting depth {metrics['max_nesting']} (>4)")
+    for function in metrics["complex_functions"]:
+        issues.append(f"{function['name']} (line {function['line']}) has complexity {function['complexity']}")
+    return issues
+
+def format_analysis(metrics: Dict[str, Any], max_line_length: int = MAX_LINE_LENGTH) -> str:
+    issues = style_issues(metrics, max_line_length)
+    return (f"Analysis: {metrics['code_lines']} code lines ({metrics['comment_lines']} comment), "
+            f"{metrics['functions']} functions, {metrics['classes']} classes, complexity "
+            f"avg {metrics['average_complexity']} / max {metrics['max_complexity']} "
+            f"({complexity_rating(metrics['max_complexity'])}), nesting depth {metrics['max_nesting']}\n"
+            f"Style issues: {'; '.join(issues) if issues else 'None found'}")
+
+class AnalysisCache:
+    """Analysis results keyed on the content hash, in a response_cache backend (memory or sqlite)"""
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_entries=4096)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data: bytes, max_line_length: int = MAX_LINE_LENGTH) -> str:
+        digest = hashlib.sha256(data)
+        digest.update(f"\0analysis\0{ENGINE_VERSION}\0{max_line_length}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["result"]
+
+    def set(self, key: str, metrics: Dict[str, Any]):
+        self.backend.set(key, {"namespace": "analysis", "result": metrics})
+
+def create_analysis_cache(backend: str = "memory", path: str = "analysis_cache.db",
+                          max_entries: int = 100000) -> Optional[AnalysisCache]:
+    """Build an AnalysisCache from simple settings ("memory", "sqlite" or "none")"""
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        return AnalysisCache(SqliteCacheBackend(path, max_entries=max_entries))
+    return AnalysisCache(MemoryCacheBackend(max_entries=max_entries))
+
+_default_cache = AnalysisCache()
+
+def analyze_code_cached(code: str, cache: Optional[AnalysisCache] = _default_cache,
+                        max_line_length: int = MAX_LINE_LENGTH) -> Dict[str, Any]:
+    data = code.encode()
+    key = AnalysisCache.key(data, max_line_length)
+    metrics = cache.get(key) if cache else None
+    if metrics is None:
+        metrics = analyze_source(code, max_line_length)
+        if cache:
+            cache.set(key, metrics)
+    return metrics
+
+def iter_python_files(root: str, exclude_dirs: Iterable[str] = EXCLUDE_DIRS) -> List[str]:
+    """.py files under root (or root itself), skipping VCS, virtualenv and build directories"""
+    if os.path.isfile(root):
+        return [root]
+    excluded = set(exclude_dirs)
+    found = []
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in excluded and not d.endswith(".egg-info"))
+        found.extend(os.path.join(directory, name) for name in sorted(files) if name.endswith(".py"))
+    return found
+
+def _analyze_batch(batch: List[Tuple[str, bytes]], max_line_length: int) -> List[Tuple[str, Dict[str, Any]]]:
+    return [(path, analyze_source(decode_source(data), max_line_length)) for path, data in batch]
+
+def analyze_tree(root: str, cache: Optional[AnalysisCache] = None, workers: Optional[int] = None,
+                 max_line_length: int = MAX_LINE_LENGTH, min_pool_files: int = 64,
+                 paths: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Metrics for every .py file under root (or just paths), keyed by path relative to root.
+
+    Files are hashed in this process and looked up in cache; only misses are
+    parsed, across a process pool of workers (default: CPU count) once there
+    are at least min_pool_files of them. Unreadable files get an "error" entry.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    misses: List[Tuple[str, bytes]] = []
+    keys: Dict[str, str] = {}
+    base = root if os.path.isdir(root) else os.path.dirname(root)
+    for path in paths if paths is not None else iter_python_files(root):
+        relative = os.path.relpath(path, base)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as error:
+            results[relative] = {"error": str(error)}
+            continue
+        keys[relative] = AnalysisCache.key(data, max_line_length)
+        metrics = cache.get(keys[relative]) if cache else None
+        if metrics is None:
+            misses.append((relative, data))
+        else:
+            results[relative] = metrics
+
+    workers = workers or os.cpu_count() or 1
+    if len(misses) < min_pool_files or workers == 1:
+        analyzed = _analyze_batch(misses, max_line_length)
+    else:
+        # A few batches per worker: big enough to amortize pickling, small enough to balance load
+        size = max(1, len(misses) // (workers * 4))
+        batches = [misses[i:i + size] for i in range(0, len(misses), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            analyzed = [item for batch in pool.map(_analyze_batch, batches, [max_line_length] * len(batches))
+                        for item in batch]
+
+    for relative, metrics in analyzed:
+        results[relative] = metrics
+        if cache:
+            cache.set(keys[relative], metrics)
+    return dict(sorted(results.items()))
+
+def summarize_tree(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    analyzed = {path: metrics for path, metrics in results.items() if "error" not in metrics}
+    hotspots = sorted(((path, function) for path, metrics in analyzed.items()
+                       for function in metrics["complex_functions"]),
+                      key=lambda item: -item[1]["complexity"])
+    return {
+        "files": len(results),
+        "unreadable": len(results) - len(analyzed),
+        "syntax_errors": sum(1 for metrics in analyzed.values() if metrics["syntax_error"]),
+        "code_lines": sum(metrics["code_lines"] for metrics in analyzed.values()),
+        "functions": sum(metrics["functions"] for metrics in analyzed.values()),
+        "classes": sum(metrics["classes"] for metrics in analyzed.values()),
+        "long_lines": sum(len(metrics["long_lines"]) for metrics in analyzed.values()),
+        "tab_indented_files": sum(1 for metrics in analyzed.values() if metrics["tab_indented_lines"]),
+        "hotspots": [{"path": path, **function} for path, function in hotspots[:10]]
+    }
+
+def format_tree_summary(summary: Dict[str, Any]) -> str:
+    lines = [f"Repository: {summary['files']} files, {summary['code_lines']:,} code lines, "
+             f"{summary['functions']:,} functions, {summary['classes']:,} classes",
+             f"Syntax errors: {summary['syntax_errors']}, unreadable: {summary['unreadable']}, "
+             f"long lines: {summary['long_lines']:,}, files with tab indentation: {summary['tab_indented_files']}"]
+    if summary["hotspots"]:
+        lines.append("Most complex functions:")
+        lines.extend(f"  {spot['path']}:{spot['line']} {spot['name']} (complexity {spot['complexity']})"
+                     for spot in summary["hotspots"])
+    return "\n".join(lines)
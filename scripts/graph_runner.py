@@ -0,0 +1,148 @@
+"""
+Graph Runner
+GraphBuilder workflows with a cap on concurrently running sibling nodes and memoized node outputs,
+so re-running a partly changed graph only recomputes the nodes whose prompt or inputs changed
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from strands.multiagent import GraphBuilder
+
+def node_fingerprint(agent: Any) -> str:
+    """What makes two runs of a node equivalent besides its input: system prompt and model config"""
+    model = getattr(agent, "model", None)
+    config = model.get_config() if hasattr(model, "get_config") else None
+    return json.dumps([getattr(agent, "system_prompt", None), config], sort_keys=True, default=str)
+
+class NodeCache:
+    """In-process LRU of node results keyed on (node_id, fingerprint, input hash)"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(node_id: str, fingerprint: str, node_input: Any) -> str:
+        payload = json.dumps([node_id, fingerprint, node_input], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+            return result
+
+    def set(self, key: str, result: Any):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+class CachedNode:
+    """Graph node executor around an Agent: answers from the NodeCache, else runs the agent once a slot is free.
+
+    The agent's history is cleared before each run, so a node's output depends
+    only on its input and fingerprint - which is what makes it safe to memoize.
+    """
+
+    def __init__(self, node_id: str, agent: Any, runner: "GraphRunner"):
+        self.node_id = node_id
+        self.agent = agent
+        self.runner = runner
+        self.name = getattr(agent, "name", node_id)
+
+    async def stream_async(self, prompt: Any = None, **kwargs: Any):
+        key = NodeCache.key(self.node_id, node_fingerprint(self.agent), prompt)
+        cached = self.runner.cache.get(key) if self.runner.cache else None
+        if cached is not None:
+            self.runner._record(self.node_id, cache_hit=True, queued=0.0)
+            yield {"result": cached}
+            return
+
+        queued = time.time()
+        async with self.runner._slots:
+            self.runner._record(self.node_id, cache_hit=False, queued=time.time() - queued)
+            self.agent.messages.clear()
+            result = None
+            async for event in self.agent.stream_async(prompt, **kwargs):
+                if "result" in event:
+                    result = event["result"]
+                yield event
+        if result is not None and self.runner.cache:
+            self.runner.cache.set(key, result)
+
+    async def invoke_async(self, prompt: Any = None, **kwargs: Any):
+        result = None
+        async for event in self.stream_async(prompt, **kwargs):
+            if "result" in event:
+                result = event["result"]
+        return result
+
+    def __call__(self, prompt: Any = None, **kwargs: Any):
+        return asyncio.run(self.invoke_async(prompt, **kwargs))
+
+class GraphRunner:
+    """GraphBuilder with concurrency-capped, memoized nodes and a per-node timing report.
+
+    strands already runs every ready node of a batch at once; max_concurrency
+    caps how many of them call their model at the same time. The same
+    NodeCache is shared across runs, so a re-run with one changed node only
+    recomputes that node and the nodes downstream of it.
+    """
+
+    def __init__(self, max_concurrency: int = 4, cache: Optional[NodeCache] = None,
+                 execution_timeout: float = 900):
+        self.max_concurrency = max_concurrency
+        self.cache = cache if cache is not None else NodeCache()
+        self.builder = GraphBuilder().set_execution_timeout(execution_timeout)
+        self.graph = None
+        self.last_report: List[Dict[str, Any]] = []
+        self._node_stats: Dict[str, Dict[str, Any]] = {}
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def add_node(self, agent: Any, node_id: str) -> "GraphRunner":
+        self.builder.add_node(CachedNode(node_id, agent, self), node_id)
+        self.graph = None
+        return self
+
+    def add_edge(self, from_node: str, to_node: str) -> "GraphRunner":
+        self.builder.add_edge(from_node, to_node)
+        self.graph = None
+        return self
+
+    def set_entry_point(self, node_id: str) -> "GraphRunner":
+        self.builder.set_entry_point(node_id)
+        self.graph = None
+        return self
+
+    def _record(self, node_id: str, cache_hit: bool, queued: float):
+        with self._lock:
+            self._node_stats[node_id] = {"cache_hit": cache_hit, "queued": queued}
+
+    def __call__(self, task: str) -> Any:
+        if self.graph is None:
+            self.graph = self.builder.build()
+        # A fresh semaphore per run: each graph call runs on its own event loop
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._node_stats = {}
+        result = self.graph(task)
+        self.last_report = self.report(result)
+        return result
+
+    def report(self, result: Any) -> List[Dict[str, Any]]:
+        """Per-node timings in result.execution_order, with cache hits and time spent waiting for a slot"""
+        return [{
+            "node_id": node.node_id,
+            "status": str(getattr(node.execution_status, "value", node.execution_status)),
+            "execution_time": node.execution_time / 1000,
+            **self._node_stats.get(node.node_id, {"cache_hit": False, "queued": 0.0})
+        } for node in result.execution_order]
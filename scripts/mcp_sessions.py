@@ -0,0 +1,280 @@
+"""
+MCP Session Manager
+Keeps MCP server processes warm between queries, caching their tool lists and restarting them when unhealthy,
+and merges the tools of every server in mcp.json into one namespaced registry
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from mcp import stdio_client, StdioServerParameters
+from strands.tools.mcp import MCPClient
+from strands.types.tools import AgentTool
+
+def load_mcp_servers(path: str = "mcp.json") -> Dict[str, dict]:
+    """Enabled servers from an mcp.json "mcpServers" block (entries with "disabled": true are dropped)"""
+    with open(path, 'r') as f:
+        servers = json.load(f)["mcpServers"]
+    return {name: config for name, config in servers.items() if not config.get("disabled", False)}
+
+def namespaced(server: str, tool: str) -> str:
+    """server__tool, squeezed into the model's [a-zA-Z0-9_-]{1,64} tool name rules"""
+    prefix = re.sub(r"[^a-zA-Z0-9_-]", "_", server)
+    return f"{prefix[:max(1, 62 - len(tool))]}__{tool}"[:64]
+
+def config_digest(config: dict) -> str:
+    """Hash of what decides a server's tools: its command, args and env"""
+    launch = {key: config.get(key) for key in ("command", "args", "env")}
+    return hashlib.sha256(json.dumps(launch, sort_keys=True).encode()).hexdigest()
+
+def stdio_client_factory(config: dict) -> MCPClient:
+    """MCPClient for an mcp.json server entry using stdio transport"""
+    return MCPClient(lambda: stdio_client(
+        StdioServerParameters(
+            command=config["command"],
+            args=config["args"],
+            env=config.get("env", {})
+        )
+    ))
+
+class MCPSession:
+    """One long-lived MCP server with a cached tool list.
+
+    The server process is started once and reused. Every health_interval
+    seconds the tool list is re-fetched, which doubles as a health check:
+    if it fails the server is restarted. tools_version changes whenever the
+    server restarts or its tool list changes, so callers know when to rebuild
+    their Agent.
+    """
+
+    def __init__(self, name: str, config: dict, tools_ttl: float = 300, health_interval: float = 30,
+                 client_factory: Callable[[dict], MCPClient] = stdio_client_factory):
+        self.name = name
+        self.config = config
+        self.tools_ttl = tools_ttl
+        self.health_interval = health_interval
+        self.client_factory = client_factory
+        self.client: Optional[MCPClient] = None
+        self.tools_version = 0
+        self.stats = {"starts": 0, "restarts": 0, "tool_refreshes": 0}
+        self._tools: List[Any] = []
+        self._tools_fetched = 0.0
+        self._last_check = 0.0
+        self._lock = threading.RLock()
+
+    def start(self):
+        with self._lock:
+            if self.client is None:
+                # A fresh client each time: a stopped MCPClient can't always be restarted
+                self.client = self.client_factory(self.config)
+                self.client.start()
+                self.stats["starts"] += 1
+                # Tools from the previous client are bound to it, so agents must be rebuilt
+                self.tools_version += 1
+                self._last_check = time.time()
+                self._refresh_tools()
+
+    def stop(self):
+        with self._lock:
+            if self.client is not None:
+                try:
+                    self.client.stop(None, None, None)
+                finally:
+                    self.client = None
+
+    def restart(self):
+        with self._lock:
+            self.stats["restarts"] += 1
+            try:
+                self.stop()
+            except Exception:
+                pass  # the old process is already broken
+            self.start()
+
+    def invalidate_tools(self):
+        """Force the next tools() call to re-fetch from the server"""
+        self._tools_fetched = 0.0
+
+    def _refresh_tools(self):
+        tools = self.client.list_tools_sync()
+        self.stats["tool_refreshes"] += 1
+        if [tool.tool_name for tool in tools] != [tool.tool_name for tool in self._tools]:
+            self.tools_version += 1
+        self._tools = list(tools)
+        self._tools_fetched = time.time()
+
+    def ensure(self):
+        """Start the server if needed and restart it if the periodic health check fails"""
+        with self._lock:
+            if self.client is None:
+                self.start()
+                return
+            if time.time() - self._last_check < self.health_interval:
+                return
+            self._last_check = time.time()
+            try:
+                self._refresh_tools()
+            except Exception:
+                self.restart()
+
+    def tools(self) -> List[Any]:
+        with self._lock:
+            self.ensure()
+            if time.time() - self._tools_fetched > self.tools_ttl:
+                self._refresh_tools()
+            return self._tools
+
+    def tool(self, name: str) -> Any:
+        for tool in self.tools():
+            if tool.tool_name == name:
+                return tool
+        raise KeyError(f"{self.name} has no tool {name}")
+
+class RegistryTool(AgentTool):
+    """Namespaced handle on one server's tool.
+
+    The server is resolved at call time, so it can be started lazily on the
+    first invocation and restarted without rebuilding the Agent. Tools not in
+    the server's autoApprove list go through approve(name, arguments) first.
+    """
+
+    def __init__(self, name: str, spec: dict, session: MCPSession, original_name: str,
+                 approve: Optional[Callable[[str, dict], bool]] = None):
+        super().__init__()
+        self._name = name
+        self._spec = {**spec, "name": name}
+        self.session = session
+        self.original_name = original_name
+        self.approve = None if original_name in session.config.get("autoApprove", []) else approve
+
+    @property
+    def tool_name(self) -> str:
+        return self._name
+
+    @property
+    def tool_spec(self) -> dict:
+        return self._spec
+
+    @property
+    def tool_type(self) -> str:
+        return "python"
+
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        # approve may block on a prompt, so it runs off the agent's event loop too
+        if self.approve and not await asyncio.to_thread(self.approve, self._name, tool_use["input"]):
+            raise PermissionError(f"{self._name} was not approved (it isn't in {self.session.name}'s autoApprove)")
+        # Starting a server blocks, so keep it off the agent's event loop
+        tool = await asyncio.to_thread(self.session.tool, self.original_name)
+        async for event in tool.stream(tool_use, invocation_state, **kwargs):
+            yield event
+
+class MCPSessionManager:
+    """Named MCPSessions from an mcp.json "mcpServers" block.
+
+    Tool specs seen from each server are saved to spec_cache, which lets
+    registry(lazy=True) advertise a server's tools without spawning it. Each
+    entry records the config_digest it was listed under, so changing a
+    server's command, args or env lists its tools again.
+    """
+
+    def __init__(self, servers: Dict[str, dict], spec_cache: Optional[str] = None, **session_kwargs):
+        self.sessions = {name: MCPSession(name, config, **session_kwargs) for name, config in servers.items()}
+        self.spec_cache = spec_cache
+
+    def session(self, name: str) -> MCPSession:
+        session = self.sessions[name]
+        session.ensure()
+        return session
+
+    def start_all(self, names: Optional[List[str]] = None) -> Dict[str, Exception]:
+        """Start servers concurrently, so startup takes as long as the slowest one.
+
+        Returns the servers that failed to start; the others are usable.
+        """
+        names = list(self.sessions) if names is None else names
+        if not names:
+            return {}
+
+        def start(name):
+            try:
+                self.sessions[name].start()
+            except Exception as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            errors = dict(zip(names, executor.map(start, names)))
+        return {name: error for name, error in errors.items() if error is not None}
+
+    def _read_spec_cache(self) -> Dict[str, dict]:
+        if not self.spec_cache or not os.path.exists(self.spec_cache):
+            return {}
+        try:
+            with open(self.spec_cache, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_specs(self) -> Dict[str, List[dict]]:
+        """Cached specs of the servers whose config hasn't changed since they were listed"""
+        specs = {}
+        for name, entry in self._read_spec_cache().items():
+            session = self.sessions.get(name)
+            if session and isinstance(entry, dict) and entry.get("config") == config_digest(session.config):
+                specs[name] = entry["tools"]
+        return specs
+
+    def _save_specs(self, specs: Dict[str, List[dict]]):
+        if self.spec_cache:
+            cache = self._read_spec_cache()
+            cache.update({name: {"config": config_digest(self.sessions[name].config), "tools": tools}
+                          for name, tools in specs.items()})
+            with open(self.spec_cache, 'w') as f:
+                json.dump(cache, f, indent=2, default=str)
+
+    def registry(self, lazy: bool = False,
+                 approve: Optional[Callable[[str, dict], bool]] = None) -> List[RegistryTool]:
+        """Every server's tools as server__tool, ready for Agent(tools=...).
+
+        Eager mode starts all servers up front. Lazy mode only starts servers
+        whose tool specs aren't cached yet; the rest spawn on first tool call.
+        Servers that fail to start are left out.
+        """
+        cached = self._load_specs() if lazy else {}
+        pending = [name for name in self.sessions if name not in cached]
+        failed = self.start_all(pending)
+
+        specs = {}
+        for name in pending:
+            if name not in failed:
+                specs[name] = [{"original_name": tool.tool_name, **tool.tool_spec}
+                               for tool in self.sessions[name].tools()]
+        self._save_specs(specs)
+        specs.update(cached)
+
+        return [
+            RegistryTool(namespaced(name, spec["original_name"]),
+                         {key: value for key, value in spec.items() if key != "original_name"},
+                         self.sessions[name], spec["original_name"], approve)
+            for name in self.sessions if name in specs
+            for spec in specs[name]
+        ]
+
+    def tools_version(self) -> int:
+        """Changes whenever any server restarts or changes its tools"""
+        return sum(session.tools_version for session in self.sessions.values())
+
+    def close(self):
+        for session in self.sessions.values():
+            session.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
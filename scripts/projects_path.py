@@ -0,0 +1,12 @@
+"""
+Projects Path
+Importing this puts ../projects on sys.path, once, so scripts can use the shared project modules
+"""
+
+import os
+import sys
+
+PROJECTS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "projects"))
+
+if PROJECTS_DIR not in sys.path:
+    sys.path.insert(0, PROJECTS_DIR)
@@ -0,0 +1,261 @@
+"""
+Incremental Repository Review
+Reviews a tree chunk by chunk and keeps a content-hash manifest of findings, so only new or changed code is
+sent to the model and re-reviewing a mostly unchanged repository costs next to no model calls
+"""
+
+import ast
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+from strands import Agent
+import projects_path  # noqa: F401 - makes ../projects importable
+from code_analysis import analyze_source, decode_source, format_analysis, iter_python_files, source_lines
+from context_handoff import estimate_tokens
+
+MANIFEST_VERSION = 2
+
+REVIEW_PROMPT = "You are a senior code reviewer. List concrete problems (bugs, security, error handling, " \
+                "readability) in the code you are given as short bullet points naming the function or class " \
+                "they're in. Reply with 'No issues.' if there are none."
+
+# On average a chunk boundary every ANCHOR_EVERY top-level statements, decided by their content,
+# so an edit only re-chunks the code around it rather than everything after it
+ANCHOR_EVERY = 4
+
+def digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def _segments(code: str, budget_tokens: int) -> List[List[int]]:
+    """[first, last] line spans covering every line: each top-level def/class or run of other statements.
+
+    Classes over the budget are split into their members instead, so editing
+    one method doesn't shift the chunks of the rest of the class.
+    """
+    lines = source_lines(code)
+    try:
+        body = ast.parse(code).body
+    except (SyntaxError, ValueError):
+        return [[1, len(lines)]] if lines else []
+
+    spans: List[List[Any]] = []
+
+    def add(nodes: List[ast.stmt]):
+        for node in nodes:
+            is_definition = isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            if isinstance(node, ast.ClassDef) and estimate_tokens(
+                    "\n".join(lines[node.lineno - 1:node.end_lineno])) > budget_tokens:
+                add(node.body)  # the class line joins its first member's span
+            elif spans and not is_definition and spans[-1][2]:
+                spans[-1][1] = node.end_lineno
+            else:
+                spans.append([node.lineno, node.end_lineno, not is_definition])
+
+    add(body)
+    if not spans:
+        return [[1, len(lines)]] if lines else []
+    # Decorators, comments and blank lines before a statement belong to it
+    spans[0][0] = 1
+    for previous, span in zip(spans, spans[1:]):
+        span[0] = previous[1] + 1
+    spans[-1][1] = len(lines)
+    return [[start, end] for start, end, _ in spans]
+
+def chunk_source(code: str, budget_tokens: int = 1500) -> List[Dict[str, Any]]:
+    """Line ranges of code to review together, each within budget_tokens (oversized definitions are split)"""
+    lines = source_lines(code)
+    chunks, current, tokens = [], None, 0
+
+    def flush():
+        nonlocal current, tokens
+        if current:
+            text = "\n".join(lines[current[0] - 1:current[1]])
+            if text.strip():
+                chunks.append({"lines": list(current), "text": text, "digest": digest(text)})
+        current, tokens = None, 0
+
+    for start, end in _segments(code, budget_tokens):
+        text = "\n".join(lines[start - 1:end])
+        size = estimate_tokens(text)
+        if size > budget_tokens:
+            flush()
+            # Windows of whole lines within the budget
+            window_start, window_tokens = start, 0
+            for row in range(start, end + 1):
+                line_tokens = estimate_tokens(lines[row - 1]) + 1
+                if window_tokens and window_tokens + line_tokens > budget_tokens:
+                    current = [window_start, row - 1]
+                    flush()
+                    window_start, window_tokens = row, 0
+                window_tokens += line_tokens
+            current = [window_start, end]
+            flush()
+            continue
+        if current and tokens + size > budget_tokens:
+            flush()
+        current = [current[0] if current else start, end]
+        tokens += size
+        if int(digest(text)[:8], 16) % ANCHOR_EVERY == 0:
+            flush()
+    flush()
+    return chunks
+
+class ReviewManifest:
+    """JSON manifest: file path -> content hash and chunk keys, chunk key -> findings.
+
+    A chunk key hashes the file path with the chunk text, since findings name
+    the file they came from: the same code in another file is reviewed again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.chunks: Dict[str, str] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.files, self.chunks = data["files"], data["chunks"]
+            except (OSError, ValueError, KeyError):
+                print(f"⚠️ Ignoring unreadable review manifest {path}")
+
+    def save(self):
+        """Atomic write; findings no file refers to any more are dropped"""
+        used = {chunk for entry in self.files.values() for chunk in entry["chunks"]}
+        data = {"version": MANIFEST_VERSION, "files": self.files,
+                "chunks": {key: value for key, value in self.chunks.items() if key in used}}
+        temp = f"{self.path}.tmp"
+        with open(temp, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(temp, self.path)
+
+class RepositoryReviewer:
+    """Reviews the .py files under a root, sending only chunks whose content the manifest hasn't seen.
+
+    Unchanged files are answered from the manifest without even re-chunking;
+    in changed files only new or edited chunks go to the model, one fresh
+    conversation per chunk, with up to workers calls in flight.
+    """
+
+    def __init__(self, agent_factory: Callable[..., Any] = Agent, manifest_path: str = ".review_manifest.json",
+                 chunk_tokens: int = 1500, workers: int = 4):
+        self.agent_factory = agent_factory
+        self.manifest = ReviewManifest(manifest_path)
+        self.chunk_tokens = chunk_tokens
+        self.workers = workers
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def _review_chunk(self, path: str, chunk: Dict[str, Any], metrics: str) -> str:
+        if not hasattr(self.local, "agent"):
+            self.local.agent = self.agent_factory(system_prompt=REVIEW_PROMPT, callback_handler=None)
+        agent = self.local.agent
+        agent.messages.clear()
+        # No line numbers: findings are reused while the chunk's text is unchanged, wherever it moves
+        prompt = f"File {path}.\n{metrics}\n\n```python\n{chunk['text']}\n```"
+        return str(agent(prompt)).strip()
+
+    def review(self, root: str) -> Dict[str, Any]:
+        start_time = time.time()
+        base = root if os.path.isdir(root) else os.path.dirname(root)
+        report: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        seen = set()
+        stats = {"files": 0, "unchanged_files": 0, "chunks": 0, "reused_chunks": 0, "model_calls": 0,
+                 "tokens_sent": 0, "failed_chunks": 0}
+
+        for file_path in iter_python_files(root):
+            relative = os.path.relpath(file_path, base)
+            seen.add(relative)
+            stats["files"] += 1
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            except OSError as error:
+                report[relative] = {"status": "unreadable", "error": str(error), "chunks": []}
+                continue
+            file_digest = hashlib.sha256(data).hexdigest()
+            entry = self.manifest.files.get(relative)
+            if entry and entry["digest"] == file_digest and all(c in self.manifest.chunks for c in entry["chunks"]):
+                stats["unchanged_files"] += 1
+                stats["chunks"] += len(entry["chunks"])
+                stats["reused_chunks"] += len(entry["chunks"])
+                report[relative] = {"status": "unchanged", "chunks": [
+                    {"lines": lines, "findings": self.manifest.chunks[key], "reused": True}
+                    for key, lines in zip(entry["chunks"], entry["lines"])]}
+                continue
+
+            code = decode_source(data)
+            chunks = chunk_source(code, self.chunk_tokens)
+            metrics = format_analysis(analyze_source(code)).replace("\n", " ")
+            report[relative] = {"status": "changed" if entry else "new", "chunks": []}
+            for chunk in chunks:
+                chunk["key"] = digest(f"{relative}\0{chunk['digest']}")
+                stats["chunks"] += 1
+                findings = self.manifest.chunks.get(chunk["key"])
+                record = {"lines": chunk["lines"], "findings": findings, "reused": findings is not None}
+                report[relative]["chunks"].append(record)
+                if findings is None:
+                    pending.append((relative, chunk, metrics, record))
+                else:
+                    stats["reused_chunks"] += 1
+            self.manifest.files[relative] = {"digest": file_digest, "chunks": [c["key"] for c in chunks],
+                                             "lines": [c["lines"] for c in chunks]}
+
+        for relative in list(self.manifest.files):
+            if relative not in seen:
+                del self.manifest.files[relative]
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(self._review_chunk, relative, chunk, metrics): (relative, chunk, record)
+                           for relative, chunk, metrics, record in pending}
+                for future in as_completed(futures):
+                    relative, chunk, record = futures[future]
+                    stats["model_calls"] += 1
+                    stats["tokens_sent"] += estimate_tokens(chunk["text"])
+                    try:
+                        record["findings"] = future.result()
+                    except Exception as error:
+                        # Not stored: the chunk is retried on the next run
+                        stats["failed_chunks"] += 1
+                        record["findings"] = f"⚠️ Review failed: {error}"
+                        continue
+                    with self.lock:
+                        self.manifest.chunks[chunk["key"]] = record["findings"]
+        finally:
+            self.manifest.save()
+
+        stats["execution_time"] = time.time() - start_time
+        return {"files": dict(sorted(report.items())), "stats": stats}
+
+def format_review(result: Dict[str, Any], show_unchanged: bool = False) -> str:
+    stats = result["stats"]
+    lines = [f"📊 {stats['files']} files ({stats['unchanged_files']} unchanged), {stats['chunks']} chunks, "
+             f"{stats['reused_chunks']} reused from the manifest, {stats['model_calls']} model calls "
+             f"(~{stats['tokens_sent']:,} code tokens sent) in {stats['execution_time']:.1f}s"]
+    for path, entry in result["files"].items():
+        if entry["status"] == "unchanged" and not show_unchanged:
+            continue
+        lines.append(f"\n📄 {path} [{entry['status']}]")
+        if "error" in entry:
+            lines.append(f"   ⚠️ {entry['error']}")
+        for chunk in entry["chunks"]:
+            findings = (chunk["findings"] or "").strip()
+            if findings and findings.lower().rstrip(".") != "no issues":
+                lines.append(f"   lines {chunk['lines'][0]}-{chunk['lines'][1]}"
+                             f"{' (cached)' if chunk['reused'] else ''}:\n      "
+                             + findings.replace("\n", "\n      "))
+    return "\n".join(lines)
+
+def review_repository(root: str, agent_factory: Callable[..., Any] = Agent, manifest_path: Optional[str] = None,
+                      chunk_tokens: int = 1500, workers: int = 4) -> Dict[str, Any]:
+    """Incrementally review root; the manifest defaults to .review_manifest.json inside it"""
+    manifest_path = manifest_path or os.path.join(root if os.path.isdir(root) else os.path.dirname(root),
+                                                  ".review_manifest.json")
+    return RepositoryReviewer(agent_factory, manifest_path, chunk_tokens, workers).review(root)
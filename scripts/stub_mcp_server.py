@@ -0,0 +1,24 @@
+"""
+Stub MCP Server
+Local stand-in for an MCP docs server with a configurable startup delay - used by benchmark_mcp.py
+"""
+
+import os
+import time
+try:
+    from mcp.server.fastmcp import FastMCP
+except ImportError:  # mcp 2.x renamed FastMCP
+    from mcp.server.mcpserver import MCPServer as FastMCP
+
+# Simulates uvx resolving and importing the real server
+time.sleep(float(os.getenv("STUB_MCP_STARTUP_DELAY", "0.5")))
+
+mcp = FastMCP("stub-docs")
+
+@mcp.tool()
+def search_documentation(search_phrase: str) -> str:
+    """Search the (stub) AWS documentation"""
+    return f"Top result for '{search_phrase}': https://docs.aws.amazon.com/stub"
+
+if __name__ == "__main__":
+    mcp.run()
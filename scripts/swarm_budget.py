@@ -0,0 +1,185 @@
+"""
+Budgeted Swarm
+Sub-agents run in parallel under an agent cap and shared token and wall-time budgets; stragglers are
+cancelled once a budget is spent, and whatever they produced so far is aggregated with a per-agent report
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+from strands import Agent, tool
+
+import projects_path  # noqa: F401 - makes ../projects importable
+from context_handoff import estimate_tokens
+
+class SwarmBudget:
+    """Shared spend of one swarm run; exhausted once the tokens or the wall time run out"""
+
+    def __init__(self, token_budget: Optional[int] = None, time_budget: Optional[float] = None):
+        self.token_budget = token_budget
+        self.deadline = time.time() + time_budget if time_budget else None
+        self.tokens = 0
+        self.reason: Optional[str] = None
+
+    def spend(self, tokens: int):
+        self.tokens += tokens
+        if self.token_budget and self.tokens >= self.token_budget and not self.reason:
+            self.reason = f"token budget of {self.token_budget:,} spent"
+
+    def remaining_time(self) -> Optional[float]:
+        return None if self.deadline is None else max(0.0, self.deadline - time.time())
+
+class SubAgentRun:
+    """One sub-agent's contribution: text so far, tokens (estimated until the model reports usage), latency"""
+
+    def __init__(self, name: str, agent: Any):
+        self.name = name
+        self.agent = agent
+        self.status = "pending"
+        self.text = ""
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latency = 0.0
+        self.error: Optional[str] = None
+
+    def report(self) -> Dict[str, Any]:
+        return {"name": self.name, "status": self.status, "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens, "latency": self.latency, "error": self.error}
+
+async def _run_sub_agent(run: SubAgentRun, task: str, budget: SwarmBudget, cancel_all: Callable[[str], None]):
+    start = time.time()
+    run.status = "running"
+    # Reserve the prompt up front so parallel agents can't all start past the budget
+    run.input_tokens = estimate_tokens((run.agent.system_prompt or "") + task)
+    budget.spend(run.input_tokens)
+    try:
+        async for event in run.agent.stream_async(task):
+            if "data" in event:
+                run.text += event["data"]
+                tokens = estimate_tokens(event["data"])
+                run.output_tokens += tokens
+                budget.spend(tokens)
+            usage = event.get("event", {}).get("metadata", {}).get("usage")
+            if usage:
+                # Swap the estimates for what the model reports
+                budget.spend(usage.get("inputTokens", 0) + usage.get("outputTokens", 0)
+                             - run.input_tokens - run.output_tokens)
+                run.input_tokens = usage.get("inputTokens", 0)
+                run.output_tokens = usage.get("outputTokens", 0)
+            if budget.reason:
+                cancel_all(budget.reason)
+            if "result" in event:
+                cancelled = event["result"].stop_reason == "cancelled"
+                run.status = "cancelled" if cancelled else "completed"
+    except asyncio.CancelledError:
+        run.status = "cancelled"
+    except Exception as error:
+        run.status = "failed"
+        run.error = f"{type(error).__name__}: {error}"
+    finally:
+        run.latency = time.time() - start
+
+async def run_swarm(task: str, agents: List[Dict[str, Any]], agent_factory: Callable[..., Any] = Agent,
+                    max_agents: int = 4, token_budget: Optional[int] = 20000,
+                    time_budget: Optional[float] = 120.0, grace: float = 0.5) -> Dict[str, Any]:
+    """Run up to max_agents sub-agents on task at once, within shared token and time budgets.
+
+    agents are swarm-tool style specs ({"name", "system_prompt"}); specs past
+    max_agents are skipped. When a budget runs out every running sub-agent is
+    asked to stop (agent.cancel()) and hard-cancelled grace seconds later if it
+    hasn't. Returns the aggregated answer plus a per-sub-agent report.
+    """
+    budget = SwarmBudget(token_budget, time_budget)
+    runs, skipped = [], []
+    for i, spec in enumerate(agents):
+        name = spec.get("name", f"agent_{i + 1}")
+        if len(runs) >= max_agents:
+            skipped.append(name)
+            continue
+        system_prompt = spec.get("system_prompt") or "You are a helpful AI assistant specializing in " \
+                                                     "collaborative problem solving."
+        runs.append(SubAgentRun(name, agent_factory(name=name, system_prompt=system_prompt)))
+
+    tripped = asyncio.Event()
+
+    def cancel_all(reason: str):
+        budget.reason = budget.reason or reason
+        tripped.set()
+        for run in runs:
+            if run.status == "running":
+                run.agent.cancel()
+
+    start = time.time()
+    tasks = [asyncio.create_task(_run_sub_agent(run, task, budget, cancel_all)) for run in runs]
+    everyone, trip = asyncio.gather(*tasks), asyncio.create_task(tripped.wait())
+    await asyncio.wait([everyone, trip], timeout=budget.remaining_time(), return_when=asyncio.FIRST_COMPLETED)
+    trip.cancel()
+    if not everyone.done():
+        cancel_all(budget.reason or f"time budget of {time_budget:g}s spent")
+        # Cooperative first: cancelled agents stop at their next stream event
+        _, pending = await asyncio.wait(tasks, timeout=grace)
+        for straggler in pending:
+            straggler.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        "answer": aggregate(runs),
+        "status": "partial" if budget.reason or skipped or any(run.status != "completed" for run in runs)
+                  else "completed",
+        "stop_reason": budget.reason or (f"{len(skipped)} agent(s) over the cap of {max_agents} skipped"
+                                         if skipped else None),
+        "agents": [run.report() for run in runs] + [{"name": name, "status": "skipped", "input_tokens": 0,
+                                                      "output_tokens": 0, "latency": 0.0, "error": None}
+                                                     for name in skipped],
+        "total_tokens": sum(run.input_tokens + run.output_tokens for run in runs),
+        "execution_time": time.time() - start
+    }
+
+def aggregate(runs: List[SubAgentRun]) -> str:
+    """Completed contributions first, then partial ones marked as such; failed and empty ones are left out"""
+    ordered = sorted(runs, key=lambda run: run.status != "completed")
+    sections = []
+    for run in ordered:
+        if run.text.strip():
+            marker = "" if run.status == "completed" else " (partial - cut off by the budget)"
+            sections.append(f"**{run.name}**{marker}:\n{run.text.strip()}")
+    return "\n\n".join(sections) or "No sub-agent produced output within the budget."
+
+def format_report(result: Dict[str, Any]) -> str:
+    lines = [f"📊 Status: {result['status']}" + (f" ({result['stop_reason']})" if result["stop_reason"] else ""),
+             f"⏱️ {result['execution_time']:.1f}s, {result['total_tokens']:,} tokens",
+             "| agent | status | in | out | latency |", "|---|---|---|---|---|"]
+    for agent in result["agents"]:
+        lines.append(f"| {agent['name']} | {agent['status']} | {agent['input_tokens']:,} | "
+                     f"{agent['output_tokens']:,} | {agent['latency']:.1f}s |")
+    return "\n".join(lines)
+
+def budgeted_swarm(max_agents: int = 4, token_budget: Optional[int] = 20000, time_budget: Optional[float] = 120.0,
+                   agent_factory: Optional[Callable[..., Any]] = None):
+    """Drop-in for strands_tools.swarm with limits the model can't raise.
+
+    Sub-agents get no tools, so each costs exactly one model call. They use the
+    calling agent's model unless an agent_factory is given.
+    """
+
+    @tool
+    async def swarm(task: str, agents: List[Dict[str, Any]], agent: Optional[Any] = None) -> Dict[str, Any]:
+        """Run a team of specialized AI agents in parallel on a task and combine their answers.
+
+        Args:
+            task: The task every agent works on.
+            agents: Agent specifications, each a dictionary with a "name" and a "system_prompt" describing its role.
+        """
+        def factory(**kwargs):
+            if agent_factory:
+                return agent_factory(**kwargs)
+            return Agent(model=agent.model, callback_handler=None, **kwargs) if agent else Agent(
+                callback_handler=None, **kwargs)
+
+        try:
+            result = await run_swarm(task, agents, factory, max_agents, token_budget, time_budget)
+        except Exception as error:
+            return {"status": "error", "content": [{"text": f"⚠️ Swarm failed: {error}"}]}
+        return {"status": "success", "content": [{"text": f"{result['answer']}\n\n{format_report(result)}"}]}
+
+    return swarm